@@ -0,0 +1,53 @@
+"""Park/unpark throughput of a concurrent ParkingLot vs. number of gate threads.
+
+Run from the ParkingLot folder:  python -m benchmarks.bench_concurrency
+With per-floor locks gates rarely wait on each other; on CPython the GIL
+still bounds pure-Python throughput, so compare against free-threaded builds.
+"""
+import threading
+import time
+from parking_lot.lot import ParkingLot
+from parking_lot.floor import ParkingFloor
+from parking_lot.models import ParkingSpot, Vehicle
+from parking_lot.enums import SpotType, VehicleType
+from parking_lot.pricing import FlatRatePricing
+
+FLOORS = 20
+SPOTS_PER_FLOOR = 500
+OPS_PER_THREAD = 20_000
+
+
+def build_lot() -> ParkingLot:
+    floors = [
+        ParkingFloor(f, [ParkingSpot(f"F{f:02d}S{i:04d}", SpotType.COMPACT, f) for i in range(SPOTS_PER_FLOOR)])
+        for f in range(1, FLOORS + 1)
+    ]
+    return ParkingLot("Bench", floors, FlatRatePricing(10), concurrent=True)
+
+
+def run(n_threads: int) -> float:
+    """Return park+unpark pairs per second across all gate threads."""
+    lot = build_lot()
+
+    def gate(tid: int) -> None:
+        for i in range(OPS_PER_THREAD // n_threads):
+            t = lot.park(Vehicle(f"G{tid}-{i}", VehicleType.CAR))
+            lot.unpark(t.ticket_id)
+
+    threads = [threading.Thread(target=gate, args=(t,)) for t in range(n_threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return OPS_PER_THREAD / (time.perf_counter() - start)
+
+
+def main() -> None:
+    print(f"{'threads':>8} | {'pairs / s':>12}")
+    for n in (1, 2, 4, 8, 16):
+        print(f"{n:>8} | {run(n):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
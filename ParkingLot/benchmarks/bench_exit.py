@@ -0,0 +1,41 @@
+"""Exit (unpark) latency as the number of floors grows.
+
+Run from the ParkingLot folder:  python -m benchmarks.bench_exit
+Tickets carry their floor handle, so latency should stay flat.
+"""
+import random
+import time
+from parking_lot.lot import ParkingLot
+from parking_lot.floor import ParkingFloor
+from parking_lot.models import ParkingSpot, Vehicle
+from parking_lot.enums import SpotType, VehicleType
+from parking_lot.pricing import FlatRatePricing
+
+FLOOR_COUNTS = (1, 8, 64, 256)
+SPOTS_PER_FLOOR = 200
+EXITS = 5_000
+
+
+def run(n_floors: int) -> float:
+    """Return mean microseconds per unpark on a full lot."""
+    floors = [
+        ParkingFloor(f, [ParkingSpot(f"F{f}S{i}", SpotType.COMPACT, f) for i in range(SPOTS_PER_FLOOR)])
+        for f in range(1, n_floors + 1)
+    ]
+    lot = ParkingLot("Bench", floors, FlatRatePricing(10))
+    tickets = [r.value for r in lot.park_many([Vehicle(f"C{i}", VehicleType.CAR) for i in range(n_floors * SPOTS_PER_FLOOR)])]
+    sample = random.Random(n_floors).sample(tickets, min(EXITS, len(tickets)))
+    start = time.perf_counter()
+    for ticket in sample:
+        lot.unpark(ticket.ticket_id)
+    return (time.perf_counter() - start) / len(sample) * 1e6
+
+
+def main() -> None:
+    print(f"{'floors':>7} | {'us / unpark':>11}")
+    for n in FLOOR_COUNTS:
+        print(f"{n:>7} | {run(n):>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Park/unpark scaling on a single ParkingFloor.
+
+Run from the ParkingLot folder:  python -m benchmarks.bench_floor
+Per-operation cost should stay roughly flat as the floor grows (O(log n)).
+"""
+import random
+import time
+from parking_lot.floor import ParkingFloor
+from parking_lot.models import ParkingSpot, Vehicle
+from parking_lot.enums import SpotType, VehicleType
+
+SIZES = (1_000, 4_000, 16_000, 64_000)
+OPS = 20_000
+
+
+def build_floor(n: int) -> ParkingFloor:
+    types = (SpotType.MOTORBIKE, SpotType.COMPACT, SpotType.LARGE)
+    spots = [ParkingSpot(f"S{i:06d}", types[i % 3], 1) for i in range(n)]
+    return ParkingFloor(1, spots)
+
+
+def run(n: int, ops: int = OPS) -> float:
+    """Return mean microseconds per park+unpark pair on a half-full floor."""
+    rng = random.Random(n)
+    floor = build_floor(n)
+    parked = [floor.assign_vehicle(Vehicle(f"P{i}", VehicleType.BIKE)).spot_id for i in range(n // 2)]
+    start = time.perf_counter()
+    for i in range(ops):
+        idx = rng.randrange(len(parked))
+        floor.free_spot(parked[idx])
+        parked[idx] = floor.assign_vehicle(Vehicle(f"X{i}", VehicleType.BIKE)).spot_id
+    return (time.perf_counter() - start) / ops * 1e6
+
+
+def main() -> None:
+    print(f"{'spots':>8} | {'us / park+unpark':>18}")
+    for n in SIZES:
+        print(f"{n:>8} | {run(n):>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
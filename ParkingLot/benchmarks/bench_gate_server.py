@@ -0,0 +1,73 @@
+"""Load generator for GateServer: many concurrent gate connections, p50/p99 latency.
+
+Run from the ParkingLot folder:
+    python -m benchmarks.bench_gate_server [connections] [rounds]
+Starts an in-process server unless --host/--port of a running one are given
+via GATE_HOST / GATE_PORT. 10k connections need `ulimit -n` above 20k.
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+from parking_lot.gate_server import GateServer, GateClient
+from parking_lot.lot import ParkingLot
+from parking_lot.floor import ParkingFloor
+from parking_lot.models import ParkingSpot
+from parking_lot.enums import SpotType
+from parking_lot.pricing import FlatRatePricing
+
+CONNECTIONS = 10_000
+ROUNDS = 3
+
+
+def build_lot(capacity: int) -> ParkingLot:
+    per_floor = 1_000
+    floors = [
+        ParkingFloor(f, [ParkingSpot(f"F{f}S{i:04d}", SpotType.COMPACT, f) for i in range(per_floor)])
+        for f in range(1, capacity // per_floor + 2)
+    ]
+    return ParkingLot("Bench", floors, FlatRatePricing(10))
+
+
+async def gate(client: GateClient, gid: int, rounds: int, latencies: list) -> None:
+    for r in range(rounds):
+        start = time.perf_counter()
+        parked = await client.park(f"G{gid}-{r}", "CAR")
+        latencies.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        await client.unpark(parked["ticket_id"])
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(connections: int, rounds: int) -> None:
+    host, port = os.environ.get("GATE_HOST"), os.environ.get("GATE_PORT")
+    server = None
+    if not port:
+        server = GateServer(build_lot(connections))
+        await server.start()
+        host, port = server.address[:2]
+    clients = await asyncio.gather(*(GateClient.connect(host, int(port)) for _ in range(connections)))
+    latencies: list = []
+    start = time.perf_counter()
+    await asyncio.gather(*(gate(c, i, rounds, latencies) for i, c in enumerate(clients)))
+    elapsed = time.perf_counter() - start
+    for c in clients:
+        await c.close()
+    if server:
+        await server.close()
+
+    q = statistics.quantiles(latencies, n=100)
+    print(f"connections={connections} requests={len(latencies)} "
+          f"throughput={len(latencies) / elapsed:.0f} req/s "
+          f"p50={q[49] * 1e3:.2f}ms p99={q[98] * 1e3:.2f}ms")
+
+
+def main() -> None:
+    connections = int(sys.argv[1]) if len(sys.argv) > 1 else CONNECTIONS
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else ROUNDS
+    asyncio.run(run(connections, rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Per-spot memory of slotted ParkingSpot vs. the former __dict__-backed layout.
+
+Run from the ParkingLot folder:  python -m benchmarks.bench_memory [spots]
+"""
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Optional
+from parking_lot.floor import ParkingFloor
+from parking_lot.models import ParkingSpot, Vehicle
+from parking_lot.enums import SpotType
+
+N = 200_000
+TYPES = (SpotType.MOTORBIKE, SpotType.COMPACT, SpotType.LARGE)
+
+
+@dataclass
+class DictSpot:
+    """Same fields as ParkingSpot, without __slots__ (the previous layout)."""
+    spot_id: str
+    stype: SpotType
+    floor: int
+    occupied: bool = field(default=False, init=False)
+    vehicle: Optional[Vehicle] = field(default=None, init=False, repr=False)
+
+
+def measure(build) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del keep
+    return used
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N
+    ids = [f"F1S{i:07d}" for i in range(n)]  # shared by both layouts, not counted
+    rows = {
+        "dict spots": measure(lambda: [DictSpot(s, TYPES[i % 3], 1) for i, s in enumerate(ids)]),
+        "slotted spots": measure(lambda: [ParkingSpot(s, TYPES[i % 3], 1) for i, s in enumerate(ids)]),
+        "slotted floor": measure(lambda: ParkingFloor(1, [ParkingSpot(s, TYPES[i % 3], 1) for i, s in enumerate(ids)])),
+    }
+    print(f"{'layout':>14} | {'bytes / spot':>12}")
+    for name, used in rows.items():
+        print(f"{name:>14} | {used / n:>12.1f}")
+    saved = 1 - rows["slotted spots"] / rows["dict spots"]
+    print(f"spot objects: {saved:.0%} smaller; ~{rows['slotted floor'] / n * 2_000_000 / 2**20:.0f} MiB per 2M spots incl. floor indexes")
+
+
+if __name__ == "__main__":
+    main()
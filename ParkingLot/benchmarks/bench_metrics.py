@@ -0,0 +1,115 @@
+"""Cost of `instrument()` on park/unpark: plain lot vs. instrumented lots.
+
+Run from the ParkingLot folder:  python -m benchmarks.bench_metrics
+Aim: under 2% slowdown with the default settings (outer ops, 1/16 sampled).
+
+The overhead is measured on real park/unpark cycles, with the garbage
+collector off: one lot per mode runs BLOCK cycles instrumented and BLOCK
+with it uninstrumented again, in alternating order, ROUNDS times. Using the
+same lot for both sides removes the few-% bias between otherwise identical
+lots. Each mode reports the median of the per-round ratios and their
+interquartile range, and the verdict against the aim only counts as met
+when the whole range is under it; on a busy host the range is wider than
+2% and the run is inconclusive rather than a pass.
+
+For reference it also prints the ns the one-argument wrapper adds to a call
+of a no-op function (best of 5), times the two wrapped calls per cycle. That
+is a floor for the overhead, not a measurement of it.
+"""
+import gc
+import statistics
+import time
+from parking_lot.lot import ParkingLot
+from parking_lot.floor import ParkingFloor
+from parking_lot.models import ParkingSpot, Vehicle
+from parking_lot.enums import SpotType, VehicleType
+from parking_lot.pricing import FlatRatePricing
+from parking_lot.metrics import Histogram, MetricsRegistry, _wrap, instrument, uninstrument
+
+FLOORS = 10
+SPOTS_PER_FLOOR = 200
+BLOCK = 1_000
+ROUNDS = 41
+TARGET = 0.02
+MODES = {
+    "default (1/16)": dict(sample_every=16),
+    "every call": dict(sample_every=1),
+    "detail (1/16)": dict(sample_every=16, detail=True),
+}
+
+
+def build_lot() -> ParkingLot:
+    floors = [
+        ParkingFloor(f, [ParkingSpot(f"F{f}S{i:03d}", SpotType.COMPACT, f) for i in range(SPOTS_PER_FLOOR)])
+        for f in range(1, FLOORS + 1)
+    ]
+    return ParkingLot("Bench", floors, FlatRatePricing(10))
+
+
+def cycle_ns(lot: ParkingLot, vehicles) -> float:
+    """Nanoseconds per park + unpark pair."""
+    start = time.perf_counter_ns()
+    for v in vehicles:
+        lot.unpark(lot.park(v).ticket_id)
+    return (time.perf_counter_ns() - start) / len(vehicles)
+
+
+def hook_ns(sample_every: int, calls: int = 1_000_000) -> float:
+    """Nanoseconds the one-argument wrapper adds to one call (best of 5)."""
+    def noop(arg):
+        pass
+    wrapped = _wrap(noop, Histogram(), sample_every, unary=True)
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter_ns()
+        for i in range(calls):
+            wrapped(i)
+        mid = time.perf_counter_ns()
+        for i in range(calls):
+            noop(i)
+        best = min(best, ((mid - start) - (time.perf_counter_ns() - mid)) / calls)
+    return best
+
+
+def main() -> None:
+    vehicles = [Vehicle(f"C{i}", VehicleType.CAR) for i in range(BLOCK)]
+    lots = {name: build_lot() for name in MODES}
+    registry = MetricsRegistry()
+    for lot in lots.values():
+        cycle_ns(lot, vehicles)  # warm up
+
+    gc.disable()
+    try:
+        plain = {name: [] for name in lots}
+        instrumented = {name: [] for name in lots}
+        for r in range(ROUNDS):
+            for name, lot in lots.items():
+                if r % 2:
+                    plain[name].append(cycle_ns(lot, vehicles))
+                instrument(lot, registry, **MODES[name])
+                instrumented[name].append(cycle_ns(lot, vehicles))
+                uninstrument(lot)
+                if not r % 2:
+                    plain[name].append(cycle_ns(lot, vehicles))
+        hook = {every: hook_ns(every) for every in (16, 1)}
+    finally:
+        gc.enable()
+
+    plain_ns = statistics.median(v for values in plain.values() for v in values)
+    print(f"plain park+unpark: {plain_ns:,.0f} ns / cycle")
+    print(f"{'mode':>16} | toggled overhead (median, IQR)")
+    for name in lots:
+        ratios = [i / p for i, p in zip(instrumented[name], plain[name])]
+        q1, med, q3 = statistics.quantiles(ratios, n=4)
+        print(f"{name:>16} | {med - 1:+.1%}  [{q1 - 1:+.1%}, {q3 - 1:+.1%}]")
+    q1, med, q3 = (r - 1 for r in statistics.quantiles(
+        [i / p for i, p in zip(instrumented["default (1/16)"], plain["default (1/16)"])], n=4))
+    verdict = "met" if q3 < TARGET else "missed" if q1 >= TARGET else "inconclusive (spread wider than the aim)"
+    print(f"default under {TARGET:.0%}: {verdict}")
+    for every, ns in hook.items():
+        # park + unpark are the two wrapped calls per cycle; a floor, not the overhead
+        print(f"hook floor, 1/{every} sampled: {ns:.0f} ns per call = {2 * ns / plain_ns:+.2%} of a cycle")
+
+
+if __name__ == "__main__":
+    main()
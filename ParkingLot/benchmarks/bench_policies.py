@@ -0,0 +1,50 @@
+"""Compare allocation policies on the same arrival/departure trace.
+
+Run from the ParkingLot folder:
+    python -m benchmarks.bench_policies               # synthetic trace
+    python -m benchmarks.bench_policies trace.csv     # recorded trace (time,license_no,vtype,duration)
+"""
+import sys
+from parking_lot.floor import ParkingFloor
+from parking_lot.models import ParkingSpot
+from parking_lot.enums import SpotType
+from parking_lot.policies import (
+    FirstFitPolicy, BestFitPolicy, NearestExitPolicy, FloorBalancingPolicy, ReservedHeadroomPolicy,
+)
+from parking_lot.simulation import synthetic_trace, load_trace, compare_policies
+
+FLOORS = 10
+LAYOUT = {SpotType.MOTORBIKE: 40, SpotType.COMPACT: 120, SpotType.LARGE: 40}
+
+
+def build_floors():
+    floors = []
+    for f in range(1, FLOORS + 1):
+        spots = [
+            ParkingSpot(f"F{f:02d}{stype.name[0]}{i:03d}", stype, f)
+            for stype, count in LAYOUT.items() for i in range(count)
+        ]
+        floors.append(ParkingFloor(f, spots))
+    return floors
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        trace = load_trace(sys.argv[1])
+    else:
+        # ~95% offered load: 2000 spots, 800 arrivals/h, 2.4h mean stay
+        trace = synthetic_trace(50_000, arrivals_per_hour=800, mean_stay_hours=2.4, seed=1)
+    policies = {
+        "first-fit": FirstFitPolicy(),
+        "best-fit": BestFitPolicy(),
+        "nearest-exit": NearestExitPolicy({f: abs(f - 5) for f in range(1, FLOORS + 1)}),
+        "floor-balancing": FloorBalancingPolicy(),
+        "headroom+best": ReservedHeadroomPolicy({SpotType.LARGE: 40}, inner=BestFitPolicy()),
+    }
+    for report in compare_policies(policies, build_floors, trace):
+        by_type = ", ".join(f"{vt.name}={n}" for vt, n in sorted(report.rejected_by_type.items(), key=lambda kv: kv[0].name))
+        print(f"{report} | rejected: {by_type or '-'}")
+
+
+if __name__ == "__main__":
+    main()
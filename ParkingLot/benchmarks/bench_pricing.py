@@ -0,0 +1,46 @@
+"""Scalar vs. batch fee computation for nightly settlement.
+
+Run from the ParkingLot folder:  python -m benchmarks.bench_pricing [n]
+The batch path needs NumPy; without it calculate_fees falls back to the scalar loop.
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from parking_lot.pricing import FlatRatePricing, HourlySlabPricing, np
+
+N = 1_000_000
+
+
+def make_tickets(n: int):
+    rng = random.Random(42)
+    base = datetime(2024, 1, 1)
+    entries = [base + timedelta(seconds=rng.randrange(30 * 86400)) for _ in range(n)]
+    exits = [e + timedelta(seconds=rng.randrange(12 * 3600)) for e in entries]
+    return entries, exits
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N
+    entries, exits = make_tickets(n)
+    if np is not None:
+        # settlement jobs typically load timestamps straight into datetime64 columns
+        entries64 = np.array(entries, dtype="datetime64[us]")
+        exits64 = np.array(exits, dtype="datetime64[us]")
+    print(f"{'strategy':>18} | {'scalar s':>9} | {'batch s':>9} | {'speedup':>7} | identical")
+    for strategy in (FlatRatePricing(10), HourlySlabPricing(10, 5)):
+        start = time.perf_counter()
+        scalar = [strategy.calculate_fee(e, x) for e, x in zip(entries, exits)]
+        t_scalar = time.perf_counter() - start
+        if np is None:
+            print(f"{type(strategy).__name__:>18} | {t_scalar:>9.3f} | {'n/a':>9} | {'n/a':>7} | NumPy missing")
+            continue
+        start = time.perf_counter()
+        batch = strategy.calculate_fees(entries64, exits64)
+        t_batch = time.perf_counter() - start
+        same = batch.tolist() == scalar
+        print(f"{type(strategy).__name__:>18} | {t_scalar:>9.3f} | {t_batch:>9.3f} | {t_scalar / t_batch:>6.0f}x | {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Throughput of many lots: one process (GIL-bound threads) vs ShardedRuntime workers.
+
+Run from the ParkingLot folder:
+    python -m benchmarks.bench_sharding [lots] [batches]
+Each lot gets one client thread doing park_many / unpark_many bursts of BATCH
+vehicles. Scaling with workers is bounded by the cores available.
+"""
+import functools
+import os
+import sys
+import threading
+import time
+from parking_lot.lot import ParkingLot
+from parking_lot.floor import ParkingFloor
+from parking_lot.models import ParkingSpot, Vehicle
+from parking_lot.enums import SpotType, VehicleType
+from parking_lot.pricing import FlatRatePricing
+from parking_lot.sharding import ShardedRuntime
+
+LOTS = 8
+BATCHES = 200
+BATCH = 200
+FLOORS = 10
+SPOTS_PER_FLOOR = 200
+
+
+def build_lot(name: str) -> ParkingLot:
+    floors = [
+        ParkingFloor(f, [ParkingSpot(f"F{f}S{i:03d}", SpotType.COMPACT, f) for i in range(SPOTS_PER_FLOOR)])
+        for f in range(1, FLOORS + 1)
+    ]
+    return ParkingLot(name, floors, FlatRatePricing(10))
+
+
+def drive(lot, name: str, batches: int) -> None:
+    for b in range(batches):
+        results = lot.park_many([Vehicle(f"{name}-{b}-{i}", VehicleType.CAR) for i in range(BATCH)])
+        lot.unpark_many([r.value.ticket_id for r in results if r.ok])
+
+
+def timed(lots: dict, batches: int) -> float:
+    threads = [threading.Thread(target=drive, args=(lot, name, batches)) for name, lot in lots.items()]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return len(lots) * batches * BATCH * 2 / (time.perf_counter() - start)
+
+
+def main() -> None:
+    n_lots = int(sys.argv[1]) if len(sys.argv) > 1 else LOTS
+    batches = int(sys.argv[2]) if len(sys.argv) > 2 else BATCHES
+    names = [f"lot{i}" for i in range(n_lots)]
+    print(f"{'mode':>16} | {'ops/s':>10} | speedup")
+    base = timed({n: build_lot(n) for n in names}, batches)
+    print(f"{'single process':>16} | {base:10.0f} | 1.00x")
+    workers = 1
+    while workers <= min(n_lots, os.cpu_count() or 1):
+        factories = {n: functools.partial(build_lot, n) for n in names}
+        with ShardedRuntime(factories, workers=workers) as runtime:
+            rate = timed({n: runtime.lot(n) for n in names}, batches)
+        print(f"{f'{workers} workers':>16} | {rate:10.0f} | {rate / base:.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
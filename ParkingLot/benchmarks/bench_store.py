@@ -0,0 +1,72 @@
+"""Write-ahead-log ticket store: park throughput and restart recovery time.
+
+Run from the ParkingLot folder:  python -m benchmarks.bench_store [events]
+"""
+import os
+import sys
+import tempfile
+import time
+from parking_lot.lot import ParkingLot
+from parking_lot.floor import ParkingFloor
+from parking_lot.models import ParkingSpot, Vehicle
+from parking_lot.enums import SpotType, VehicleType
+from parking_lot.pricing import FlatRatePricing
+from parking_lot.store import WalTicketStore, TicketRecord
+
+FLOORS = 50
+SPOTS_PER_FLOOR = 1_000
+EVENTS = 2_000_000
+PARKS = 20_000
+
+
+def build_floors():
+    return [
+        ParkingFloor(f, [ParkingSpot(f"F{f}S{i:04d}", SpotType.COMPACT, f) for i in range(SPOTS_PER_FLOOR)])
+        for f in range(1, FLOORS + 1)
+    ]
+
+
+def park_rate(store) -> float:
+    lot = ParkingLot("Bench", build_floors(), FlatRatePricing(10), store=store)
+    start = time.perf_counter()
+    for i in range(PARKS):
+        lot.park(Vehicle(f"C{i}", VehicleType.CAR))
+    if store:
+        store.sync()
+    return PARKS / (time.perf_counter() - start)
+
+
+def write_history(directory: str, events: int) -> int:
+    """Synthesize a log of park/unpark pairs that leaves the lot half full."""
+    capacity = FLOORS * SPOTS_PER_FLOOR
+    keep_open = capacity // 2
+    with open(os.path.join(directory, WalTicketStore.LOG), "w", encoding="utf-8") as f:
+        for i in range(events // 2):
+            slot = i % capacity
+            rec = TicketRecord(f"T{i}", f"C{i}", "CAR", slot // SPOTS_PER_FLOOR + 1,
+                               f"F{slot // SPOTS_PER_FLOOR + 1}S{slot % SPOTS_PER_FLOOR:04d}", i)
+            f.write(rec.encode())
+            if i < events // 2 - keep_open:
+                f.write(f"U\tT{i}\n")
+    return keep_open
+
+
+def main() -> None:
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else EVENTS
+    with tempfile.TemporaryDirectory() as d1, tempfile.TemporaryDirectory() as d2:
+        print(f"park / s   in-memory: {park_rate(None):>9.0f}")
+        print(f"park / s   WAL group: {park_rate(WalTicketStore(d1)):>9.0f}")
+        print(f"park / s   WAL sync : {park_rate(WalTicketStore(d2, synchronous=True)):>9.0f}  (single gate)")
+
+    with tempfile.TemporaryDirectory() as d:
+        open_count = write_history(d, events)
+        start = time.perf_counter()
+        lot = ParkingLot("Bench", build_floors(), FlatRatePricing(10), store=WalTicketStore(d))
+        elapsed = time.perf_counter() - start
+        assert len(lot.tickets) == open_count
+        print(f"recovery: {events:,} log events -> {open_count:,} open tickets in {elapsed:.2f}s")
+        lot.store.close()
+
+
+if __name__ == "__main__":
+    main()
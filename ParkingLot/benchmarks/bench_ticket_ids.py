@@ -0,0 +1,45 @@
+"""Ticket ID minting rate per generator and thread count.
+
+Run from the ParkingLot folder:  python -m benchmarks.bench_ticket_ids
+"""
+import threading
+import time
+from datetime import datetime
+from parking_lot.models import Vehicle
+from parking_lot.enums import VehicleType
+from parking_lot.ticket_ids import SequentialIdGenerator, SnowflakeIdGenerator
+
+TOTAL = 400_000
+CAR = Vehicle("MN-123", VehicleType.CAR)
+
+
+def run(gen, n_threads: int) -> float:
+    """Return IDs per second; asserts every ID is unique."""
+    out = [[] for _ in range(n_threads)]
+
+    def mint(bucket):
+        for _ in range(TOTAL // n_threads):
+            bucket.append(gen.next_id(CAR, datetime.utcnow()))
+
+    threads = [threading.Thread(target=mint, args=(b,)) for b in out]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    ids = [i for b in out for i in b]
+    assert len(set(ids)) == len(ids), "duplicate ticket IDs"
+    return len(ids) / elapsed
+
+
+def main() -> None:
+    print(f"{'generator':>22} | {'threads':>7} | {'ids / s':>10}")
+    for factory in (SequentialIdGenerator, lambda: SnowflakeIdGenerator(node_id=1)):
+        for n in (1, 4):
+            gen = factory()
+            print(f"{type(gen).__name__:>22} | {n:>7} | {run(gen, n):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 from __future__ import annotations
+import heapq
+import threading
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
-from .models import ParkingSpot, Vehicle
+from types import MappingProxyType
+from typing import Dict, List, Optional, Sequence, Tuple
+from .models import ParkingSpot, Vehicle, FloorOccupancy
+from .compatibility import CompatibilityTable, DEFAULT_COMPATIBILITY
 from .enums import SpotType, VehicleType
 from .errors import NoCompatibleSpotError
 
@@ -11,68 +15,103 @@ class ParkingFloor:
     """Represents a single floor in the parking lot."""
     floor_id: int
     spots: List[ParkingSpot] = field(default_factory=list)
+    compatibility: CompatibilityTable = field(default=DEFAULT_COMPATIBILITY, repr=False, compare=False)
 
-    # internal index: SpotType -> [free spot_ids]
+    # internal index: SpotType -> min-heap of free spot_ids
     _free_index: Dict[SpotType, List[str]] = field(default_factory=dict, init=False, repr=False)
+    # live counters: VehicleType -> free compatible spots, kept in O(1) per change
+    _vtype_free: Dict[VehicleType, int] = field(default_factory=dict, init=False, repr=False)
+    # internal lookup: SpotType -> vehicle types that can use it
+    _users: Dict[SpotType, Tuple[VehicleType, ...]] = field(default_factory=dict, init=False, repr=False)
+    # internal lookup: spot_id -> spot
+    _spots_by_id: Dict[str, ParkingSpot] = field(default_factory=dict, init=False, repr=False)
+    # per-floor lock, used by AllocationService in concurrent mode
+    lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """Initialize free index for fast allocation."""
         for spot in self.spots:
-            if spot.stype not in self._free_index:
-                self._free_index[spot.stype] = []
-            if not spot.occupied:
-                self._free_index[spot.stype].append(spot.spot_id)
-        # deterministic order: lower IDs first
-        for s in self._free_index.values():
-            s.sort()
+            self._spots_by_id[spot.spot_id] = spot
+        self._rebuild_index()
 
     # ---------------- Core Operations ---------------- #
 
-    def find_free_spot(self, vtype: VehicleType) -> Optional[ParkingSpot]:
-        """Return the first compatible free spot for this vehicle type."""
-        for stype, free_list in self._free_index.items():
-            if self._compatible(vtype, stype) and free_list:
-                sid = free_list[0]
-                return self._get_spot(sid)
+    def find_free_spot(self, vtype: VehicleType, stypes: Optional[Sequence[SpotType]] = None) -> Optional[ParkingSpot]:
+        """Return the lowest-ID free spot of the best-fitting compatible type
+        (optionally restricted to ``stypes``, tried in the given order)."""
+        for stype in stypes or self.compatibility.preferred(vtype):
+            free_list = self._free_index.get(stype)
+            if free_list:
+                return self._spots_by_id[free_list[0]]
         return None
 
-    def assign_vehicle(self, vehicle: Vehicle) -> ParkingSpot:
+    def assign_vehicle(self, vehicle: Vehicle, stypes: Optional[Sequence[SpotType]] = None) -> ParkingSpot:
         """Assign the first available compatible spot to a vehicle."""
-        spot = self.find_free_spot(vehicle.vtype)
+        spot = self.find_free_spot(vehicle.vtype, stypes)
         if not spot:
             raise NoCompatibleSpotError(f"No compatible free spot on floor {self.floor_id}")
-        spot.assign(vehicle)
-        # remove from free index
-        self._free_index[spot.stype].remove(spot.spot_id)
+        spot.assign(vehicle, self.compatibility)
+        # found spot is always the heap root, so pop it in O(log n)
+        heapq.heappop(self._free_index[spot.stype])
+        for vtype in self._users[spot.stype]:
+            self._vtype_free[vtype] -= 1
         return spot
 
     def free_spot(self, spot_id: str) -> None:
         """Free a spot and update index."""
         spot = self._get_spot(spot_id)
         v = spot.free()
-        self._free_index[spot.stype].append(spot_id)
-        self._free_index[spot.stype].sort()
+        heapq.heappush(self._free_index[spot.stype], spot_id)
+        for vtype in self._users[spot.stype]:
+            self._vtype_free[vtype] += 1
         return v
 
+    def restore(self, occupants: Dict[str, Vehicle]) -> List[ParkingSpot]:
+        """Bulk-occupy spots (e.g. on crash recovery) and rebuild the free index in O(n)."""
+        spots = []
+        for sid, vehicle in occupants.items():
+            spot = self._get_spot(sid)
+            spot.assign(vehicle, self.compatibility)
+            spots.append(spot)
+        self._rebuild_index()
+        return spots
+
     # ---------------- Helpers ---------------- #
 
     def available_count(self, stype: SpotType) -> int:
         """Number of free spots of a given type."""
         return len(self._free_index.get(stype, []))
 
-    def _get_spot(self, sid: str) -> ParkingSpot:
-        for s in self.spots:
-            if s.spot_id == sid:
-                return s
-        raise ValueError(f"Spot {sid} not found on floor {self.floor_id}")
+    def free_count_for(self, vtype: VehicleType) -> int:
+        """Number of free spots this vehicle type could use (O(1) counter)."""
+        return self._vtype_free.get(vtype, 0)
 
-    @staticmethod
-    def _compatible(vtype: VehicleType, stype: SpotType) -> bool:
-        """Compatibility logic (mirrors ParkingSpot.can_fit)."""
-        if vtype == VehicleType.BIKE:
-            return stype in {SpotType.MOTORBIKE, SpotType.COMPACT, SpotType.LARGE}
-        if vtype == VehicleType.CAR:
-            return stype in {SpotType.COMPACT, SpotType.LARGE}
-        if vtype == VehicleType.TRUCK:
-            return stype == SpotType.LARGE
-        return False
+    def occupancy(self) -> FloorOccupancy:
+        """Immutable copy of this floor's live counters."""
+        return FloorOccupancy(
+            self.floor_id,
+            MappingProxyType({stype: len(free) for stype, free in self._free_index.items()}),
+            MappingProxyType(dict(self._vtype_free)),
+        )
+
+    def _rebuild_index(self) -> None:
+        self._free_index = {}
+        for spot in self.spots:
+            if spot.stype not in self._free_index:
+                self._free_index[spot.stype] = []
+            if not spot.occupied:
+                self._free_index[spot.stype].append(spot.spot_id)
+        # deterministic order: lower IDs first (heap root is the lowest ID)
+        for s in self._free_index.values():
+            heapq.heapify(s)
+        self._users = {stype: self.compatibility.users(stype) for stype in self._free_index}
+        self._vtype_free = {
+            vt: sum(len(self._free_index.get(stype, ())) for stype in self.compatibility.preferred(vt))
+            for vt in self.compatibility.vehicle_types()
+        }
+
+    def _get_spot(self, sid: str) -> ParkingSpot:
+        spot = self._spots_by_id.get(sid)
+        if spot is None:
+            raise ValueError(f"Spot {sid} not found on floor {self.floor_id}")
+        return spot
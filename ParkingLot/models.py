@@ -1,11 +1,15 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Mapping, Optional, Tuple
 from .enums import VehicleType, SpotType
 from .errors import SpotAlreadyOccupiedError, SpotNotOccupiedError
+from .compatibility import CompatibilityTable, DEFAULT_COMPATIBILITY
 
-@dataclass(frozen=True)
+if TYPE_CHECKING:
+    from .floor import ParkingFloor
+
+@dataclass(frozen=True, slots=True)
 class Vehicle:
     license_no: str
     vtype: VehicleType
@@ -13,7 +17,7 @@ class Vehicle:
     def __str__(self) -> str:
         return f"{self.vtype.name}:{self.license_no}"
 
-@dataclass
+@dataclass(slots=True)
 class ParkingSpot:
     spot_id: str
     stype: SpotType
@@ -21,20 +25,14 @@ class ParkingSpot:
     occupied: bool = field(default=False, init=False)
     vehicle: Optional[Vehicle] = field(default=None, init=False, repr=False)
 
-    def can_fit(self, vehicle: Vehicle) -> bool:
-        """Compatibility matrix (expandable)."""
-        if vehicle.vtype == VehicleType.BIKE:
-            return self.stype in {SpotType.MOTORBIKE, SpotType.COMPACT, SpotType.LARGE}
-        if vehicle.vtype == VehicleType.CAR:
-            return self.stype in {SpotType.COMPACT, SpotType.LARGE}
-        if vehicle.vtype == VehicleType.TRUCK:
-            return self.stype in {SpotType.LARGE}
-        return False
-
-    def assign(self, vehicle: Vehicle) -> None:
+    def can_fit(self, vehicle: Vehicle, table: CompatibilityTable = DEFAULT_COMPATIBILITY) -> bool:
+        """Compatibility matrix (see CompatibilityTable)."""
+        return table.fits(vehicle.vtype, self.stype)
+
+    def assign(self, vehicle: Vehicle, table: CompatibilityTable = DEFAULT_COMPATIBILITY) -> None:
         if self.occupied:
             raise SpotAlreadyOccupiedError(f"Spot {self.spot_id} already occupied")
-        if not self.can_fit(vehicle):
+        if not self.can_fit(vehicle, table):
             raise ValueError(f"Vehicle {vehicle} incompatible with spot {self.stype.name}")
         self.vehicle = vehicle
         self.occupied = True
@@ -47,13 +45,47 @@ class ParkingSpot:
         self.occupied = False
         return v  # type: ignore[return-value]
 
-@dataclass
+@dataclass(slots=True)
 class Ticket:
     ticket_id: str
     vehicle: Vehicle
     spot_id: str
     entry_time: datetime
     exit_time: Optional[datetime] = None
+    # direct handles for O(1) release on exit
+    floor: Optional[ParkingFloor] = field(default=None, repr=False, compare=False)
+    spot: Optional[ParkingSpot] = field(default=None, repr=False, compare=False)
 
     def close(self, when: Optional[datetime] = None) -> None:
         self.exit_time = when or datetime.utcnow()
+
+
+@dataclass(slots=True)
+class BatchResult:
+    """Outcome of one item in a park_many / unpark_many batch."""
+    item: Any
+    value: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True, slots=True)
+class FloorOccupancy:
+    """Free-spot counters of one floor at a point in time."""
+    floor_id: int
+    free_by_spot_type: Mapping[SpotType, int]
+    free_by_vehicle_type: Mapping[VehicleType, int]
+
+
+@dataclass(frozen=True, slots=True)
+class OccupancySnapshot:
+    """Immutable lot-wide availability, safe to share between reader threads."""
+    version: int
+    floors: Tuple[FloorOccupancy, ...]
+
+    def free_for(self, vtype: VehicleType) -> int:
+        """Spots usable by this vehicle type across all floors."""
+        return sum(f.free_by_vehicle_type.get(vtype, 0) for f in self.floors)
@@ -1,16 +1,259 @@
-from typing import List, Optional
+import threading
+from contextlib import nullcontext
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
 from .floor import ParkingFloor
-from .models import ParkingSpot
-from .enums import VehicleType
+from .models import ParkingSpot, Vehicle, OccupancySnapshot
+from .enums import SpotType, VehicleType
+from .errors import NoCompatibleSpotError
+from .compatibility import DEFAULT_COMPATIBILITY
+from .policies import AllocationPolicy, FirstFitPolicy
+
+
+class _FreeCountTree:
+    """Max segment tree over per-floor free counts (leaf i = i-th floor)."""
+    def __init__(self, counts: List[int]):
+        size = 1
+        while size < len(counts):
+            size *= 2
+        self._size = size
+        self._tree = [0] * (2 * size)
+        self._tree[size:size + len(counts)] = counts
+        for i in range(size - 1, 0, -1):
+            self._tree[i] = max(self._tree[2 * i], self._tree[2 * i + 1])
+
+    def update(self, pos: int, count: int) -> None:
+        """Set the count for one floor and fix ancestors, O(log floors)."""
+        i = pos + self._size
+        if self._tree[i] == count:
+            return
+        self._tree[i] = count
+        i //= 2
+        while i:
+            best = max(self._tree[2 * i], self._tree[2 * i + 1])
+            if self._tree[i] == best:
+                break
+            self._tree[i] = best
+            i //= 2
+
+    def get(self, pos: int) -> int:
+        return self._tree[pos + self._size]
+
+    def argmax(self) -> int:
+        """Position of the (first) floor with the highest count, or -1 if all are zero."""
+        if self._tree[1] <= 0:
+            return -1
+        i = 1
+        while i < self._size:
+            i = 2 * i if self._tree[2 * i] == self._tree[i] else 2 * i + 1
+        return i - self._size
+
+    def first_free(self, start: int = 0) -> int:
+        """Position of the first floor >= start with a non-zero count, or -1."""
+        if start >= self._size:
+            return -1
+        # climb from the start leaf until a right-hand subtree has room
+        i = start + self._size
+        while self._tree[i] <= 0:
+            while i & 1:
+                i //= 2
+                if i == 0:
+                    return -1
+            i += 1
+        # then descend to its leftmost non-empty leaf
+        while i < self._size:
+            i = 2 * i if self._tree[2 * i] > 0 else 2 * i + 1
+        return i - self._size
+
 
 class AllocationService:
-    """Deterministically picks first compatible free spot across floors."""
-    def __init__(self, floors: List[ParkingFloor]):
+    """Picks a compatible free spot across floors according to an AllocationPolicy.
+
+    The default FirstFitPolicy is deterministic: lowest floor first, best-fit
+    spot type within it. Keeps max segment trees of free counts per
+    VehicleType and per SpotType, so policies can find the first or the
+    roomiest floor with space in O(log floors). Floors must be mutated through
+    `assign` / `release` to keep the indexes in sync.
+
+    With ``concurrent=True`` every floor is guarded by its own lock and the
+    indexes by a short-lived lock, making find-and-assign atomic. A gate that
+    finds the chosen floor busy asks the policy for the next best floor
+    instead of queueing, so placement only follows the policy exactly when
+    there is no contention.
+    """
+    def __init__(self, floors: List[ParkingFloor], concurrent: bool = False,
+                 policy: Optional[AllocationPolicy] = None):
         self.floors = sorted(floors, key=lambda f: f.floor_id)
+        self.concurrent = concurrent
+        self.policy = policy or FirstFitPolicy()
+        # the lot-wide table policies consult for preference order
+        self.compatibility = self.floors[0].compatibility if self.floors else DEFAULT_COMPATIBILITY
+        self._index_lock = threading.Lock() if concurrent else nullcontext()
+        self._position: Dict[int, int] = {f.floor_id: i for i, f in enumerate(self.floors)}
+        # every vehicle / spot type known to any floor's compatibility table
+        self.vehicle_types = tuple(dict.fromkeys(vt for f in self.floors for vt in f.compatibility.vehicle_types()))
+        self.spot_types = tuple(dict.fromkeys(st for f in self.floors for st in f.compatibility.spot_types()))
+        self._trees: Dict[VehicleType, _FreeCountTree] = {
+            vtype: _FreeCountTree([f.free_count_for(vtype) for f in self.floors])
+            for vtype in self.vehicle_types
+        }
+        self._spot_trees: Dict[SpotType, _FreeCountTree] = {
+            stype: _FreeCountTree([f.available_count(stype) for f in self.floors])
+            for stype in self.spot_types
+        }
+        self._spot_totals: Dict[SpotType, int] = {
+            stype: sum(f.available_count(stype) for f in self.floors) for stype in self.spot_types
+        }
+        self.version = 0  # bumped on every index change
+        self._snapshot: Optional[OccupancySnapshot] = None
+
+    def find_spot(self, vtype: VehicleType) -> Optional[Tuple[ParkingFloor, ParkingSpot]]:
+        """Return (floor, spot) the policy would pick, or None.
 
-    def find_spot(self, vtype: VehicleType) -> Optional[ParkingSpot]:
-        for floor in self.floors:
-            spot = floor.find_free_spot(vtype)
+        In concurrent mode the answer is advisory; use `assign` to claim it.
+        """
+        choice = self.policy.choose(self, vtype, self.compatibility.preferred(vtype))
+        if choice is None:
+            return None
+        floor = self.floors[choice[0]]
+        return floor, floor.find_free_spot(vtype, choice[1])
+
+    def assign(self, vehicle: Vehicle) -> Tuple[ParkingFloor, ParkingSpot]:
+        """Atomically find and park the vehicle in a compatible free spot."""
+        while True:
+            claim = self._claim_floor(vehicle.vtype)
+            if claim is None:
+                raise NoCompatibleSpotError("Lot full for this vehicle type.")
+            floor, stypes = claim
+            try:
+                spot = floor.assign_vehicle(vehicle, stypes)
+            except NoCompatibleSpotError:
+                spot = None  # index was stale: another gate took the last spot
+            finally:
+                self._refresh(floor)
+                self._unclaim(floor)
             if spot:
-                return spot
-        return None
+                return floor, spot
+
+    def assign_many(self, vehicles: List[Vehicle]) -> List[Optional[Tuple[ParkingFloor, ParkingSpot]]]:
+        """Park a batch in one pass: vehicles are grouped by type and a claimed
+        floor keeps taking vehicles for as long as the policy still picks it.
+        Returns (floor, spot) per vehicle in input order, or None where the
+        lot had no room.
+        """
+        placed: List[Optional[Tuple[ParkingFloor, ParkingSpot]]] = [None] * len(vehicles)
+        by_type: Dict[VehicleType, List[int]] = {}
+        for i, vehicle in enumerate(vehicles):
+            by_type.setdefault(vehicle.vtype, []).append(i)
+
+        for vtype, pending in by_type.items():
+            preferred = self.compatibility.preferred(vtype)
+            k = 0
+            while k < len(pending):
+                claim = self._claim_floor(vtype)
+                if claim is None:
+                    break
+                floor, stypes = claim
+                pos = self._position[floor.floor_id]
+                try:
+                    while k < len(pending):
+                        try:
+                            spot = floor.assign_vehicle(vehicles[pending[k]], stypes)
+                        except NoCompatibleSpotError:
+                            break
+                        placed[pending[k]] = floor, spot
+                        k += 1
+                        self._refresh(floor)
+                        choice = self.policy.choose(self, vtype, preferred)
+                        if choice is None or choice[0] != pos:
+                            break
+                        stypes = choice[1]
+                finally:
+                    self._refresh(floor)
+                    self._unclaim(floor)
+        return placed
+
+    def release(self, floor: ParkingFloor, spot_id: str) -> Vehicle:
+        """Free a spot on the given floor and update the index."""
+        with floor.lock if self.concurrent else nullcontext():
+            vehicle = floor.free_spot(spot_id)
+            self._refresh(floor)
+        return vehicle
+
+    def snapshot(self) -> OccupancySnapshot:
+        """Immutable availability view for pollers; takes no allocation locks.
+
+        The snapshot is cached and rebuilt only when the index version moved.
+        Under concurrent traffic each counter is exact, but counters of
+        different floors may straddle an in-flight assign or release.
+        """
+        snap, version = self._snapshot, self.version
+        if snap is None or snap.version != version:
+            snap = OccupancySnapshot(version, tuple(f.occupancy() for f in self.floors))
+            self._snapshot = snap
+        return snap
+
+    # ---------------- Index Queries (used by policies) ---------------- #
+
+    def first_floor(self, vtype: VehicleType, stypes: Optional[Sequence[SpotType]] = None, start: int = 0) -> int:
+        """Position of the first floor >= start with a free spot of ``stypes``
+        (default: any type compatible with ``vtype``), or -1."""
+        with self._index_lock:
+            if stypes is None or tuple(stypes) == self.compatibility.preferred(vtype):
+                tree = self._trees.get(vtype)
+                return tree.first_free(start) if tree else -1
+            found = [self._spot_trees[st].first_free(start) for st in stypes if st in self._spot_trees]
+            found = [p for p in found if p >= 0]
+            return min(found) if found else -1
+
+    def roomiest_floor(self, vtype: VehicleType) -> int:
+        """Position of the floor with the most spots usable by ``vtype``, or -1."""
+        tree = self._trees.get(vtype)
+        if tree is None:
+            return -1
+        with self._index_lock:
+            return tree.argmax()
+
+    def free_on(self, pos: int, stypes: Sequence[SpotType]) -> int:
+        """Free spots of the given types on the floor at ``pos``."""
+        floor = self.floors[pos]
+        return sum(floor.available_count(st) for st in stypes)
+
+    def free_spots(self, stype: SpotType) -> int:
+        """Free spots of one type across the whole lot."""
+        return self._spot_totals.get(stype, 0)
+
+    # ---------------- Helpers ---------------- #
+
+    def _claim_floor(self, vtype: VehicleType) -> Optional[Tuple[ParkingFloor, Tuple[SpotType, ...]]]:
+        """Return the policy's choice, locking the floor in concurrent mode."""
+        preferred = self.compatibility.preferred(vtype)
+        first = choice = self.policy.choose(self, vtype, preferred)
+        if not self.concurrent:
+            return (self.floors[choice[0]], choice[1]) if choice else None
+        busy: FrozenSet[int] = frozenset()
+        while choice:
+            floor = self.floors[choice[0]]
+            if floor.lock.acquire(blocking=False):
+                return floor, choice[1]
+            busy |= {choice[0]}
+            choice = self.policy.choose(self, vtype, preferred, busy)
+        if first is None:
+            return None
+        # every candidate is busy: wait on the policy's first choice
+        self.floors[first[0]].lock.acquire()
+        return self.floors[first[0]], first[1]
+
+    def _unclaim(self, floor: ParkingFloor) -> None:
+        if self.concurrent:
+            floor.lock.release()
+
+    def _refresh(self, floor: ParkingFloor) -> None:
+        pos = self._position[floor.floor_id]
+        with self._index_lock:
+            for vtype, tree in self._trees.items():
+                tree.update(pos, floor.free_count_for(vtype))
+            for stype, tree in self._spot_trees.items():
+                count = floor.available_count(stype)
+                self._spot_totals[stype] += count - tree.get(pos)
+                tree.update(pos, count)
+            self.version += 1
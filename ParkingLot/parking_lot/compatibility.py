@@ -0,0 +1,47 @@
+from typing import Dict, Hashable, Mapping, Sequence, Tuple
+from .enums import VehicleType, SpotType
+
+
+class CompatibilityTable:
+    """Which spot types each vehicle type may use, in best-fit preference order.
+
+    Every spot type gets one bit and every vehicle type a mask over those bits,
+    so `fits` is a single AND. Extra types (say a VAN vehicle or an
+    EV_CHARGING spot from another Enum) are added by listing them in ``rules``.
+    """
+    def __init__(self, rules: Mapping[Hashable, Sequence[Hashable]]):
+        self._preferred: Dict[Hashable, Tuple[Hashable, ...]] = {vt: tuple(st) for vt, st in rules.items()}
+        self._bit: Dict[Hashable, int] = {}
+        for stypes in self._preferred.values():
+            for stype in stypes:
+                self._bit.setdefault(stype, 1 << len(self._bit))
+        self._mask: Dict[Hashable, int] = {
+            vt: sum(self._bit[st] for st in set(stypes)) for vt, stypes in self._preferred.items()
+        }
+        self._users: Dict[Hashable, Tuple[Hashable, ...]] = {
+            st: tuple(vt for vt, mask in self._mask.items() if mask & bit) for st, bit in self._bit.items()
+        }
+
+    def fits(self, vtype: Hashable, stype: Hashable) -> bool:
+        return bool(self._mask.get(vtype, 0) & self._bit.get(stype, 0))
+
+    def preferred(self, vtype: Hashable) -> Tuple[Hashable, ...]:
+        """Spot types this vehicle may use, best fit first."""
+        return self._preferred.get(vtype, ())
+
+    def users(self, stype: Hashable) -> Tuple[Hashable, ...]:
+        """Vehicle types that may use this spot type."""
+        return self._users.get(stype, ())
+
+    def vehicle_types(self) -> Tuple[Hashable, ...]:
+        return tuple(self._preferred)
+
+    def spot_types(self) -> Tuple[Hashable, ...]:
+        return tuple(self._bit)
+
+
+DEFAULT_COMPATIBILITY = CompatibilityTable({
+    VehicleType.BIKE: [SpotType.MOTORBIKE, SpotType.COMPACT, SpotType.LARGE],
+    VehicleType.CAR: [SpotType.COMPACT, SpotType.LARGE],
+    VehicleType.TRUCK: [SpotType.LARGE],
+})
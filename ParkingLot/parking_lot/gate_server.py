@@ -0,0 +1,165 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from .lot import ParkingLot
+from .models import Vehicle
+
+# Wire protocol: one JSON object per line in each direction.
+#   {"op": "park", "license_no": "MN-123", "vtype": "CAR"}
+#       -> {"ok": true, "ticket_id": "...", "floor": 1, "spot": "F1S2"}
+#   {"op": "unpark", "ticket_id": "..."}   -> {"ok": true, "fee": 10.0}
+#   {"op": "availability"}                 -> {"ok": true, "floors": {"1": {"CAR": 3, ...}}}
+# Failures come back as {"ok": false, "error": "..."}. Responses on a
+# connection are sent in request order.
+
+
+class GateServer:
+    """Asyncio front end for a ParkingLot, shared by many entry/exit gates.
+
+    Park and unpark requests from all connections are queued and drained by a
+    single batcher task, which hands each burst to `park_many` / `unpark_many`
+    in one call. The queue holds at most ``max_queue`` requests; when it is
+    full, connections stop being read until the batcher catches up, so load
+    backs up to the gates instead of into memory. Batches (and availability
+    reads) run on one worker thread, so the lot is only touched by one thread
+    and a ``synchronous=True`` store's fsync never stalls the event loop.
+    """
+    def __init__(self, lot: ParkingLot, max_batch: int = 512, max_queue: int = 4096):
+        self.lot = lot
+        self.max_batch = max_batch
+        self._queue: "asyncio.Queue[Tuple[str, Any, asyncio.Future]]" = asyncio.Queue(maxsize=max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gate-lot")
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._vtypes = {vt.name: vt for vt in lot.allocation.vehicle_types}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None) -> None:
+        """Listen on TCP (host, port) or, if ``path`` is given, on a Unix socket."""
+        if path:
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        self._batcher = asyncio.create_task(self._batch_loop())
+
+    @property
+    def address(self):
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+        self._batcher.cancel()
+        self._executor.shutdown(wait=False)
+
+    # ---------------- Request Handling ---------------- #
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self._dispatch(json.loads(line))
+                except Exception as e:
+                    response = {"ok": False, "error": str(e) or type(e).__name__}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        op = request.get("op")
+        if op == "park":
+            vtype = self._vtypes.get(request["vtype"])
+            if vtype is None:
+                raise ValueError(f"Unknown vehicle type {request['vtype']!r}")
+            item: Any = Vehicle(request["license_no"], vtype)
+        elif op == "unpark":
+            item = request["ticket_id"]
+        elif op == "availability":
+            floors = await asyncio.get_running_loop().run_in_executor(self._executor, self._availability)
+            return {"ok": True, "floors": floors}
+        else:
+            raise ValueError(f"Unknown op {op!r}")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((op, item, future))
+        return await future
+
+    async def _batch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            parks = [(item, fut) for op, item, fut in batch if op == "park"]
+            unparks = [(item, fut) for op, item, fut in batch if op == "unpark"]
+            try:
+                unparked, parked = await loop.run_in_executor(
+                    self._executor, self._run_batch, [v for v, _ in parks], [tid for tid, _ in unparks])
+            except Exception as e:  # never leave gates hanging on a failed batch
+                for _, _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            # futures belong to the loop: resolve them here, not on the worker thread
+            for (_, fut), r in zip(unparks, unparked):
+                self._resolve(fut, r, lambda fee: {"fee": fee})
+            for (_, fut), r in zip(parks, parked):
+                self._resolve(fut, r, lambda t: {"ticket_id": t.ticket_id, "floor": t.floor.floor_id, "spot": t.spot_id})
+
+    def _run_batch(self, vehicles: List[Vehicle], ticket_ids: List[str]) -> Tuple[list, list]:
+        """On the worker thread: one burst against the lot (and its store)."""
+        # exits first, so a burst can reuse the spots it frees
+        unparked = self.lot.unpark_many(ticket_ids) if ticket_ids else []
+        parked = self.lot.park_many(vehicles) if vehicles else []
+        return unparked, parked
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result, render) -> None:
+        if future.done():  # client went away
+            return
+        if result.ok:
+            future.set_result({"ok": True, **render(result.value)})
+        else:
+            future.set_result({"ok": False, "error": str(result.error)})
+
+    def _availability(self) -> Dict[str, Dict[str, int]]:
+        return {
+            str(f.floor_id): {vt.name: n for vt, n in f.free_by_vehicle_type.items()}
+            for f in self.lot.occupancy().floors
+        }
+
+
+class GateClient:
+    """Minimal client for GateServer; one connection, requests answered in order."""
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None) -> "GateClient":
+        if path:
+            return cls(*await asyncio.open_unix_connection(path))
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def request(self, **payload) -> Dict[str, Any]:
+        self._writer.write(json.dumps(payload).encode() + b"\n")
+        await self._writer.drain()
+        return json.loads(await self._reader.readline())
+
+    async def park(self, license_no: str, vtype: str) -> Dict[str, Any]:
+        return await self.request(op="park", license_no=license_no, vtype=vtype)
+
+    async def unpark(self, ticket_id: str) -> Dict[str, Any]:
+        return await self.request(op="unpark", ticket_id=ticket_id)
+
+    async def availability(self) -> Dict[str, Any]:
+        return await self.request(op="availability")
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
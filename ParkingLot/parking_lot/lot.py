@@ -1,44 +1,140 @@
+import threading
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Optional
 from .floor import ParkingFloor
-from .models import Vehicle, Ticket
+from .models import Vehicle, Ticket, ParkingSpot, BatchResult, OccupancySnapshot
 from .pricing import PricingStrategy
 from .allocation import AllocationService
-from .errors import NoCompatibleSpotError
+from .policies import AllocationPolicy
+from .ticket_ids import TicketIdGenerator, SequentialIdGenerator
+from .store import TicketStore
+from .errors import NoCompatibleSpotError, ParkingError
 
 class ParkingLot:
-    """Main orchestrator for entry/exit."""
-    def __init__(self, name: str, floors: list[ParkingFloor], pricing: PricingStrategy):
+    """Main orchestrator for entry/exit.
+
+    Pass ``concurrent=True`` when several gate threads share one lot: spot
+    allocation then uses per-floor locks and the ticket map its own lock.
+    Ticket IDs come from a pluggable `TicketIdGenerator`: sequential by default,
+    which is unique within this lot; pass a `SnowflakeIdGenerator` with a
+    configured node id when several processes or hosts issue tickets.
+    Spot selection follows a pluggable `AllocationPolicy` (first-fit by default).
+    With a `TicketStore`, every park/unpark is journaled and the open tickets
+    (and spot occupancy) are restored from it on construction.
+    """
+    def __init__(self, name: str, floors: list[ParkingFloor], pricing: PricingStrategy,
+                 concurrent: bool = False, ticket_ids: Optional[TicketIdGenerator] = None,
+                 store: Optional[TicketStore] = None, policy: Optional[AllocationPolicy] = None):
         self.name = name
         self.floors = floors
         self.pricing = pricing
         self.tickets: Dict[str, Ticket] = {}
-        self.allocation = AllocationService(floors)
+        self.ticket_ids = ticket_ids or SequentialIdGenerator()
+        self.store = store
+        if store:
+            self._restore(store)
+        self.allocation = AllocationService(floors, concurrent=concurrent, policy=policy)
+        self._tickets_lock = threading.Lock() if concurrent else nullcontext()
 
     def park(self, vehicle: Vehicle) -> Ticket:
-        spot = self.allocation.find_spot(vehicle.vtype)
-        if not spot:
-            raise NoCompatibleSpotError("Lot full for this vehicle type.")
-        floor = next(f for f in self.floors if f.floor_id == spot.floor)
-        assigned = floor.assign_vehicle(vehicle)
-        ticket_id = f"{vehicle.license_no}-{datetime.utcnow().timestamp():.0f}"
-        ticket = Ticket(ticket_id, vehicle, assigned.spot_id, datetime.utcnow())
-        self.tickets[ticket_id] = ticket
+        floor, assigned = self.allocation.assign(vehicle)
+        ticket = self._new_ticket(vehicle, floor, assigned, datetime.utcnow())
+        with self._tickets_lock:
+            self.tickets[ticket.ticket_id] = ticket
+        if self.store:
+            self.store.record_park(ticket)
         return ticket
 
     def unpark(self, ticket_id: str) -> float:
-        ticket = self.tickets.get(ticket_id)
+        # claim the ticket first so two gates cannot settle it twice
+        with self._tickets_lock:
+            ticket = self.tickets.pop(ticket_id, None)
         if not ticket:
             raise ValueError("Invalid ticket ID.")
+        if self.store:
+            self.store.record_unpark(ticket_id)
         ticket.close()
         exit_time = ticket.exit_time
         fee = self.pricing.calculate_fee(ticket.entry_time, exit_time)
-        # find the floor & free spot
-        for floor in self.floors:
-            try:
-                floor.free_spot(ticket.spot_id)
-                break
-            except Exception:
-                continue
-        del self.tickets[ticket_id]
+        self._release_spot(ticket)
         return fee
+
+    def occupancy(self) -> OccupancySnapshot:
+        """Live free-spot counters per floor, SpotType and VehicleType (cheap to poll)."""
+        return self.allocation.snapshot()
+
+    # ---------------- Batch Operations ---------------- #
+
+    def park_many(self, vehicles: List[Vehicle]) -> List[BatchResult]:
+        """Park a burst of vehicles; one result (Ticket or error) per vehicle, in order."""
+        placements = self.allocation.assign_many(vehicles)
+        now = datetime.utcnow()
+        results: List[BatchResult] = []
+        issued: Dict[str, Ticket] = {}
+        for vehicle, placed in zip(vehicles, placements):
+            if placed is None:
+                results.append(BatchResult(vehicle, error=NoCompatibleSpotError("Lot full for this vehicle type.")))
+                continue
+            ticket = self._new_ticket(vehicle, *placed, now)
+            issued[ticket.ticket_id] = ticket
+            results.append(BatchResult(vehicle, ticket))
+        with self._tickets_lock:
+            self.tickets.update(issued)
+        if self.store:
+            for ticket in issued.values():
+                self.store.record_park(ticket)
+        return results
+
+    def unpark_many(self, ticket_ids: List[str]) -> List[BatchResult]:
+        """Settle a burst of exits; one result (fee or error) per ticket ID, in order."""
+        with self._tickets_lock:
+            claimed = [self.tickets.pop(tid, None) for tid in ticket_ids]
+        now = datetime.utcnow()
+        closed = [t for t in claimed if t]
+        if self.store:
+            for ticket in closed:
+                self.store.record_unpark(ticket.ticket_id)
+        for ticket in closed:
+            ticket.close(now)
+        fees = iter(self.pricing.calculate_fees([t.entry_time for t in closed], [t.exit_time for t in closed]))
+
+        results: List[BatchResult] = []
+        for tid, ticket in zip(ticket_ids, claimed):
+            if not ticket:
+                results.append(BatchResult(tid, error=ValueError("Invalid ticket ID.")))
+                continue
+            self._release_spot(ticket)
+            results.append(BatchResult(tid, float(next(fees))))
+        return results
+
+    # ---------------- Helpers ---------------- #
+
+    def _new_ticket(self, vehicle: Vehicle, floor: ParkingFloor, spot: ParkingSpot, now: datetime) -> Ticket:
+        ticket_id = self.ticket_ids.next_id(vehicle, now)
+        return Ticket(ticket_id, vehicle, spot.spot_id, now, floor=floor, spot=spot)
+
+    def _restore(self, store: TicketStore) -> None:
+        """Re-occupy spots for tickets that were open when the store was last written."""
+        floors = {f.floor_id: f for f in self.floors}
+        vtypes = {vt.name: vt for f in self.floors for vt in f.compatibility.vehicle_types()}
+        by_floor: Dict[int, list] = {}
+        for record in store.open_tickets():
+            by_floor.setdefault(record.floor_id, []).append(record)
+        for floor_id, records in by_floor.items():
+            floor = floors.get(floor_id)
+            if floor is None:
+                raise ParkingError(f"Stored ticket {records[0].ticket_id} is on floor {floor_id}, "
+                                   f"which is not configured (floors: {sorted(floors)})")
+            occupants = {r.spot_id: Vehicle(r.license_no, vtypes[r.vtype]) for r in records}
+            spots = floor.restore(occupants)
+            for record, spot in zip(records, spots):
+                self.tickets[record.ticket_id] = Ticket(
+                    record.ticket_id, spot.vehicle, spot.spot_id, record.entry_time, floor=floor, spot=spot
+                )
+        self.ticket_ids.resume_after(self.tickets)  # new parks must not reuse a restored ID
+
+    def _release_spot(self, ticket: Ticket) -> None:
+        if ticket.floor is None:
+            raise ParkingError(f"Ticket {ticket.ticket_id} has no floor handle")
+        self.allocation.release(ticket.floor, ticket.spot_id)
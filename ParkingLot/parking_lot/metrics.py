@@ -0,0 +1,290 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .lot import ParkingLot
+
+# Latency histograms use power-of-two nanosecond buckets: bucket i counts
+# observations with ns.bit_length() == i, i.e. ns < 2**i. 40 buckets reach ~18 min.
+_BUCKETS = 40
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Counter:
+    """Monotonic count: bumped via ``value``, or read from ``fn`` when given."""
+    __slots__ = ("value", "fn")
+    kind = "counter"
+
+    def __init__(self, fn: Optional[Callable[[], int]] = None):
+        self.value = 0
+        self.fn = fn
+
+    def samples(self, name: str, labels: Labels) -> Iterable[Tuple[str, Labels, float]]:
+        yield name, labels, self.fn() if self.fn else self.value
+
+
+class Gauge:
+    """Value read from ``fn`` at render time, so it costs nothing between scrapes."""
+    __slots__ = ("fn",)
+    kind = "gauge"
+
+    def __init__(self, fn: Callable[[], float]):
+        self.fn = fn
+
+    def samples(self, name, labels):
+        yield name, labels, self.fn()
+
+
+class Histogram:
+    """Log2-bucketed latency histogram in nanoseconds, exported in seconds.
+
+    `observe` is two list/attribute updates and takes no lock; under heavy
+    thread contention an occasional observation may be lost.
+    """
+    __slots__ = ("buckets", "sum")
+    kind = "histogram"
+
+    def __init__(self):
+        self.buckets = [0] * (_BUCKETS + 1)
+        self.sum = 0
+
+    def observe(self, ns: int) -> None:
+        self.buckets[min(ns.bit_length(), _BUCKETS)] += 1
+        self.sum += ns
+
+    @property
+    def count(self) -> int:
+        return sum(self.buckets)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound (seconds) of the bucket holding the q-th observation."""
+        target, seen = q * self.count, 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return (1 << i) / 1e9
+        return 0.0
+
+    def samples(self, name, labels):
+        seen = 0
+        for i, n in enumerate(self.buckets[:-1]):
+            seen += n
+            yield f"{name}_bucket", labels + (("le", repr((1 << i) / 1e9)),), seen
+        yield f"{name}_bucket", labels + (("le", "+Inf"),), seen + self.buckets[-1]
+        yield f"{name}_sum", labels, self.sum / 1e9
+        yield f"{name}_count", labels, self.count
+
+
+class MetricsRegistry:
+    """In-process metric families, rendered in the Prometheus text format."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, str] = {}
+        self._metrics: Dict[str, Dict[Labels, object]] = {}
+
+    def counter(self, name: str, help: str = "", fn: Optional[Callable[[], int]] = None,
+                **labels: str) -> Counter:
+        counter = self._get(name, help, labels, Counter)
+        counter.fn = fn or counter.fn
+        return counter
+
+    def histogram(self, name: str, help: str = "", **labels: str) -> Histogram:
+        return self._get(name, help, labels, Histogram)
+
+    def gauge(self, name: str, fn: Callable[[], float], help: str = "", **labels: str) -> Gauge:
+        gauge = self._get(name, help, labels, lambda: Gauge(fn))
+        gauge.fn = fn
+        return gauge
+
+    def get(self, name: str, **labels: str):
+        return self._metrics.get(name, {}).get(tuple(sorted(labels.items())))
+
+    def render(self) -> str:
+        with self._lock:
+            families = [(name, self._help[name], list(metrics.items())) for name, metrics in self._metrics.items()]
+        lines: List[str] = []
+        for name, help, metrics in families:
+            if help:
+                lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {type(metrics[0][1]).kind}")
+            for labels, metric in metrics:
+                for sample, sample_labels, value in metric.samples(name, labels):
+                    lines.append(f"{sample}{_format_labels(sample_labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def dump_every(self, path: str, interval: float = 10.0) -> "MetricsDumper":
+        """Start a background thread rewriting ``path`` with `render()` every ``interval`` seconds."""
+        return MetricsDumper(self, path, interval)
+
+    def _get(self, name, help, labels, factory):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            family = self._metrics.setdefault(name, {})
+            self._help.setdefault(name, help)
+            if key not in family:
+                family[key] = factory()
+            return family[key]
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in labels)
+    return "{" + body + "}"
+
+
+class MetricsDumper:
+    """Periodically writes a registry to a file (atomically, for node-exporter's textfile collector)."""
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="metrics-dumper", daemon=True)
+        self._thread.start()
+
+    def dump(self) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.registry.render())
+        os.replace(tmp, self.path)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.dump()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.dump()
+
+
+# ---------------- ParkingLot Instrumentation ---------------- #
+
+_OUTER_OPS = ("park", "unpark", "park_many", "unpark_many")
+
+
+def _wrap(fn: Callable, latency: Histogram, sample_every: int, unary: bool = False) -> Callable:
+    """Count every call; time every ``sample_every``-th one (must be a power of two).
+
+    Each thread counts in its own one-element list, found through a
+    ``threading.local``, so gate threads sharing a concurrent lot never lose
+    an increment and never contend on a lock; ``wrapper.calls()`` sums the
+    lists (those of finished threads included). Sampling follows the
+    calling thread's own count.
+    ``unary`` wrappers forward exactly one positional argument, which costs
+    about a fifth of ``*args, **kwargs`` forwarding; the outer ops use them.
+    """
+    clock = time.perf_counter_ns
+    observe = latency.observe
+    mask = sample_every - 1
+    local = threading.local()
+    cells: List[List[int]] = []  # one [count] per thread that has called
+    cells_lock = threading.Lock()
+
+    def new_cell() -> List[int]:
+        cell = local.cell = [0]
+        with cells_lock:
+            cells.append(cell)
+        return cell
+
+    if unary:
+        def wrapper(arg):
+            try:
+                cell = local.cell
+            except AttributeError:
+                cell = new_cell()
+            n = cell[0] = cell[0] + 1
+            if n & mask:
+                return fn(arg)
+            start = clock()
+            try:
+                return fn(arg)
+            finally:
+                observe(clock() - start)
+    else:
+        def wrapper(*args, **kwargs):
+            try:
+                cell = local.cell
+            except AttributeError:
+                cell = new_cell()
+            n = cell[0] = cell[0] + 1
+            if n & mask:
+                return fn(*args, **kwargs)
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(clock() - start)
+
+    def calls() -> int:
+        with cells_lock:
+            return sum(cell[0] for cell in cells)
+
+    wrapper.__wrapped__ = fn
+    wrapper.calls = calls
+    return wrapper
+
+
+def instrument(lot: ParkingLot, registry: Optional[MetricsRegistry] = None,
+               sample_every: int = 16, detail: bool = False) -> MetricsRegistry:
+    """Attach call counters and latency histograms to a lot's hot paths.
+
+    Wraps, on the given instances only, ``park`` / ``unpark`` and their batch
+    forms; each adds a per-thread count and a one-argument call
+    (`benchmarks.bench_metrics` measures what that costs a park+unpark). With
+    ``detail=True`` it also wraps the phases inside them: ticket creation,
+    ``AllocationService.assign`` / ``find_spot``, every floor's
+    ``assign_vehicle`` and the pricing strategy; each extra layer costs about
+    0.3us per call, so leave it off unless hunting a slow phase. Index sizes
+    (open tickets, free spots per floor and spot type) are gauges evaluated
+    on render. Uninstrumented lots pay nothing; `uninstrument` undoes this.
+    ``sample_every`` (a power of two) trades histogram resolution for overhead.
+    """
+    if sample_every < 1 or sample_every & (sample_every - 1):
+        raise ValueError("sample_every must be a power of two")
+    registry = registry or MetricsRegistry()
+    lot_name = lot.name
+
+    def hook(obj, attr: str, op: str, **labels: str) -> None:
+        if attr in vars(obj):
+            return  # already instrumented
+        latency = registry.histogram("parking_op_duration_seconds", "Sampled latency per operation.",
+                                     lot=lot_name, op=op, **labels)
+        wrapper = _wrap(getattr(obj, attr), latency, sample_every, unary=obj is lot and attr in _OUTER_OPS)
+        registry.counter("parking_calls_total", "Calls per operation.", fn=wrapper.calls,
+                         lot=lot_name, op=op, **labels)
+        setattr(obj, attr, wrapper)
+
+    for attr in _OUTER_OPS:
+        hook(lot, attr, attr)
+    if detail:
+        hook(lot, "_new_ticket", "new_ticket")
+        hook(lot.allocation, "assign", "allocate")
+        hook(lot.allocation, "find_spot", "find_spot")
+        hook(lot.pricing, "calculate_fee", "calculate_fee")
+        hook(lot.pricing, "calculate_fees", "calculate_fees")
+        for floor in lot.floors:
+            hook(floor, "assign_vehicle", "assign_vehicle", floor=str(floor.floor_id))
+
+    registry.gauge("parking_open_tickets", lambda: len(lot.tickets), "Tickets currently open.", lot=lot_name)
+    registry.gauge("parking_index_version", lambda: lot.allocation.version,
+                   "Allocation index changes since start.", lot=lot_name)
+    for floor in lot.floors:
+        for stype in lot.allocation.spot_types:
+            registry.gauge("parking_free_spots", lambda f=floor, st=stype: f.available_count(st),
+                           "Free spots in the floor's index.", lot=lot_name, floor=str(floor.floor_id),
+                           spot_type=stype.name)
+    return registry
+
+
+def uninstrument(lot: ParkingLot) -> None:
+    """Remove the wrappers installed by `instrument` (registry contents are kept)."""
+    targets = [(lot, _OUTER_OPS + ("_new_ticket",)),
+               (lot.allocation, ("assign", "find_spot")),
+               (lot.pricing, ("calculate_fee", "calculate_fees"))]
+    targets += [(floor, ("assign_vehicle",)) for floor in lot.floors]
+    for obj, attrs in targets:
+        for attr in attrs:
+            vars(obj).pop(attr, None)
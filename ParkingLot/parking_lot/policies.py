@@ -0,0 +1,110 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, FrozenSet, Mapping, Optional, Sequence, Tuple
+from .enums import SpotType, VehicleType
+
+if TYPE_CHECKING:
+    from .allocation import AllocationService
+
+# (floor position in service.floors, spot types to take from, best first)
+Choice = Tuple[int, Tuple[SpotType, ...]]
+
+
+class AllocationPolicy(ABC):
+    """Strategy deciding which floor, and which spot types, a vehicle goes to.
+
+    Policies only read the service's indexes; AllocationService does the
+    locking, the actual assignment and the retry when a choice went stale.
+    ``exclude`` holds floor positions that are busy and should be skipped.
+    """
+
+    @abstractmethod
+    def choose(self, service: "AllocationService", vtype: VehicleType,
+               stypes: Sequence[SpotType], exclude: FrozenSet[int] = frozenset()) -> Optional[Choice]:
+        pass
+
+
+class FirstFitPolicy(AllocationPolicy):
+    """Lowest floor with any compatible free spot; best-fit type within the floor."""
+
+    def choose(self, service, vtype, stypes, exclude=frozenset()):
+        pos = service.first_floor(vtype, stypes)
+        while pos in exclude:
+            pos = service.first_floor(vtype, stypes, pos + 1)
+        return (pos, tuple(stypes)) if pos >= 0 else None
+
+
+class BestFitPolicy(AllocationPolicy):
+    """Smallest compatible spot type anywhere in the lot, lowest floor first.
+
+    Keeps bikes out of LARGE spots while a MOTORBIKE spot is free on any floor.
+    """
+
+    def choose(self, service, vtype, stypes, exclude=frozenset()):
+        for stype in stypes:
+            pos = service.first_floor(vtype, (stype,))
+            while pos in exclude:
+                pos = service.first_floor(vtype, (stype,), pos + 1)
+            if pos >= 0:
+                return pos, (stype,)
+        return None
+
+
+class NearestExitPolicy(AllocationPolicy):
+    """Floor closest to the exit that has room.
+
+    ``exit_distance`` maps floor_id to a distance; by default lower floor IDs
+    are closer. Scans floors in distance order, O(floors) in the worst case.
+    """
+    def __init__(self, exit_distance: Optional[Mapping[int, float]] = None):
+        self.exit_distance = exit_distance
+        self._order: Tuple[int, ...] = ()
+        self._service = None
+
+    def choose(self, service, vtype, stypes, exclude=frozenset()):
+        if self._service is not service:
+            dist = self.exit_distance or {}
+            self._order = tuple(sorted(
+                range(len(service.floors)),
+                key=lambda p: (dist.get(service.floors[p].floor_id, service.floors[p].floor_id), p),
+            ))
+            self._service = service
+        for pos in self._order:
+            if pos not in exclude and service.free_on(pos, stypes) > 0:
+                return pos, tuple(stypes)
+        return None
+
+
+class FloorBalancingPolicy(AllocationPolicy):
+    """Floor with the most compatible free spots, spreading load (and traffic) evenly."""
+
+    def choose(self, service, vtype, stypes, exclude=frozenset()):
+        if not exclude and tuple(stypes) == service.compatibility.preferred(vtype):
+            pos = service.roomiest_floor(vtype)
+        else:
+            counts = [(service.free_on(p, stypes), -p) for p in range(len(service.floors)) if p not in exclude]
+            best = max(counts, default=(0, 0))
+            pos = -best[1] if best[0] > 0 else -1
+        return (pos, tuple(stypes)) if pos >= 0 else None
+
+
+class ReservedHeadroomPolicy(AllocationPolicy):
+    """Keeps ``reserve[stype]`` spots of a type free for vehicles whose first choice it is.
+
+    A car may still take a LARGE spot, but not once only the reserved number of
+    LARGE spots is left for trucks. Placement among the allowed types is
+    delegated to ``inner`` (first-fit by default). Under concurrent traffic the
+    reserve is best-effort and may dip by the number of in-flight gates.
+    """
+    def __init__(self, reserve: Mapping[SpotType, int], inner: Optional[AllocationPolicy] = None):
+        self.reserve = dict(reserve)
+        self.inner = inner or FirstFitPolicy()
+
+    def choose(self, service, vtype, stypes, exclude=frozenset()):
+        first = service.compatibility.preferred(vtype)[:1]
+        allowed = tuple(
+            st for st in stypes
+            if st in first or service.free_spots(st) > self.reserve.get(st, 0)
+        )
+        if not allowed:
+            return None
+        return self.inner.choose(service, vtype, allowed, exclude)
@@ -1,12 +1,34 @@
 from datetime import datetime
 from abc import ABC, abstractmethod
+from typing import List, Sequence
 import math
 
+try:
+    import numpy as np
+except ImportError:  # vectorized batch pricing is optional
+    np = None
+
 class PricingStrategy(ABC):
     @abstractmethod
     def calculate_fee(self, entry: datetime, exit: datetime) -> float:
         pass
 
+    def calculate_fees(self, entries: Sequence[datetime], exits: Sequence[datetime]) -> List[float]:
+        """Fees for many stays at once (strategies may override with a faster path)."""
+        return [self.calculate_fee(entry, exit) for entry, exit in zip(entries, exits)]
+
+
+def _billable_hours(entries, exits):
+    """Vectorized `max(1, ceil(seconds / 3600))` over datetime / datetime64 arrays.
+
+    Works on integer microseconds and divides in the same order as
+    `timedelta.total_seconds() / 3600`, so results match the scalar path bit for bit.
+    """
+    start = np.asarray(entries, dtype="datetime64[us]")
+    end = np.asarray(exits, dtype="datetime64[us]")
+    seconds = (end - start).astype(np.int64) / 1e6
+    return np.maximum(1, np.ceil(seconds / 3600))
+
 
 class FlatRatePricing(PricingStrategy):
     """Same price per hour, rounded up."""
@@ -17,6 +39,12 @@ class FlatRatePricing(PricingStrategy):
         hours = max(1, math.ceil((exit - entry).total_seconds() / 3600))
         return hours * self.rate
 
+    def calculate_fees(self, entries, exits):
+        """Batch path: returns a NumPy array when NumPy is installed."""
+        if np is None:
+            return super().calculate_fees(entries, exits)
+        return _billable_hours(entries, exits) * self.rate
+
 
 class HourlySlabPricing(PricingStrategy):
     """First hour high, then reduced rate."""
@@ -29,3 +57,10 @@ class HourlySlabPricing(PricingStrategy):
         if hours <= 1:
             return self.first
         return self.first + (hours - 1) * self.later
+
+    def calculate_fees(self, entries, exits):
+        """Batch path: returns a NumPy array when NumPy is installed."""
+        if np is None:
+            return super().calculate_fees(entries, exits)
+        hours = _billable_hours(entries, exits)
+        return np.where(hours <= 1, self.first, self.first + (hours - 1) * self.later)
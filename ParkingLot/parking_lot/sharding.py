@@ -0,0 +1,226 @@
+import multiprocessing as mp
+import os
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from .lot import ParkingLot
+from .models import BatchResult, Ticket, Vehicle
+
+# Layout of one lot's block in a shard's shared memory (int64 slots):
+#   [seq, free(floor0, vt0), free(floor0, vt1), ..., free(floorN, vtM)]
+# `seq` is a seqlock: odd while the worker is writing, bumped to even after.
+LotLayout = Tuple[str, List[int], List[str]]  # (lot_id, floor_ids, vehicle type names)
+_SPINS_PER_CHECK = 1 << 12  # seqlock retries between checks that the writer is still alive
+
+
+def _detach(ticket: Ticket) -> Ticket:
+    """Copy without floor/spot handles, so only the ticket crosses the pipe."""
+    return Ticket(ticket.ticket_id, ticket.vehicle, ticket.spot_id, ticket.entry_time, ticket.exit_time)
+
+
+def _worker_main(conn, factories: Mapping[str, Callable[[], ParkingLot]]) -> None:
+    """Worker process: owns some lots, serves requests, publishes availability."""
+    lots = {lot_id: factory() for lot_id, factory in factories.items()}
+    layout = [
+        (lot_id, [f.floor_id for f in lot.allocation.floors], [vt.name for vt in lot.allocation.vehicle_types])
+        for lot_id, lot in lots.items()
+    ]
+    conn.send(layout)
+    # the front end owns (and unlinks) the block; workers share its resource tracker
+    shm = shared_memory.SharedMemory(name=conn.recv())
+    view = shm.buf.cast("q")
+    offsets, pos = {}, 0
+    for lot_id, floor_ids, vtypes in layout:
+        offsets[lot_id] = pos
+        pos += 1 + len(floor_ids) * len(vtypes)
+
+    def publish(lot_id: str) -> None:
+        lot, base = lots[lot_id], offsets[lot_id]
+        vtypes = lot.allocation.vehicle_types
+        view[base] += 1
+        i = base + 1
+        for floor in lot.allocation.floors:
+            for vt in vtypes:
+                view[i] = floor.free_count_for(vt)
+                i += 1
+        view[base] += 1
+
+    for lot_id in lots:
+        publish(lot_id)
+    try:
+        while True:
+            msg = conn.recv()
+            if msg is None:
+                break
+            op, lot_id, arg = msg
+            try:
+                lot = lots[lot_id]
+                if op == "park":
+                    result: Any = _detach(lot.park(arg))
+                elif op == "unpark":
+                    result = lot.unpark(arg)
+                elif op == "park_many":
+                    result = [BatchResult(r.item, r.value and _detach(r.value), r.error) for r in lot.park_many(arg)]
+                elif op == "unpark_many":
+                    result = lot.unpark_many(arg)
+                else:
+                    raise ValueError(f"Unknown op {op!r}")
+            except Exception as e:
+                reply = (False, e)
+            else:
+                reply = (True, result)
+            if lot_id in lots:
+                publish(lot_id)  # before replying, so callers read their own writes
+            conn.send(reply)
+    finally:
+        view.release()
+        shm.close()
+
+
+class _Shard:
+    """Front-end handle on one worker process: pipe, lock and shared snapshot block."""
+    def __init__(self, ctx, factories: Dict[str, Callable[[], ParkingLot]]):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, factories), daemon=True)
+        self.process.start()
+        child.close()
+        self.lock = threading.Lock()
+        self.layout: List[LotLayout] = self.conn.recv()
+        self.offsets: Dict[str, int] = {}
+        size = 0
+        for lot_id, floor_ids, vtypes in self.layout:
+            self.offsets[lot_id] = size
+            size += 1 + len(floor_ids) * len(vtypes)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(8, size * 8))
+        self.view = self.shm.buf.cast("q")
+        self.conn.send(self.shm.name)
+
+    def call(self, op: str, lot_id: str, arg: Any) -> Any:
+        with self.lock:
+            self.conn.send((op, lot_id, arg))
+            ok, result = self.conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    def read(self, lot_id: str) -> List[int]:
+        """Consistent copy of one lot's counters (seqlock read, no IPC).
+
+        Raises RuntimeError instead of spinning forever if the worker died
+        in the middle of a write.
+        """
+        base = self.offsets[lot_id]
+        _, floor_ids, vtypes = next(entry for entry in self.layout if entry[0] == lot_id)
+        end = base + 1 + len(floor_ids) * len(vtypes)
+        spins = 0
+        while True:
+            seq = self.view[base]
+            if not seq & 1:
+                values = self.view[base + 1:end].tolist()
+                if self.view[base] == seq:
+                    return values
+            spins += 1
+            if not spins % _SPINS_PER_CHECK:
+                # a worker that died mid-write leaves `seq` odd for good
+                if not self.process.is_alive():
+                    raise RuntimeError(f"Shard worker (pid {self.process.pid}) died while publishing lot {lot_id!r}")
+                time.sleep(0)  # let a descheduled writer finish
+
+    def close(self) -> None:
+        with self.lock:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.process.join(timeout=5)
+        self.view.release()
+        self.shm.close()
+        self.shm.unlink()
+
+
+class ShardedLot:
+    """Proxy with the same park / unpark surface as ParkingLot, backed by a shard.
+
+    Returned tickets carry no floor/spot handles (those live in the worker).
+    """
+    def __init__(self, runtime: "ShardedRuntime", lot_id: str):
+        self.runtime = runtime
+        self.name = lot_id
+
+    def park(self, vehicle: Vehicle) -> Ticket:
+        return self.runtime.park(self.name, vehicle)
+
+    def unpark(self, ticket_id: str) -> float:
+        return self.runtime.unpark(self.name, ticket_id)
+
+    def park_many(self, vehicles: List[Vehicle]) -> List[BatchResult]:
+        return self.runtime.park_many(self.name, vehicles)
+
+    def unpark_many(self, ticket_ids: List[str]) -> List[BatchResult]:
+        return self.runtime.unpark_many(self.name, ticket_ids)
+
+    def availability(self) -> Dict[int, Dict[str, int]]:
+        return self.runtime.availability(self.name)
+
+
+class ShardedRuntime:
+    """Runs many ParkingLots in worker processes to get past the GIL.
+
+    ``lots`` maps a lot ID to a picklable zero-argument factory (a top-level
+    function or functools.partial) that builds the lot inside its worker. Lots
+    are spread round-robin over ``workers`` processes and requests are routed
+    by lot ID. To spread one very large site, register groups of its floors as
+    separate lot IDs. Each worker publishes free counts per floor and vehicle
+    type into shared memory after every request, so `availability` never
+    round-trips to a worker.
+    """
+    def __init__(self, lots: Mapping[str, Callable[[], ParkingLot]], workers: Optional[int] = None,
+                 start_method: Optional[str] = None):
+        ctx = mp.get_context(start_method)
+        resource_tracker.ensure_running()  # forked workers must share it to attach the snapshot blocks
+        n = max(1, min(workers or os.cpu_count() or 1, len(lots)))
+        groups: List[Dict[str, Callable[[], ParkingLot]]] = [{} for _ in range(n)]
+        for i, lot_id in enumerate(sorted(lots)):
+            groups[i % n][lot_id] = lots[lot_id]
+        self._shards = [_Shard(ctx, group) for group in groups]
+        self._route: Dict[str, _Shard] = {lot_id: shard for shard in self._shards for lot_id in shard.offsets}
+        self._layout: Dict[str, LotLayout] = {entry[0]: entry for shard in self._shards for entry in shard.layout}
+
+    def lot(self, lot_id: str) -> ShardedLot:
+        self._shard(lot_id)
+        return ShardedLot(self, lot_id)
+
+    def park(self, lot_id: str, vehicle: Vehicle) -> Ticket:
+        return self._shard(lot_id).call("park", lot_id, vehicle)
+
+    def unpark(self, lot_id: str, ticket_id: str) -> float:
+        return self._shard(lot_id).call("unpark", lot_id, ticket_id)
+
+    def park_many(self, lot_id: str, vehicles: List[Vehicle]) -> List[BatchResult]:
+        return self._shard(lot_id).call("park_many", lot_id, vehicles)
+
+    def unpark_many(self, lot_id: str, ticket_ids: List[str]) -> List[BatchResult]:
+        return self._shard(lot_id).call("unpark_many", lot_id, ticket_ids)
+
+    def availability(self, lot_id: str) -> Dict[int, Dict[str, int]]:
+        """{floor_id: {vehicle type name: free spots}} from shared memory."""
+        values = iter(self._shard(lot_id).read(lot_id))
+        _, floor_ids, vtypes = self._layout[lot_id]
+        return {fid: {vt: next(values) for vt in vtypes} for fid in floor_ids}
+
+    def close(self) -> None:
+        for shard in self._shards:
+            shard.close()
+
+    def __enter__(self) -> "ShardedRuntime":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _shard(self, lot_id: str) -> _Shard:
+        shard = self._route.get(lot_id)
+        if shard is None:
+            raise ValueError(f"Unknown lot {lot_id!r}")
+        return shard
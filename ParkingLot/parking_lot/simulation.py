@@ -0,0 +1,130 @@
+import csv
+import heapq
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, Iterable, List, Mapping, Optional
+from .lot import ParkingLot
+from .models import Vehicle
+from .enums import VehicleType
+from .errors import NoCompatibleSpotError
+from .policies import AllocationPolicy
+from .pricing import FlatRatePricing
+
+
+@dataclass(frozen=True, slots=True)
+class TraceEvent:
+    """One visit: a vehicle arrives at ``time`` and stays ``duration`` (both in seconds)."""
+    time: float
+    license_no: str
+    vtype: Hashable
+    duration: float
+
+
+@dataclass
+class SimulationReport:
+    """Outcome of replaying one trace against one lot / policy."""
+    name: str
+    arrivals: int
+    rejected: int
+    utilization: float            # time-weighted share of occupied spots
+    park_p50_us: float
+    park_p99_us: float
+    rejected_by_type: Dict[Hashable, int] = field(default_factory=dict)
+
+    @property
+    def rejection_rate(self) -> float:
+        return self.rejected / self.arrivals if self.arrivals else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.name:>16} | reject {self.rejection_rate:6.2%} | util {self.utilization:6.2%} | "
+                f"park p50 {self.park_p50_us:6.1f}us p99 {self.park_p99_us:6.1f}us")
+
+
+def synthetic_trace(n: int, arrivals_per_hour: float, mean_stay_hours: float,
+                    mix: Optional[Mapping[Hashable, float]] = None, seed: int = 0) -> List[TraceEvent]:
+    """Poisson arrivals with exponential stays; ``mix`` weights vehicle types."""
+    rng = random.Random(seed)
+    mix = mix or {VehicleType.BIKE: 0.3, VehicleType.CAR: 0.6, VehicleType.TRUCK: 0.1}
+    types, weights = list(mix), list(mix.values())
+    now, trace = 0.0, []
+    for i in range(n):
+        now += rng.expovariate(arrivals_per_hour / 3600)
+        vtype = rng.choices(types, weights)[0]
+        trace.append(TraceEvent(now, f"SIM-{i}", vtype, rng.expovariate(1 / (mean_stay_hours * 3600))))
+    return trace
+
+
+def load_trace(path: str) -> List[TraceEvent]:
+    """Read a recorded trace: CSV with columns time,license_no,vtype,duration."""
+    with open(path, newline="") as f:
+        return [
+            TraceEvent(float(row["time"]), row["license_no"], VehicleType[row["vtype"]], float(row["duration"]))
+            for row in csv.DictReader(f)
+        ]
+
+
+def simulate(name: str, lot_factory: Callable[[], ParkingLot], trace: Iterable[TraceEvent]) -> SimulationReport:
+    """Replay a trace in simulated time against a fresh lot.
+
+    Departures are processed before any arrival at the same or a later time.
+    Latency is the wall-clock cost of each `ParkingLot.park` call, including
+    rejections; utilization integrates occupied spots over simulated time.
+    """
+    lot = lot_factory()
+    capacity = sum(len(f.spots) for f in lot.floors)
+    departures: List = []  # (time, seq, ticket_id)
+    latencies: List[int] = []
+    rejected: Dict[Hashable, int] = {}
+    occupied = arrivals = 0
+    area = last_t = start_t = 0.0
+
+    def advance(t: float) -> None:
+        nonlocal area, last_t
+        area += occupied * (t - last_t)
+        last_t = t
+
+    for seq, ev in enumerate(sorted(trace, key=lambda e: e.time)):
+        if arrivals == 0:
+            start_t = last_t = ev.time
+        while departures and departures[0][0] <= ev.time:
+            t, _, ticket_id = heapq.heappop(departures)
+            advance(t)
+            lot.unpark(ticket_id)
+            occupied -= 1
+        advance(ev.time)
+        arrivals += 1
+        vehicle = Vehicle(ev.license_no, ev.vtype)
+        t0 = time.perf_counter_ns()
+        try:
+            ticket = lot.park(vehicle)
+        except NoCompatibleSpotError:
+            latencies.append(time.perf_counter_ns() - t0)
+            rejected[ev.vtype] = rejected.get(ev.vtype, 0) + 1
+            continue
+        latencies.append(time.perf_counter_ns() - t0)
+        occupied += 1
+        heapq.heappush(departures, (ev.time + ev.duration, seq, ticket.ticket_id))
+
+    span = last_t - start_t
+    q = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    return SimulationReport(
+        name=name,
+        arrivals=arrivals,
+        rejected=sum(rejected.values()),
+        utilization=area / (span * capacity) if span and capacity else 0.0,
+        park_p50_us=q[49] / 1000,
+        park_p99_us=q[98] / 1000,
+        rejected_by_type=rejected,
+    )
+
+
+def compare_policies(policies: Mapping[str, AllocationPolicy], floors_factory: Callable[[], list],
+                     trace: List[TraceEvent], **lot_kwargs) -> List[SimulationReport]:
+    """Run the same trace against a fresh lot (from ``floors_factory``) per policy."""
+    reports = []
+    for name, policy in policies.items():
+        factory = lambda: ParkingLot(name, floors_factory(), FlatRatePricing(10), policy=policy, **lot_kwargs)
+        reports.append(simulate(name, factory, trace))
+    return reports
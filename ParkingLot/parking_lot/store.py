@@ -0,0 +1,209 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List
+from .models import Ticket
+
+_UNIX_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+@dataclass(frozen=True, slots=True)
+class TicketRecord:
+    """Durable form of an open ticket: enough to re-occupy its spot on restart."""
+    ticket_id: str
+    license_no: str
+    vtype: str
+    floor_id: int
+    spot_id: str
+    entry_us: int
+
+    @classmethod
+    def from_ticket(cls, ticket: Ticket) -> "TicketRecord":
+        return cls(
+            ticket.ticket_id,
+            ticket.vehicle.license_no,
+            ticket.vehicle.vtype.name,
+            ticket.floor.floor_id,
+            ticket.spot_id,
+            (ticket.entry_time - _UNIX_EPOCH) // _MICROSECOND,
+        )
+
+    @property
+    def entry_time(self) -> datetime:
+        return _UNIX_EPOCH + timedelta(microseconds=self.entry_us)
+
+    def encode(self) -> str:
+        return f"P\t{self.ticket_id}\t{self.license_no}\t{self.vtype}\t{self.floor_id}\t{self.spot_id}\t{self.entry_us}\n"
+
+
+class TicketStore(ABC):
+    """Persistence strategy for open tickets (and therefore spot occupancy)."""
+
+    @abstractmethod
+    def record_park(self, ticket: Ticket) -> None:
+        pass
+
+    @abstractmethod
+    def record_unpark(self, ticket_id: str) -> None:
+        pass
+
+    @abstractmethod
+    def open_tickets(self) -> List[TicketRecord]:
+        """Tickets that were open when the store was last written."""
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class WalTicketStore(TicketStore):
+    """Append-only write-ahead log plus periodic snapshots, in one directory.
+
+    Appends only buffer a line; a background thread writes and fsyncs whatever
+    has accumulated within ``commit_interval`` seconds of the first buffered
+    line (group commit), so park latency does not pay for an fsync. An idle
+    store's thread sleeps until the next append. With ``synchronous=True`` each append
+    waits for the group fsync that covers it instead. Every ``snapshot_every``
+    events the open tickets are written to a snapshot and the log is truncated.
+    Replay is idempotent, so a crash between those two steps is harmless.
+    """
+    SNAPSHOT = "tickets.snapshot"
+    LOG = "tickets.wal"
+
+    def __init__(self, directory: str, snapshot_every: int = 100_000,
+                 commit_interval: float = 0.005, synchronous: bool = False):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.commit_interval = commit_interval
+        self.synchronous = synchronous
+        os.makedirs(directory, exist_ok=True)
+        self._snapshot_path = os.path.join(directory, self.SNAPSHOT)
+        self._log_path = os.path.join(directory, self.LOG)
+
+        self._open: Dict[str, TicketRecord] = {}
+        self._replay(self._snapshot_path)
+        self._replay(self._log_path)
+
+        self._cond = threading.Condition()
+        self._buffer: List[str] = []
+        self._appended = 0  # sequence number of the last buffered event
+        self._durable = 0   # sequence number of the last fsynced event
+        self._since_snapshot = 0
+        self._closed = False
+        self._log = open(self._log_path, "a", encoding="utf-8")
+        self._flusher = threading.Thread(target=self._flush_loop, name="wal-flusher", daemon=True)
+        self._flusher.start()
+
+    # ---------------- TicketStore API ---------------- #
+
+    def record_park(self, ticket: Ticket) -> None:
+        record = TicketRecord.from_ticket(ticket)
+        self._append(record.encode(), record.ticket_id, record)
+
+    def record_unpark(self, ticket_id: str) -> None:
+        self._append(f"U\t{ticket_id}\n", ticket_id, None)
+
+    def open_tickets(self) -> List[TicketRecord]:
+        with self._cond:
+            return list(self._open.values())
+
+    def sync(self) -> None:
+        """Block until every event appended so far is on disk."""
+        with self._cond:
+            target = self._appended
+            self._cond.notify_all()
+            while self._durable < target:
+                self._cond.wait()
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._flusher.join()
+        self._log.close()
+
+    # ---------------- Helpers ---------------- #
+
+    def _append(self, line: str, ticket_id: str, record) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Ticket store is closed")
+            if record is None:
+                self._open.pop(ticket_id, None)
+            else:
+                self._open[ticket_id] = record
+            self._buffer.append(line)
+            self._appended += 1
+            seq = self._appended
+            if self.synchronous or len(self._buffer) == 1:
+                self._cond.notify_all()  # wake an idle flusher (or cut its wait short)
+            if self.synchronous:
+                while self._durable < seq:
+                    self._cond.wait()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                if not self._buffer and not self._closed:
+                    while not self._buffer and not self._closed:
+                        self._cond.wait()  # idle: the first append wakes us
+                    if not self._closed and not self.synchronous:
+                        self._cond.wait(self.commit_interval)  # let the group fill up
+                lines, self._buffer = self._buffer, []
+                target = self._appended
+                self._since_snapshot += len(lines)
+                snapshot = None
+                if self._since_snapshot >= self.snapshot_every:
+                    snapshot = list(self._open.values())  # consistent cut at `target`
+                    self._since_snapshot = 0
+                closed = self._closed
+            if lines:
+                self._log.write("".join(lines))
+                self._log.flush()
+                os.fsync(self._log.fileno())
+            if snapshot is not None:
+                self._write_snapshot(snapshot)
+            with self._cond:
+                self._durable = target
+                self._cond.notify_all()
+            if closed:
+                return
+
+    def _write_snapshot(self, records: List[TicketRecord]) -> None:
+        tmp = self._snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("".join(r.encode() for r in records))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._snapshot_path)
+        # everything in the log is now covered by the snapshot
+        self._log.truncate(0)
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+    def _replay(self, path: str) -> None:
+        if not os.path.exists(path):
+            return
+        # keep raw fields while replaying; only survivors become TicketRecords
+        raw: Dict[str, List[str]] = {}
+        valid = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write at the tail of the log
+                valid += len(line)
+                parts = line[:-1].decode("utf-8").split("\t")
+                if parts[0] == "P":
+                    raw[parts[1]] = parts
+                elif parts[0] == "U":
+                    if raw.pop(parts[1], None) is None:
+                        self._open.pop(parts[1], None)
+        if valid < os.path.getsize(path):
+            os.truncate(path, valid)  # drop the torn tail before appending after it
+        for tid, (_, _, license_no, vtype, floor_id, spot_id, entry_us) in raw.items():
+            self._open[tid] = TicketRecord(tid, license_no, vtype, int(floor_id), spot_id, int(entry_us))
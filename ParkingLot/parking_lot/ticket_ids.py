@@ -0,0 +1,89 @@
+import itertools
+import os
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from .models import Vehicle
+
+_UNIX_EPOCH = datetime(1970, 1, 1)
+
+
+class TicketIdGenerator(ABC):
+    """Strategy for minting ticket IDs; `now` is the caller's single clock read."""
+
+    @abstractmethod
+    def next_id(self, vehicle: Vehicle, now: datetime) -> str:
+        pass
+
+    def resume_after(self, ticket_ids: Iterable[str]) -> None:
+        """Called with the open tickets restored from a store, so new IDs cannot repeat them."""
+
+
+class SequentialIdGenerator(TicketIdGenerator):
+    """Monotonic counter: unique within one process, e.g. for tests and demos.
+
+    After a restart from a `TicketStore` it continues past the highest
+    restored open ticket. IDs of tickets closed before the restart are not
+    known then and may be issued again; use `SnowflakeIdGenerator` where an
+    ID must never repeat.
+    """
+    def __init__(self, prefix: str = "T", start: int = 1):
+        self.prefix = prefix
+        self._counter = itertools.count(start)  # next() is atomic in CPython
+
+    def next_id(self, vehicle: Vehicle, now: datetime) -> str:
+        return f"{self.prefix}{next(self._counter)}"
+
+    def resume_after(self, ticket_ids: Iterable[str]) -> None:
+        n = len(self.prefix)
+        issued = [int(t[n:]) for t in ticket_ids if t.startswith(self.prefix) and t[n:].isdigit()]
+        if issued:
+            self._counter = itertools.count(max(max(issued) + 1, next(self._counter)))
+
+
+class SnowflakeIdGenerator(TicketIdGenerator):
+    """Snowflake-style 64-bit IDs: 41 bits of milliseconds, 10 bits of node, 12 bits of sequence.
+
+    Unique across threads (one short lock) and across processes and hosts as
+    long as each issuer uses a distinct ``node_id`` (0..1023). Nothing local
+    (pid, hostname) can guarantee that, so the node id is configuration: pass
+    it, or set the ``PARKING_NODE_ID`` environment variable; without either
+    the constructor raises ValueError. Up to 4096 IDs per millisecond per
+    node; beyond that, or if the clock steps back, IDs borrow from the next
+    millisecond instead of sleeping.
+    """
+    EPOCH_MS = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+    NODE_BITS = 10
+    SEQ_BITS = 12
+    NODE_ENV = "PARKING_NODE_ID"
+
+    def __init__(self, node_id: Optional[int] = None):
+        if node_id is None:
+            configured = os.environ.get(self.NODE_ENV)
+            if configured is None:
+                raise ValueError(f"node_id is required: pass it or set {self.NODE_ENV}")
+            try:
+                node_id = int(configured)
+            except ValueError:
+                raise ValueError(f"{self.NODE_ENV}={configured!r} is not an integer") from None
+        if not 0 <= node_id < (1 << self.NODE_BITS):
+            raise ValueError(f"node_id must be in [0, {1 << self.NODE_BITS})")
+        self.node_id = node_id
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._seq = 0
+
+    def next_id(self, vehicle: Vehicle, now: datetime) -> str:
+        ms = (now - _UNIX_EPOCH) // timedelta(milliseconds=1) - self.EPOCH_MS
+        with self._lock:
+            if ms > self._last_ms:
+                self._seq = 0
+            else:
+                ms = self._last_ms
+                self._seq = (self._seq + 1) & ((1 << self.SEQ_BITS) - 1)
+                if self._seq == 0:
+                    ms += 1
+            self._last_ms = ms
+            seq = self._seq
+        return f"{(ms << (self.NODE_BITS + self.SEQ_BITS)) | (self.node_id << self.SEQ_BITS) | seq:016x}"
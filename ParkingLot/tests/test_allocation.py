@@ -0,0 +1,33 @@
+from parking_lot.allocation import AllocationService
+from parking_lot.floor import ParkingFloor
+from parking_lot.models import ParkingSpot, Vehicle
+from parking_lot.enums import VehicleType, SpotType
+
+
+def build_service(n_floors=5):
+    floors = [
+        ParkingFloor(i, [ParkingSpot(f"F{i}S1", SpotType.COMPACT, i), ParkingSpot(f"F{i}S2", SpotType.LARGE, i)])
+        for i in range(n_floors, 0, -1)
+    ]
+    return AllocationService(floors)
+
+
+def test_skips_full_floors_and_returns_owner():
+    svc = build_service()
+    for i in range(2):
+        svc.assign(Vehicle(f"T{i}", VehicleType.TRUCK))
+    floor, spot = svc.find_spot(VehicleType.TRUCK)
+    assert floor.floor_id == 3
+    assert spot.spot_id == "F3S2"
+    # cars can still use compact spots on floor 1
+    assert svc.find_spot(VehicleType.CAR)[0].floor_id == 1
+
+
+def test_release_makes_floor_visible_again():
+    svc = build_service(2)
+    for i in range(2):
+        svc.assign(Vehicle(f"T{i}", VehicleType.TRUCK))
+    assert svc.find_spot(VehicleType.TRUCK) is None
+    svc.release(svc.floors[1], "F2S2")
+    floor, spot = svc.find_spot(VehicleType.TRUCK)
+    assert (floor.floor_id, spot.spot_id) == (2, "F2S2")
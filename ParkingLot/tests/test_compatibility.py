@@ -0,0 +1,44 @@
+from enum import Enum, auto
+from parking_lot.compatibility import CompatibilityTable, DEFAULT_COMPATIBILITY
+from parking_lot.floor import ParkingFloor
+from parking_lot.lot import ParkingLot
+from parking_lot.models import ParkingSpot, Vehicle
+from parking_lot.enums import VehicleType, SpotType
+from parking_lot.pricing import FlatRatePricing
+
+
+class Fleet(Enum):
+    VAN = auto()
+    EV_CAR = auto()
+
+
+class Bay(Enum):
+    EV_CHARGING = auto()
+
+
+TABLE = CompatibilityTable({
+    VehicleType.CAR: [SpotType.COMPACT, SpotType.LARGE],
+    Fleet.EV_CAR: [Bay.EV_CHARGING, SpotType.COMPACT, SpotType.LARGE],
+    Fleet.VAN: [SpotType.LARGE],
+})
+
+
+def test_default_table_matches_readme_rules():
+    assert DEFAULT_COMPATIBILITY.fits(VehicleType.BIKE, SpotType.MOTORBIKE)
+    assert DEFAULT_COMPATIBILITY.fits(VehicleType.CAR, SpotType.LARGE)
+    assert not DEFAULT_COMPATIBILITY.fits(VehicleType.CAR, SpotType.MOTORBIKE)
+    assert not DEFAULT_COMPATIBILITY.fits(VehicleType.TRUCK, SpotType.COMPACT)
+    assert DEFAULT_COMPATIBILITY.users(SpotType.COMPACT) == (VehicleType.BIKE, VehicleType.CAR)
+
+
+def test_configured_types_allocate_best_fit_first():
+    spots = [
+        ParkingSpot("S1", SpotType.LARGE, 1),
+        ParkingSpot("S2", Bay.EV_CHARGING, 1),
+        ParkingSpot("S3", SpotType.COMPACT, 1),
+    ]
+    lot = ParkingLot("EV", [ParkingFloor(1, spots, compatibility=TABLE)], FlatRatePricing(10))
+    assert lot.park(Vehicle("EV-1", Fleet.EV_CAR)).spot_id == "S2"
+    assert lot.park(Vehicle("C-1", VehicleType.CAR)).spot_id == "S3"
+    assert lot.park(Vehicle("V-1", Fleet.VAN)).spot_id == "S1"
+    assert lot.occupancy().free_for(Fleet.EV_CAR) == 0
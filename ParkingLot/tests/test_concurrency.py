@@ -0,0 +1,73 @@
+import sys
+import threading
+from parking_lot.lot import ParkingLot
+from parking_lot.floor import ParkingFloor
+from parking_lot.models import ParkingSpot, Vehicle
+from parking_lot.enums import VehicleType, SpotType
+from parking_lot.errors import NoCompatibleSpotError
+from parking_lot.pricing import FlatRatePricing
+
+THREADS = 16
+
+
+def build_lot(n_floors=4, per_floor=25):
+    floors = [
+        ParkingFloor(f, [ParkingSpot(f"F{f}S{i:03d}", SpotType.COMPACT, f) for i in range(per_floor)])
+        for f in range(1, n_floors + 1)
+    ]
+    return ParkingLot("StressLot", floors, FlatRatePricing(10), concurrent=True)
+
+
+def run_threads(target):
+    old = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # force frequent thread switches
+    try:
+        threads = [threading.Thread(target=target, args=(t,)) for t in range(THREADS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(old)
+
+
+def test_burst_never_double_assigns():
+    lot = build_lot()
+    taken, rejected = [], []
+
+    def gate(tid):
+        for i in range(20):
+            try:
+                t = lot.park(Vehicle(f"G{tid}-{i}", VehicleType.CAR))
+                taken.append(t.spot_id)
+            except NoCompatibleSpotError:
+                rejected.append(tid)
+
+    run_threads(gate)
+    assert len(taken) == 100
+    assert len(set(taken)) == len(taken)
+    assert len(rejected) == THREADS * 20 - 100
+    assert all(f.free_count_for(VehicleType.CAR) == 0 for f in lot.floors)
+
+
+def test_park_unpark_churn_keeps_spots_exclusive():
+    lot = build_lot()
+    in_use, errors = set(), []
+    guard = threading.Lock()
+
+    def gate(tid):
+        for i in range(200):
+            t = lot.park(Vehicle(f"G{tid}-{i}", VehicleType.CAR))
+            with guard:
+                if t.spot_id in in_use:
+                    errors.append(t.spot_id)
+                in_use.add(t.spot_id)
+            with guard:
+                in_use.discard(t.spot_id)
+            lot.unpark(t.ticket_id)
+
+    run_threads(gate)
+    assert errors == []
+    assert lot.tickets == {}
+    assert sum(f.free_count_for(VehicleType.CAR) for f in lot.floors) == 100
+    assert lot.allocation.find_spot(VehicleType.CAR)[1].spot_id == "F1S000"
@@ -0,0 +1,32 @@
+from parking_lot.floor import ParkingFloor
+from parking_lot.models import ParkingSpot, Vehicle
+from parking_lot.enums import VehicleType, SpotType
+
+
+def build_floor():
+    spots = [ParkingSpot(f"F1S{i}", SpotType.COMPACT, 1) for i in (3, 1, 2)]
+    return ParkingFloor(1, spots)
+
+
+def test_lowest_id_handed_out_first():
+    floor = build_floor()
+    ids = [floor.assign_vehicle(Vehicle(f"C{i}", VehicleType.CAR)).spot_id for i in range(3)]
+    assert ids == ["F1S1", "F1S2", "F1S3"]
+    assert floor.available_count(SpotType.COMPACT) == 0
+
+
+def test_freed_spot_is_reused_in_id_order():
+    floor = build_floor()
+    for i in range(3):
+        floor.assign_vehicle(Vehicle(f"C{i}", VehicleType.CAR))
+    floor.free_spot("F1S3")
+    floor.free_spot("F1S2")
+    assert floor.assign_vehicle(Vehicle("C9", VehicleType.CAR)).spot_id == "F1S2"
+    assert floor.available_count(SpotType.COMPACT) == 1
+
+
+def test_spots_are_slotted():
+    spot = ParkingSpot("F1S1", SpotType.LARGE, 1)
+    assert not hasattr(spot, "__dict__")
+    spot.assign(Vehicle("T1", VehicleType.TRUCK))
+    assert spot.occupied and spot.vehicle.license_no == "T1"
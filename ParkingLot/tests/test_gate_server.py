@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+from parking_lot.enums import VehicleType
+from parking_lot.gate_server import GateServer, GateClient
+from test_lot import build_lot
+
+
+async def scenario():
+    server = GateServer(build_lot())
+    await server.start()
+    host, port = server.address[:2]
+    gates = [await GateClient.connect(host, port) for _ in range(3)]
+    try:
+        parked = await asyncio.gather(*(g.park(f"TR-{i}", "TRUCK") for i, g in enumerate(gates)))
+        assert sorted(r["ok"] for r in parked) == [False, True, True]
+        assert {r["spot"] for r in parked if r["ok"]} == {"F1S3", "F2S3"}
+
+        avail = await gates[0].availability()
+        assert avail["floors"]["1"]["TRUCK"] == 0 and avail["floors"]["1"]["CAR"] == 1
+
+        ticket = next(r["ticket_id"] for r in parked if r["ok"])
+        assert (await gates[1].unpark(ticket))["fee"] == 10
+        assert (await gates[1].unpark(ticket))["ok"] is False
+        assert (await gates[2].request(op="park", license_no="X", vtype="BOAT"))["ok"] is False
+    finally:
+        for g in gates:
+            await g.close()
+        await server.close()
+
+
+def test_gate_server_round_trip():
+    asyncio.run(scenario())
+
+
+def test_slow_batches_leave_the_loop_free_and_the_queue_bounded():
+    async def main():
+        lot = build_lot()
+        release = threading.Event()
+        park_many = lot.park_many
+
+        def slow_park_many(vehicles):
+            release.wait(5)  # e.g. a synchronous store waiting on fsync
+            return park_many(vehicles)
+
+        lot.park_many = slow_park_many
+        fits = sum(f.free_count_for(VehicleType.CAR) for f in lot.allocation.floors)
+        server = GateServer(lot, max_batch=1, max_queue=2)
+        await server.start()
+        host, port = server.address[:2]
+        gates = [await GateClient.connect(host, port) for _ in range(6)]
+        try:
+            parks = [asyncio.create_task(g.park(f"C-{i}", "CAR")) for i, g in enumerate(gates)]
+            started = time.perf_counter()
+            await asyncio.sleep(0.1)
+            assert time.perf_counter() - started < 0.5  # the loop kept running
+            assert server._queue.qsize() == 2  # the rest wait at their connections
+            release.set()
+            results = await asyncio.gather(*parks)
+            assert sum(r["ok"] for r in results) == min(fits, len(gates))
+        finally:
+            release.set()
+            for g in gates:
+                await g.close()
+            await server.close()
+    asyncio.run(main())
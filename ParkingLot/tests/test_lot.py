@@ -23,3 +23,45 @@ def test_full_flow():
     fee = lot.unpark(t1.ticket_id)
     assert fee >= 10
     assert t1.ticket_id not in lot.tickets
+
+def test_park_many_reports_per_item_errors():
+    lot = build_lot()
+    trucks = [Vehicle(f"TR-{i}", VehicleType.TRUCK) for i in range(3)]
+    results = lot.park_many(trucks + [Vehicle("BK-1", VehicleType.BIKE)])
+    assert [r.ok for r in results] == [True, True, False, True]
+    assert [r.value.spot_id for r in results if r.ok] == ["F1S3", "F2S3", "F1S1"]
+    assert len(lot.tickets) == 3
+
+def test_unpark_many_settles_batch():
+    lot = build_lot()
+    tickets = [r.value for r in lot.park_many([Vehicle("C-1", VehicleType.CAR), Vehicle("C-2", VehicleType.CAR)])]
+    results = lot.unpark_many([tickets[0].ticket_id, "bogus", tickets[1].ticket_id])
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[0].value == 10 and results[2].value == 10
+    assert isinstance(results[1].error, ValueError)
+    assert lot.tickets == {}
+    assert lot.park(Vehicle("C-3", VehicleType.CAR)).spot_id == "F1S2"
+
+def test_ticket_releases_its_own_floor():
+    lot = build_lot()
+    lot.park(Vehicle("TR-1", VehicleType.TRUCK))
+    t2 = lot.park(Vehicle("TR-2", VehicleType.TRUCK))
+    assert t2.floor.floor_id == 2 and t2.spot is t2.floor.spots[2]
+    lot.unpark(t2.ticket_id)
+    assert not t2.spot.occupied
+    assert lot.floors[0].spots[2].occupied
+
+def test_occupancy_snapshot_tracks_counters():
+    lot = build_lot()
+    before = lot.occupancy()
+    assert before is lot.occupancy()  # cached until something changes
+    assert before.free_for(VehicleType.CAR) == 4
+    t = lot.park(Vehicle("TR-1", VehicleType.TRUCK))
+    after = lot.occupancy()
+    assert after.version > before.version
+    floor1 = after.floors[0]
+    assert floor1.free_by_spot_type[SpotType.LARGE] == 0
+    assert dict(floor1.free_by_vehicle_type) == {VehicleType.BIKE: 2, VehicleType.CAR: 1, VehicleType.TRUCK: 0}
+    assert before.free_for(VehicleType.CAR) == 4  # old snapshot is unchanged
+    lot.unpark(t.ticket_id)
+    assert lot.occupancy().free_for(VehicleType.TRUCK) == 2
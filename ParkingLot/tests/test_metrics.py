@@ -0,0 +1,53 @@
+from parking_lot.metrics import MetricsRegistry, instrument, uninstrument
+from parking_lot.models import Vehicle
+from parking_lot.enums import VehicleType
+from test_concurrency import THREADS, run_threads
+from test_concurrency import build_lot as build_concurrent_lot
+from test_lot import build_lot
+
+
+def test_instrument_counts_times_and_renders_prometheus(tmp_path):
+    lot = build_lot()
+    registry = instrument(lot, sample_every=1, detail=True)
+    tickets = [lot.park(Vehicle(f"C-{i}", VehicleType.CAR)) for i in range(3)]
+    lot.unpark(tickets[0].ticket_id)
+
+    assert registry.get("parking_calls_total", lot=lot.name, op="park").fn() == 3
+    assert registry.get("parking_op_duration_seconds", lot=lot.name, op="park").count == 3
+    assert registry.get("parking_calls_total", lot=lot.name, op="assign_vehicle", floor="1").fn() == 2
+    text = registry.render()
+    assert "# TYPE parking_op_duration_seconds histogram" in text
+    assert 'parking_calls_total{lot="DowntownLot",op="calculate_fee"} 1' in text
+    assert 'parking_open_tickets{lot="DowntownLot"} 2' in text
+    assert 'parking_free_spots{floor="1",lot="DowntownLot",spot_type="LARGE"} 0' in text
+    assert 'le="+Inf"} 3' in text
+
+    uninstrument(lot)
+    lot.park(Vehicle("C-9", VehicleType.CAR))
+    assert registry.get("parking_calls_total", lot=lot.name, op="park").fn() == 3
+
+    dumper = registry.dump_every(str(tmp_path / "parking.prom"), interval=60)
+    dumper.stop()
+    assert (tmp_path / "parking.prom").read_text() == registry.render()
+
+
+def test_sampling_counts_every_call_but_times_a_fraction():
+    lot = build_lot()
+    registry = instrument(lot, MetricsRegistry(), sample_every=4)
+    for i in range(8):
+        lot.unpark(lot.park(Vehicle(f"B-{i}", VehicleType.BIKE)).ticket_id)
+    assert registry.get("parking_calls_total", lot=lot.name, op="unpark").fn() == 8
+    assert registry.get("parking_op_duration_seconds", lot=lot.name, op="unpark").count == 2
+
+
+def test_counts_are_exact_with_concurrent_gate_threads():
+    lot = build_concurrent_lot()
+    registry = instrument(lot, sample_every=4)
+
+    def gate(t):
+        for i in range(200):
+            lot.unpark(lot.park(Vehicle(f"T{t}-{i}", VehicleType.CAR)).ticket_id)
+
+    run_threads(gate)
+    assert registry.get("parking_calls_total", lot=lot.name, op="park").fn() == THREADS * 200
+    assert registry.get("parking_calls_total", lot=lot.name, op="unpark").fn() == THREADS * 200
@@ -0,0 +1,69 @@
+from parking_lot.lot import ParkingLot
+from parking_lot.floor import ParkingFloor
+from parking_lot.models import ParkingSpot, Vehicle
+from parking_lot.enums import VehicleType, SpotType
+from parking_lot.errors import NoCompatibleSpotError
+from parking_lot.pricing import FlatRatePricing
+from parking_lot.policies import (
+    BestFitPolicy, FloorBalancingPolicy, NearestExitPolicy, ReservedHeadroomPolicy,
+)
+from parking_lot.simulation import synthetic_trace, compare_policies
+import pytest
+
+
+def build_floors():
+    # floor 1: large only; floor 2: motorbike + compact; floor 3: two compacts + large
+    return [
+        ParkingFloor(1, [ParkingSpot("F1L1", SpotType.LARGE, 1), ParkingSpot("F1L2", SpotType.LARGE, 1)]),
+        ParkingFloor(2, [ParkingSpot("F2M1", SpotType.MOTORBIKE, 2), ParkingSpot("F2C1", SpotType.COMPACT, 2)]),
+        ParkingFloor(3, [ParkingSpot("F3C1", SpotType.COMPACT, 3), ParkingSpot("F3C2", SpotType.COMPACT, 3),
+                         ParkingSpot("F3L1", SpotType.LARGE, 3)]),
+    ]
+
+
+def lot_with(policy):
+    return ParkingLot("PolicyLot", build_floors(), FlatRatePricing(10), policy=policy)
+
+
+def test_default_first_fit_takes_lowest_floor():
+    lot = lot_with(None)
+    assert lot.park(Vehicle("B1", VehicleType.BIKE)).spot_id == "F1L1"
+
+
+def test_best_fit_keeps_bikes_out_of_large_spots():
+    lot = lot_with(BestFitPolicy())
+    assert lot.park(Vehicle("B1", VehicleType.BIKE)).spot_id == "F2M1"
+    assert lot.park(Vehicle("B2", VehicleType.BIKE)).spot_id == "F2C1"
+    assert lot.park(Vehicle("C1", VehicleType.CAR)).spot_id == "F3C1"
+
+
+def test_nearest_exit_uses_configured_distances():
+    lot = lot_with(NearestExitPolicy({1: 30, 2: 20, 3: 10}))
+    assert lot.park(Vehicle("C1", VehicleType.CAR)).spot_id == "F3C1"
+
+
+def test_floor_balancing_picks_roomiest_floor():
+    lot = lot_with(FloorBalancingPolicy())
+    spots = [lot.park(Vehicle(f"B{i}", VehicleType.BIKE)).spot_id for i in range(3)]
+    assert spots == ["F3C1", "F1L1", "F2M1"]
+
+
+def test_reserved_headroom_turns_cars_away_from_last_large_spots():
+    lot = lot_with(ReservedHeadroomPolicy({SpotType.LARGE: 2}, inner=BestFitPolicy()))
+    for i in range(3):
+        lot.park(Vehicle(f"C{i}", VehicleType.CAR))  # all three compacts
+    assert lot.park(Vehicle("C8", VehicleType.CAR)).spot_id == "F1L1"  # 3 LARGE free > 2 reserved
+    with pytest.raises(NoCompatibleSpotError):
+        lot.park(Vehicle("C9", VehicleType.CAR))
+    assert lot.park(Vehicle("T1", VehicleType.TRUCK)).spot_id == "F1L2"
+
+
+def test_simulation_reports_policy_metrics():
+    trace = synthetic_trace(300, arrivals_per_hour=60, mean_stay_hours=0.2, seed=3)
+    policies = {"first-fit": None, "best-fit": BestFitPolicy()}
+    reports = compare_policies(policies, build_floors, trace)
+    assert [r.name for r in reports] == ["first-fit", "best-fit"]
+    for r in reports:
+        assert r.arrivals == 300
+        assert 0 < r.utilization <= 1
+        assert r.rejected == sum(r.rejected_by_type.values())
@@ -0,0 +1,27 @@
+import random
+from datetime import datetime, timedelta
+from parking_lot.pricing import FlatRatePricing, HourlySlabPricing
+
+
+def sample_stays(n=2000):
+    rng = random.Random(7)
+    base = datetime(2024, 1, 1)
+    entries, exits = [], []
+    for _ in range(n):
+        entry = base + timedelta(microseconds=rng.randrange(10**12))
+        # include exact hour boundaries and off-by-one-microsecond stays
+        dur = rng.choice([
+            timedelta(hours=rng.randrange(6)),
+            timedelta(hours=rng.randrange(6), microseconds=1),
+            timedelta(microseconds=rng.randrange(10**11)),
+        ])
+        entries.append(entry)
+        exits.append(entry + dur)
+    return entries, exits
+
+
+def test_batch_fees_match_scalar_reference():
+    entries, exits = sample_stays()
+    for strategy in (FlatRatePricing(12.5), HourlySlabPricing(10, 3.3)):
+        expected = [strategy.calculate_fee(e, x) for e, x in zip(entries, exits)]
+        assert [float(f) for f in strategy.calculate_fees(entries, exits)] == expected
@@ -0,0 +1,41 @@
+import pytest
+from parking_lot.sharding import ShardedRuntime
+from parking_lot.models import Vehicle
+from parking_lot.enums import VehicleType
+from parking_lot.errors import NoCompatibleSpotError
+from test_lot import build_lot
+
+LOTS = {"north": build_lot, "south": build_lot, "east": build_lot}
+
+
+def test_sharded_runtime_routes_by_lot_and_publishes_availability():
+    with ShardedRuntime(LOTS, workers=2) as runtime:
+        north, south = runtime.lot("north"), runtime.lot("south")
+        t1 = north.park(Vehicle("TR-1", VehicleType.TRUCK))
+        north.park(Vehicle("TR-2", VehicleType.TRUCK))
+        with pytest.raises(NoCompatibleSpotError):
+            north.park(Vehicle("TR-3", VehicleType.TRUCK))
+        assert south.park(Vehicle("TR-3", VehicleType.TRUCK)).spot_id == "F1S3"
+
+        assert runtime.availability("north") == {
+            1: {"BIKE": 2, "CAR": 1, "TRUCK": 0},
+            2: {"BIKE": 2, "CAR": 1, "TRUCK": 0},
+        }
+        assert runtime.availability("east")[1]["TRUCK"] == 1
+
+        assert north.unpark(t1.ticket_id) == 10
+        assert runtime.availability("north")[1]["TRUCK"] == 1
+        results = south.park_many([Vehicle("C-1", VehicleType.CAR), Vehicle("C-2", VehicleType.CAR)])
+        assert [r.value.spot_id for r in results] == ["F1S2", "F2S2"]
+        with pytest.raises(ValueError):
+            runtime.lot("west")
+
+
+def test_reading_a_shard_whose_worker_died_mid_write_raises():
+    with ShardedRuntime({"north": build_lot}, workers=1) as runtime:
+        shard = runtime._shard("north")
+        shard.process.kill()
+        shard.process.join()
+        shard.view[shard.offsets["north"]] += 1  # seqlock left odd, as by a write cut short
+        with pytest.raises(RuntimeError, match="died"):
+            runtime.availability("north")
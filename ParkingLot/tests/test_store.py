@@ -0,0 +1,104 @@
+import os
+import time
+import pytest
+from parking_lot.errors import ParkingError
+from parking_lot.lot import ParkingLot
+from parking_lot.models import Vehicle
+from parking_lot.enums import VehicleType
+from parking_lot.pricing import FlatRatePricing
+from parking_lot.store import WalTicketStore
+from test_lot import build_lot
+
+
+def reopen(path, **kwargs):
+    floors = build_lot().floors  # fresh, empty floors as after a restart
+    return ParkingLot("DowntownLot", floors, FlatRatePricing(10), store=WalTicketStore(str(path), **kwargs))
+
+
+def test_restart_restores_tickets_and_occupancy(tmp_path):
+    lot = reopen(tmp_path)
+    t1 = lot.park(Vehicle("TR-1", VehicleType.TRUCK))
+    t2 = lot.park(Vehicle("TR-2", VehicleType.TRUCK))
+    t3 = lot.park(Vehicle("C-1", VehicleType.CAR))
+    lot.unpark(t1.ticket_id)
+    lot.store.close()
+
+    lot = reopen(tmp_path)
+    assert set(lot.tickets) == {t2.ticket_id, t3.ticket_id}
+    restored = lot.tickets[t2.ticket_id]
+    assert restored.spot.occupied and restored.floor.floor_id == 2
+    assert restored.entry_time == t2.entry_time
+    # freed spot F1S3 is handed out again, occupied ones are not
+    assert lot.park(Vehicle("TR-3", VehicleType.TRUCK)).spot_id == "F1S3"
+    assert lot.unpark(t2.ticket_id) >= 10
+    lot.store.close()
+
+
+def test_snapshot_compacts_log_and_ignores_torn_tail(tmp_path):
+    lot = reopen(tmp_path, snapshot_every=4)
+    tickets = [lot.park(Vehicle(f"C-{i}", VehicleType.CAR)) for i in range(3)]
+    for t in tickets[:2]:
+        lot.unpark(t.ticket_id)
+    lot.store.sync()
+    lot.store.close()
+    assert os.path.exists(tmp_path / WalTicketStore.SNAPSHOT)
+    with open(tmp_path / WalTicketStore.LOG, "a") as f:
+        f.write("P\thalf-written")
+
+    lot = reopen(tmp_path)
+    assert list(lot.tickets) == [tickets[2].ticket_id]
+    t = lot.park(Vehicle("C-9", VehicleType.CAR))
+    lot.store.close()
+    lot = reopen(tmp_path)
+    assert set(lot.tickets) == {tickets[2].ticket_id, t.ticket_id}
+    lot.store.close()
+
+
+def test_synchronous_mode_waits_for_fsync(tmp_path):
+    lot = reopen(tmp_path, synchronous=True)
+    t = lot.park(Vehicle("C-1", VehicleType.CAR))
+    with open(tmp_path / WalTicketStore.LOG) as f:
+        assert t.ticket_id in f.read()
+    lot.store.close()
+
+
+def test_sequential_ids_continue_past_restored_tickets(tmp_path):
+    lot = reopen(tmp_path)
+    open_ids = [lot.park(Vehicle(f"C-{i}", VehicleType.CAR)).ticket_id for i in range(2)]
+    lot.store.close()
+
+    lot = reopen(tmp_path)  # default sequential generator starts over at T1...
+    t = lot.park(Vehicle("C-9", VehicleType.CAR))
+    assert t.ticket_id not in open_ids  # ...but is moved past the restored ones
+    assert set(lot.tickets) == set(open_ids) | {t.ticket_id}
+    lot.store.close()
+    lot = reopen(tmp_path)
+    assert set(lot.tickets) == set(open_ids) | {t.ticket_id}
+    lot.store.close()
+
+
+def test_idle_flusher_sleeps_until_an_append(tmp_path):
+    lot = reopen(tmp_path)
+    waits = []
+    wait = lot.store._cond.wait
+    lot.store._cond.wait = lambda timeout=None: waits.append(timeout) or wait(timeout)
+    time.sleep(0.05)  # ten commit intervals with nothing to write
+    assert len(waits) <= 1
+    t = lot.park(Vehicle("C-1", VehicleType.CAR))
+    deadline = time.time() + 2
+    while lot.store._durable == 0 and time.time() < deadline:
+        time.sleep(0.005)
+    with open(tmp_path / WalTicketStore.LOG) as f:
+        assert t.ticket_id in f.read()  # written without anyone calling sync()
+    lot.store.close()
+
+
+def test_restore_names_ticket_and_floor_that_are_not_configured(tmp_path):
+    lot = reopen(tmp_path)
+    t = lot.park(Vehicle("TR-1", VehicleType.TRUCK))  # trucks only fit on floor 2
+    lot.store.close()
+    floors = [f for f in build_lot().floors if f.floor_id != t.floor.floor_id]
+    store = WalTicketStore(str(tmp_path))
+    with pytest.raises(ParkingError, match=f"{t.ticket_id}.*floor {t.floor.floor_id}"):
+        ParkingLot("DowntownLot", floors, FlatRatePricing(10), store=store)
+    store.close()
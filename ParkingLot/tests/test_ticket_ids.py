@@ -0,0 +1,63 @@
+import threading
+import pytest
+from datetime import datetime
+from parking_lot.models import Vehicle
+from parking_lot.enums import VehicleType
+from parking_lot.ticket_ids import SnowflakeIdGenerator, SequentialIdGenerator
+from test_lot import build_lot
+
+CAR = Vehicle("MN-123", VehicleType.CAR)
+
+
+def test_same_plate_reentry_gets_new_ticket():
+    lot = build_lot()
+    t1 = lot.park(CAR)
+    t2 = lot.park(CAR)
+    assert t1.ticket_id != t2.ticket_id
+    assert set(lot.tickets) == {t1.ticket_id, t2.ticket_id}
+
+
+def test_snowflake_unique_across_threads_in_one_millisecond():
+    gen = SnowflakeIdGenerator(node_id=7)
+    now = datetime(2025, 6, 1, 8, 0, 0)
+    per_thread, ids = 20_000, []
+
+    def mint():
+        ids.extend([gen.next_id(CAR, now) for _ in range(per_thread)])
+
+    threads = [threading.Thread(target=mint) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(ids)) == 4 * per_thread
+
+
+def test_snowflake_nodes_do_not_collide_and_ids_sort_by_time():
+    now = datetime(2025, 6, 1, 8, 0, 0)
+    a, b = SnowflakeIdGenerator(node_id=1), SnowflakeIdGenerator(node_id=2)
+    assert a.next_id(CAR, now) != b.next_id(CAR, now)
+    assert a.next_id(CAR, now) < a.next_id(CAR, datetime(2025, 6, 1, 8, 0, 1))
+
+
+def test_sequential_generator():
+    gen = SequentialIdGenerator("G")
+    assert [gen.next_id(CAR, datetime.utcnow()) for _ in range(3)] == ["G1", "G2", "G3"]
+
+
+def test_snowflake_node_id_comes_from_configuration(monkeypatch):
+    monkeypatch.delenv(SnowflakeIdGenerator.NODE_ENV, raising=False)
+    with pytest.raises(ValueError, match="node_id is required"):
+        SnowflakeIdGenerator()
+    monkeypatch.setenv(SnowflakeIdGenerator.NODE_ENV, "42")
+    assert SnowflakeIdGenerator().node_id == 42
+    for bad in ("node-a", "1024"):
+        monkeypatch.setenv(SnowflakeIdGenerator.NODE_ENV, bad)
+        with pytest.raises(ValueError):
+            SnowflakeIdGenerator()
+
+
+def test_sequential_generator_resumes_after_restored_ids():
+    gen = SequentialIdGenerator("G")
+    gen.resume_after(["G7", "G3", "X99", "Gate"])
+    assert gen.next_id(CAR, datetime.utcnow()) == "G8"
@@ -0,0 +1,87 @@
+"""Card purchases against the fake processor, with the keypad selling alongside.
+
+Run from the VendingMachine folder:  python -m benchmarks.bench_card [purchases]
+CONCURRENCY card purchases at a time go through one ProcessorPool to a
+FakeProcessor with realistic latency, transient failures and stalls. A
+keypad task keeps making cash sales on the same machine and event loop the
+whole time; its count shows that authorization never blocks the machine.
+"""
+import asyncio
+import statistics
+import sys
+import time
+from vending_machine.card import AsyncCardPayment, FakeProcessor, ProcessorPool
+from vending_machine.cash import CashDrawer
+from vending_machine.enums import Denomination
+from vending_machine.errors import PaymentDeclined, PaymentUnavailable
+from vending_machine.inventory import Inventory
+from vending_machine.machine import VendingMachine
+from vending_machine.models import Product, Slot
+
+PURCHASES = 2_000
+CONCURRENCY = 64
+POOL = 16
+PROCESSOR = dict(latency=0.02, jitter=0.02, failure_rate=0.03, stall_rate=0.005, decline_rate=0.02, seed=0)
+
+
+async def main_async(purchases: int) -> None:
+    processor = FakeProcessor(**PROCESSOR)
+    await processor.start()
+    pool = ProcessorPool(*processor.address, size=POOL, timeout=0.25, retries=3, backoff=0.02)
+    payment = AsyncCardPayment(pool)
+    vm = VendingMachine(CashDrawer({Denomination.C25: 10}),
+                        Inventory({"A1": Slot(Product("A1", "Coke", 75), purchases),
+                                   "B1": Slot(Product("B1", "Chips", 75), 1_000_000)}))
+
+    latencies, outcomes = [], {"sold": 0, "declined": 0, "unavailable": 0}
+    gate = asyncio.Semaphore(CONCURRENCY)
+    keypad_sales = 0
+    done = asyncio.Event()
+
+    async def card(i: int) -> None:
+        async with gate:
+            start = time.perf_counter()
+            try:
+                await vm.card_purchase("A1", f"4111{i:012d}", payment)
+                outcomes["sold"] += 1
+            except PaymentDeclined:
+                outcomes["declined"] += 1
+            except PaymentUnavailable:
+                outcomes["unavailable"] += 1
+            latencies.append(time.perf_counter() - start)
+
+    async def keypad() -> None:
+        nonlocal keypad_sales
+        while not done.is_set():
+            vm.insert_money((Denomination.C25, 3))
+            vm.select_product("B1")
+            vm.dispense()
+            vm.dispense()
+            keypad_sales += 1
+            await asyncio.sleep(0.001)  # a customer every millisecond
+
+    keypad_task = asyncio.create_task(keypad())
+    started = time.perf_counter()
+    await asyncio.gather(*(card(i) for i in range(purchases)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await keypad_task
+    await pool.close()
+    await processor.close()
+
+    q = statistics.quantiles(latencies, n=100)
+    slot = vm.inventory.slots["A1"]
+    print(f"card purchases={purchases} concurrency={CONCURRENCY} pool={POOL} elapsed={elapsed:.2f}s "
+          f"throughput={purchases / elapsed:,.0f}/s")
+    print(f"latency p50={q[49] * 1000:.1f}ms p99={q[98] * 1000:.1f}ms  " +
+          " ".join(f"{k}={v}" for k, v in outcomes.items()) + f" retries={pool.retried}")
+    print(f"keypad cash sales meanwhile={keypad_sales}  stock left={slot.quantity} reserved={slot.reserved}  "
+          f"holds left={len(processor.holds)}")
+
+
+def main() -> None:
+    asyncio.run(main_async(int(sys.argv[1]) if len(sys.argv) > 1 else PURCHASES))
+
+
+if __name__ == "__main__":
+    main()
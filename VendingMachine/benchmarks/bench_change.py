@@ -0,0 +1,68 @@
+"""Sale latency with exact bounded change-making, against a per-sale budget.
+
+Run from the VendingMachine folder:  python -m benchmarks.bench_change
+Each sale inserts cash, selects, dispenses and collects change on a machine
+whose drawer starts with a realistic float; p50/p99 are over all sales.
+"""
+import random
+import statistics
+import time
+from vending_machine.cash import CashDrawer
+from vending_machine.enums import Denomination
+from vending_machine.errors import CannotMakeChange
+from vending_machine.inventory import Inventory
+from vending_machine.machine import VendingMachine
+from vending_machine.models import Product, Slot
+
+SALES = 20_000
+BUDGET_US = 1_000  # p99 budget per sale
+FLOAT = {Denomination.C100: 10, Denomination.C25: 40, Denomination.C10: 50, Denomination.C5: 40, Denomination.C1: 100}
+PRICES = (65, 85, 120, 135, 150, 175, 195)
+
+
+def build_machine() -> VendingMachine:
+    inv = Inventory({f"A{i}": Slot(Product(f"A{i}", f"Item {i}", p), SALES) for i, p in enumerate(PRICES)})
+    return VendingMachine(CashDrawer(dict(FLOAT)), inv)
+
+
+def run(sales: int, seed: int = 0):
+    rng = random.Random(seed)
+    vm = build_machine()
+    codes = list(vm.inventory.slots)
+    latencies, refused = [], 0
+    for _ in range(sales):
+        code = rng.choice(codes)
+        price = vm.inventory.get_price(code)
+        if rng.random() < 0.5:
+            cash = (Denomination.C100, -(-price // 100) + rng.randint(0, 1))
+        else:
+            cash = (Denomination.C25, -(-price // 25))
+        start = time.perf_counter_ns()
+        vm.insert_money(cash)
+        try:
+            vm.select_product(code)  # reserves the change, or refuses before vending
+        except CannotMakeChange:
+            refused += 1
+            vm.cancel()
+        else:
+            vm.dispense()
+            vm.dispense()
+        latencies.append(time.perf_counter_ns() - start)
+        # a service run empties the cash box and tops up the float now and then
+        if vm.drawer.drawer[Denomination.C100] > 200:
+            vm.drawer.drawer.clear()
+            for denom, count in FLOAT.items():
+                vm.drawer.add(denom, count)
+    return latencies, refused
+
+
+def main() -> None:
+    latencies, refused = run(SALES)
+    q = statistics.quantiles(latencies, n=100)
+    p50, p99 = q[49] / 1000, q[98] / 1000
+    print(f"sales={SALES} refused={refused} p50={p50:.1f}us p99={p99:.1f}us "
+          f"budget={BUDGET_US}us -> {'OK' if p99 <= BUDGET_US else 'OVER'}")
+
+
+if __name__ == "__main__":
+    main()
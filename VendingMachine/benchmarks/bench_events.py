@@ -0,0 +1,58 @@
+"""Cost of threshold watchers on the sale path, and a consumer that never reads.
+
+Run from the VendingMachine folder:  python -m benchmarks.bench_events [transactions]
+Runs the default simulation three times: without watchers, with slot and
+coin watchers publishing into an EventStream nobody consumes (it fills up
+and drops), and for comparison polling admin_status after every transaction
+the way dashboards used to find empty slots.
+"""
+import sys
+from vending_machine.enums import Denomination
+from vending_machine.events import EventStream
+from vending_machine.simulation import Scenario, build_machine, simulate
+
+TRANSACTIONS = 100_000
+
+
+class PollingMachine:
+    """Wraps a machine so every cancel/second dispense also polls admin_status."""
+    def __init__(self, vm):
+        self._vm = vm
+
+    def __getattr__(self, name):
+        return getattr(self._vm, name)
+
+    def cancel(self):
+        refund = self._vm.cancel()
+        [code for code, qty in self._vm.admin_status()["inventory"].items() if qty <= 2]
+        return refund
+
+    def dispense(self):
+        result = self._vm.dispense()
+        [code for code, qty in self._vm.admin_status()["inventory"].items() if qty <= 2]
+        return result
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else TRANSACTIONS
+    scenario = Scenario()
+    plain = simulate(n, scenario)
+
+    vm = build_machine(scenario)
+    stream = EventStream(maxsize=1024)
+    vm.inventory.watch(stream, low=2)
+    vm.drawer.watch(stream, low={Denomination.C25: 5, Denomination.C10: 5},
+                    high={Denomination.C100: 200})
+    watched = simulate(n, scenario, vm)
+
+    polled = simulate(n, scenario, PollingMachine(build_machine(scenario)))
+
+    print(f"transactions={n}")
+    print(f"  no watchers      tps={plain.tps:,.0f}")
+    print(f"  watchers         tps={watched.tps:,.0f}  ({watched.tps / plain.tps - 1:+.1%}) "
+          f"events kept={len(stream)} dropped={stream.dropped}")
+    print(f"  poll admin_status tps={polled.tps:,.0f}  ({polled.tps / plain.tps - 1:+.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Memory per in-memory machine and state-transition throughput.
+
+Run from the VendingMachine folder:  python -m benchmarks.bench_footprint [machines]
+Builds a fleet of machines (20 slots, 4 coin types, products shared across
+the fleet as a fleet simulator would) and reports traced bytes per machine,
+then times insert/cancel and full purchase cycles on one machine.
+"""
+import sys
+import time
+import tracemalloc
+from vending_machine.cash import CashDrawer
+from vending_machine.enums import Denomination
+from vending_machine.inventory import Inventory
+from vending_machine.machine import VendingMachine
+from vending_machine.models import Product, Slot
+
+MACHINES = 20_000
+CYCLES = 200_000
+PRODUCTS = [Product(f"A{i}", f"Item {i}", 75) for i in range(20)]
+FLOAT = {Denomination.C25: 20, Denomination.C10: 20, Denomination.C5: 20, Denomination.C1: 40}
+
+
+def build_machine() -> VendingMachine:
+    return VendingMachine(CashDrawer(FLOAT), Inventory({p.code: Slot(p, 10) for p in PRODUCTS}))
+
+
+def bytes_per_machine(machines: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    fleet = [build_machine() for _ in range(machines)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del fleet
+    return used / machines
+
+
+def transitions_per_second() -> tuple:
+    vm = build_machine()
+    quarter = (Denomination.C25, 1)
+    started = time.perf_counter()
+    for _ in range(CYCLES):
+        vm.insert_money(quarter)
+        vm.cancel()
+    cancel_tps = 2 * CYCLES / (time.perf_counter() - started)
+
+    three = (Denomination.C25, 3)
+    sales = CYCLES // 10
+    started = time.perf_counter()
+    for i in range(sales):
+        vm.insert_money(three)
+        vm.select_product("A1")
+        vm.dispense()
+        vm.dispense()
+        if i % 9 == 8:
+            vm.admin_refill("A1", 9)
+    sale_tps = 4 * sales / (time.perf_counter() - started)
+    return cancel_tps, sale_tps
+
+
+def main() -> None:
+    machines = int(sys.argv[1]) if len(sys.argv) > 1 else MACHINES
+    per_machine = bytes_per_machine(machines)
+    cancel_tps, sale_tps = transitions_per_second()
+    print(f"machines={machines} bytes/machine={per_machine:,.0f}")
+    print(f"transitions/s: insert+cancel={cancel_tps:,.0f} purchase={sale_tps:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
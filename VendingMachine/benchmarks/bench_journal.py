@@ -0,0 +1,54 @@
+"""Journal write throughput and the time to replay a year of sales.
+
+Run from the VendingMachine folder:  python -m benchmarks.bench_journal [sales_per_day]
+Writes a year of sale records (insert, select, dispense, change) straight to a
+BinaryJournal in a temp directory, then rebuilds Inventory and CashDrawer.
+"""
+import random
+import sys
+import tempfile
+import time
+from vending_machine.cash import CashDrawer
+from vending_machine.enums import Denomination
+from vending_machine.inventory import Inventory
+from vending_machine.journal import RECORD, BinaryJournal, RecordKind, replay
+from vending_machine.models import Product, Slot
+
+SALES_PER_DAY = 2_000
+DAYS = 365
+CODES = [f"{row}{col}" for row in "ABCD" for col in range(1, 6)]
+CHANGE = [(), ((Denomination.C25, 1),), ((Denomination.C10, 2), (Denomination.C5, 1)), ((Denomination.C25, 2),)]
+
+
+def main() -> None:
+    per_day = int(sys.argv[1]) if len(sys.argv) > 1 else SALES_PER_DAY
+    sales = per_day * DAYS
+    rng = random.Random(0)
+    inventory = Inventory({c: Slot(Product(c, c, 100), sales) for c in CODES})
+    drawer = CashDrawer({d: sales for d in Denomination})
+    with tempfile.TemporaryDirectory() as directory:
+        journal = BinaryJournal(directory, batch=4096)
+        journal.snapshot(inventory, drawer)
+        start = time.perf_counter()
+        for _ in range(sales):
+            code = rng.choice(CODES)
+            journal.append(RecordKind.INSERT, value=Denomination.C100, count=1)
+            journal.append(RecordKind.SELECT, code, 100)
+            journal.append(RecordKind.DISPENSE, code, 100)
+            for denom, count in rng.choice(CHANGE):
+                journal.append(RecordKind.CHANGE, value=denom, count=count)
+        journal.close()
+        write_s = time.perf_counter() - start
+        records = journal.records
+
+        start = time.perf_counter()
+        inventory, drawer = replay(directory)
+        replay_s = time.perf_counter() - start
+
+    print(f"sales={sales} records={records} ({records * RECORD.size / 2**20:.1f} MiB)")
+    print(f"write : {records / write_s / 1e6:.2f} M records/s ({write_s:.2f}s)")
+    print(f"replay: {replay_s:.2f}s for one year")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Restocking a fleet: per-slot refill/add_slot calls vs. one Planogram.apply_fleet.
+
+Run from the VendingMachine folder:  python -m benchmarks.bench_planogram [machines]
+Every machine gets the same plan: 40 slots filled to par, 8 of them new and
+10 re-priced. The per-slot path cannot re-price, so it only does the
+quantities; the planogram does everything and validates first.
+"""
+import sys
+import time
+from vending_machine.cash import CashDrawer
+from vending_machine.inventory import Inventory
+from vending_machine.machine import VendingMachine
+from vending_machine.models import Product, Slot
+from vending_machine.planogram import Planogram, SlotPlan
+
+MACHINES = 5_000
+CODES = [f"{row}{col}" for row in "ABCDE" for col in range(1, 9)]
+PAR = 12
+
+
+def build_fleet(machines: int):
+    old = CODES[:-8]  # last 8 slots are new in the plan
+    return [VendingMachine(CashDrawer(), Inventory({c: Slot(Product(c, f"Item {c}", 100), i % PAR)
+                                                    for i, c in enumerate(old)}))
+            for _ in range(machines)]
+
+
+def per_slot(fleet, plan) -> None:
+    for vm in fleet:
+        inv = vm.inventory
+        for entry in plan:
+            code = entry.product.code
+            if code in inv.slots:
+                inv.refill(code, entry.quantity - inv.slots[code].quantity)
+            else:
+                inv.add_slot(entry.product, entry.quantity)
+
+
+def main() -> None:
+    machines = int(sys.argv[1]) if len(sys.argv) > 1 else MACHINES
+    plan = [SlotPlan(Product(c, f"Item {c}", 125 if i < 10 else 100), PAR) for i, c in enumerate(CODES)]
+
+    fleet = build_fleet(machines)
+    started = time.perf_counter()
+    per_slot(fleet, plan)
+    loop_s = time.perf_counter() - started
+
+    fleet = build_fleet(machines)
+    started = time.perf_counter()
+    Planogram(plan).apply_fleet(fleet)
+    bulk_s = time.perf_counter() - started
+
+    assert all(vm.inventory.available_products() == dict.fromkeys(CODES, PAR) for vm in fleet)
+    print(f"machines={machines} slots={len(CODES)}  per-slot calls={loop_s * 1000:.0f}ms  "
+          f"apply_fleet={bulk_s * 1000:.0f}ms  ({loop_s / bulk_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Concurrent sessions on one machine: throughput and oversell check.
+
+Run from the VendingMachine folder:  python -m benchmarks.bench_sessions
+THREADS shoppers each open their own session and keep buying random
+products, paying by bill or in quarters, until every product is sold out or
+refused for lack of change. Afterwards stock, reservations and cash must
+reconcile exactly with the sales recorded by the shoppers.
+"""
+import random
+import sys
+import threading
+import time
+from vending_machine.cash import CashDrawer
+from vending_machine.enums import Denomination
+from vending_machine.errors import CannotMakeChange, OutOfStock
+from vending_machine.inventory import Inventory
+from vending_machine.machine import VendingMachine
+from vending_machine.models import Product, Slot
+
+THREADS = 16
+STOCK = 500  # units per slot
+PRICES = (65, 85, 120, 135, 150, 175, 195, 90)
+FLOAT = {Denomination.C25: 4_000, Denomination.C10: 2_000, Denomination.C5: 2_000, Denomination.C1: 2_000}
+
+
+def build_machine() -> VendingMachine:
+    inv = Inventory({f"A{i}": Slot(Product(f"A{i}", f"Item {i}", p), STOCK) for i, p in enumerate(PRICES)})
+    return VendingMachine(CashDrawer(dict(FLOAT)), inv)
+
+
+def shopper(vm: VendingMachine, seed: int, results: list) -> None:
+    rng = random.Random(seed)
+    session = vm.open_session()
+    codes = list(vm.inventory.slots)
+    units = sold = refunded = refused = 0
+    while codes:
+        code = rng.choice(codes)
+        price = vm.inventory.get_price(code)
+        if rng.random() < 0.5:
+            session.insert_money((Denomination.C100, -(-price // 100)))
+        else:
+            session.insert_money((Denomination.C25, -(-price // 25)))
+        try:
+            session.select_product(code)
+        except (OutOfStock, CannotMakeChange) as exc:
+            refunded += session.cancel()["REFUND"]
+            refused += 1
+            if isinstance(exc, OutOfStock) or rng.random() < 0.1:
+                codes.remove(code)  # sold out, or give up waiting for change
+            continue
+        session.dispense()
+        session.dispense()
+        units += 1
+        sold += price
+    results.append((units, sold, refunded, refused))
+
+
+def main() -> None:
+    vm = build_machine()
+    start_cash = vm.drawer.total_amount()
+    results: list = []
+    sys.setswitchinterval(1e-4)  # interleave sessions far more often than by default
+    workers = [threading.Thread(target=shopper, args=(vm, seed, results)) for seed in range(THREADS)]
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - started
+
+    units, revenue, refunded, refused = (sum(col) for col in zip(*results))
+    slots = vm.inventory.slots.values()
+    left = sum(s.quantity for s in slots)
+    stock_ok = units + left == STOCK * len(PRICES) and all(s.reserved == 0 for s in slots)
+    cash_ok = vm.drawer.total_amount() == start_cash + revenue + refunded  # refunds are manual
+    revenue_ok = revenue == sum(s.product.price_cents * (STOCK - s.quantity) for s in slots)
+    print(f"threads={THREADS} sold={units} left={left} refused={refused} "
+          f"elapsed={elapsed:.2f}s throughput={units / elapsed:,.0f} sales/s")
+    print(f"stock={'OK' if stock_ok else 'OVERSOLD'} cash={'OK' if cash_ok else 'MISMATCH'} "
+          f"revenue={'OK' if revenue_ok else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
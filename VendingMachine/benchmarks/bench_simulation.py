@@ -0,0 +1,64 @@
+"""Headless load run of a simulated purchase stream, with a JSON baseline.
+
+Run from the VendingMachine folder:
+    python -m benchmarks.bench_simulation [-n 1000000] [--save baseline.json]
+    python -m benchmarks.bench_simulation --baseline baseline.json [--tolerance 0.1]
+Reports transactions/s (machine time only), latency percentiles, outcome
+counts, allocated blocks still alive after the run and, with --trace, the
+tracemalloc peak of a shorter run. With --baseline the exit status is 1 if
+throughput, p50/p99 or retained blocks regressed beyond the tolerance.
+"""
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+from dataclasses import asdict
+from vending_machine.simulation import Scenario, compare, simulate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--transactions", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="PATH", help="write this run as a baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    parser.add_argument("--trace", type=int, default=0, metavar="N",
+                        help="also report the tracemalloc peak over N transactions")
+    args = parser.parse_args()
+
+    scenario = Scenario(seed=args.seed)
+    result = simulate(args.transactions, scenario)
+    summary = result.summary()
+    summary["scenario"] = json.loads(json.dumps(asdict(scenario)))  # as it reads back from disk
+    summary["python"] = platform.python_version()
+    if args.trace:
+        tracemalloc.start()
+        simulate(args.trace, scenario)
+        summary["trace_peak_kib"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+
+    print(f"transactions={summary['transactions']:,} tps={summary['tps']:,.0f}")
+    print("latency us: " + " ".join(f"{k[:-3]}={summary[k]}" for k in
+                                    ("p50_us", "p90_us", "p99_us", "p999_us", "max_us")))
+    print("outcomes: " + " ".join(f"{k}={v}" for k, v in summary["outcomes"].items()))
+    print(f"blocks_retained={summary['blocks_retained']}"
+          + (f" trace_peak={summary['trace_peak_kib']}KiB" if args.trace else ""))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"baseline saved to {args.save}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems = compare(summary, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            sys.exit(1)
+        print(f"no regression vs {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
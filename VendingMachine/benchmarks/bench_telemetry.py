@@ -0,0 +1,82 @@
+"""Fleet queries: polling every machine's admin_status() vs. FleetAggregator.
+
+Run from the VendingMachine folder:  python -m benchmarks.bench_telemetry [machines]
+Vends a batch of sales across the fleet, then times the "cash by denomination,
+low stock, top sellers" dashboard both ways.
+"""
+import random
+import sys
+import time
+from collections import Counter
+from vending_machine.cash import CashDrawer
+from vending_machine.enums import Denomination
+from vending_machine.inventory import Inventory
+from vending_machine.machine import VendingMachine
+from vending_machine.models import Product, Slot
+from vending_machine.telemetry import FleetAggregator
+
+MACHINES = 5_000
+SALES = 20_000
+CODES = [f"{row}{col}" for row in "ABCD" for col in range(1, 6)]
+
+
+def build_machine(rng: random.Random) -> VendingMachine:
+    inv = Inventory({c: Slot(Product(c, c, 25 * rng.randint(2, 6)), rng.randint(3, 10)) for c in CODES})
+    return VendingMachine(CashDrawer({d: 20 for d in Denomination}), inv)
+
+
+def poll_dashboard(machines):
+    cash, low = Counter(), []
+    for mid, vm in machines.items():
+        status = vm.admin_status()
+        cash.update(vm.drawer.drawer)
+        for code, qty in status["inventory"].items():
+            if qty <= 2:
+                low.append((mid, code, qty))
+    return cash, sorted(low, key=lambda row: row[2])[:100]
+
+
+def fleet_dashboard(fleet: FleetAggregator):
+    return fleet.cash_by_denomination(), fleet.low_stock(limit=100), fleet.top_sellers(5)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else MACHINES
+    rng = random.Random(0)
+    machines = {f"vm-{i}": build_machine(rng) for i in range(n)}
+    fleet = FleetAggregator()
+    for mid, vm in machines.items():
+        fleet.register(mid, vm)
+
+    ids = list(machines)
+    start = time.perf_counter()
+    for _ in range(SALES):
+        vm = machines[rng.choice(ids)]
+        code = rng.choice(CODES)
+        if not vm.inventory.check_stock(code):
+            continue
+        vm.insert_money((Denomination.C100, 2))
+        vm.select_product(code)
+        vm.dispense()
+        vm.dispense()
+        vm.current_payment.inserted = 0
+    vend_us = (time.perf_counter() - start) / SALES * 1e6
+
+    start = time.perf_counter()
+    poll_dashboard(machines)
+    poll_ms = (time.perf_counter() - start) * 1e3
+    start = time.perf_counter()
+    fleet_dashboard(fleet)  # includes folding the queued deltas
+    first_ms = (time.perf_counter() - start) * 1e3
+    start = time.perf_counter()
+    fleet_dashboard(fleet)
+    fleet_ms = (time.perf_counter() - start) * 1e3
+
+    print(f"machines={n} sales={SALES} vend={vend_us:.1f}us/sale")
+    print(f"{'poll admin_status':>22} | {poll_ms:8.2f} ms")
+    print(f"{'fleet (fold deltas)':>22} | {first_ms:8.2f} ms")
+    print(f"{'fleet (steady)':>22} | {fleet_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
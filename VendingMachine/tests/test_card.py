@@ -0,0 +1,122 @@
+import asyncio
+import pytest
+from vending_machine.card import DECLINED_CARD, AsyncCardPayment, FakeProcessor, ProcessorPool
+from vending_machine.cash import CashDrawer
+from vending_machine.enums import Denomination
+from vending_machine.errors import OutOfStock, PaymentDeclined, PaymentUnavailable
+from vending_machine.inventory import Inventory
+from vending_machine.machine import VendingMachine
+from vending_machine.models import Product, Slot
+
+CARD = "4111111111111111"
+
+
+def build_machine(stock=2):
+    inv = Inventory({"A1": Slot(Product("A1", "Coke", 75), stock), "B1": Slot(Product("B1", "Chips", 50), 5)})
+    return VendingMachine(CashDrawer({Denomination.C25: 10}), inv)
+
+
+def run(scenario, **processor_options):
+    """Run ``scenario(vm, payment, processor)`` against a fresh FakeProcessor."""
+    async def main():
+        processor = FakeProcessor(seed=1, **processor_options)
+        await processor.start()
+        pool = ProcessorPool(*processor.address, size=2, timeout=0.2, retries=3, backoff=0.01)
+        try:
+            return await scenario(build_machine(), AsyncCardPayment(pool), processor)
+        finally:
+            await pool.close()
+            await processor.close()
+    return asyncio.run(main())
+
+
+def test_card_purchase_captures_and_vends():
+    async def scenario(vm, payment, processor):
+        product = await vm.card_purchase("A1", CARD, payment)
+        assert product.name == "Coke"
+        assert vm.inventory.slots["A1"].quantity == 1
+        assert list(processor.captured.values()) == [75] and not processor.holds
+    run(scenario)
+
+
+def test_decline_releases_reserved_unit():
+    async def scenario(vm, payment, processor):
+        with pytest.raises(PaymentDeclined):
+            await vm.card_purchase("A1", DECLINED_CARD, payment)
+        slot = vm.inventory.slots["A1"]
+        assert slot.quantity == 2 and slot.reserved == 0
+    run(scenario)
+
+
+def test_transient_failures_are_retried_without_double_holds():
+    async def scenario(vm, payment, processor):
+        for _ in range(2):
+            await vm.card_purchase("B1", CARD, payment)
+        assert payment.pool.retried > 0
+        assert len(processor.captured) == 2 and not processor.holds
+    run(scenario, failure_rate=0.5)
+
+
+def test_unresponsive_processor_times_out_and_releases():
+    async def scenario(vm, payment, processor):
+        with pytest.raises(PaymentUnavailable):
+            await vm.card_purchase("A1", CARD, payment)
+        assert vm.inventory.slots["A1"].reserved == 0
+    run(scenario, stall_rate=1.0)
+
+
+def test_keypad_keeps_selling_while_authorization_is_in_flight():
+    async def scenario(vm, payment, processor):
+        card = asyncio.create_task(vm.card_purchase("A1", CARD, payment))
+        await asyncio.sleep(0.01)  # preauth in flight, one Coke reserved
+        assert vm.inventory.slots["A1"].reserved == 1
+        vm.insert_money((Denomination.C25, 3))
+        vm.select_product("A1")  # the other Coke
+        vm.dispense()
+        vm.dispense()
+        app = vm.open_session()
+        app.insert_money((Denomination.C25, 3))
+        with pytest.raises(OutOfStock):
+            app.select_product("A1")  # both units spoken for
+        await card
+        assert vm.inventory.slots["A1"].quantity == 0
+    run(scenario, latency=0.05)
+
+
+def test_lost_replies_are_retried_without_double_charges():
+    async def scenario(vm, payment, processor):
+        for _ in range(2):
+            await vm.card_purchase("B1", CARD, payment)
+        assert payment.pool.retried > 0
+        assert sorted(processor.captured) == ["A1", "A2"] and not processor.holds  # one hold per sale
+    run(scenario, drop_rate=0.3)
+
+
+def test_waiting_for_a_connection_is_not_a_timeout():
+    async def main():
+        processor = FakeProcessor(latency=0.05, jitter=0)
+        await processor.start()
+        pool = ProcessorPool(*processor.address, size=1, timeout=0.12, retries=2, backoff=0.01)
+        payment = AsyncCardPayment(pool)
+        try:
+            await asyncio.gather(*(payment.preauthorize(CARD, 75) for _ in range(8)))
+            return pool.retried, len(processor.holds)
+        finally:
+            await pool.close()
+            await processor.close()
+    assert asyncio.run(main()) == (0, 8)
+
+
+def test_cancelled_capture_is_voided_before_the_unit_is_released():
+    async def scenario(vm, payment, processor):
+        purchase = asyncio.create_task(vm.card_purchase("A1", CARD, payment))
+        while processor.requests < 2:  # preauth answered, capture now in flight
+            await asyncio.sleep(0.005)
+        purchase.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await purchase
+        await asyncio.sleep(0.1)  # let the in-flight capture land, if it does
+        slot = vm.inventory.slots["A1"]
+        assert slot.quantity == 2 and slot.reserved == 0
+        assert not processor.captured and not processor.holds and processor.voided == {"A1"}
+    run(scenario, latency=0.03)
@@ -23,3 +23,38 @@ def test_cannot_make_change():
     cd = CashDrawer({Denomination.C25: 1})
     with pytest.raises(CannotMakeChange):
         cd.make_change(30)
+
+def test_bounded_change_avoids_greedy_dead_end():
+    cd = CashDrawer({Denomination.C25: 1, Denomination.C10: 3})
+    assert cd.can_make_change(30)
+    assert cd.make_change(30) == {Denomination.C10: 3}
+    assert cd.drawer[Denomination.C25] == 1
+
+def test_plan_change_uses_fewest_coins_and_tracks_drawer_version():
+    cd = CashDrawer({Denomination.C25: 1, Denomination.C10: 3, Denomination.C1: 5})
+    assert cd.plan_change(30) == {Denomination.C10: 3}  # not 25 + 5 pennies
+    version = cd.version
+    cd.add(Denomination.C5, 1)
+    assert cd.version > version
+    assert cd.plan_change(30) == {Denomination.C25: 1, Denomination.C5: 1}
+    assert cd.drawer[Denomination.C5] == 1  # planning leaves the drawer alone
+
+def test_non_canonical_denominations():
+    from enum import IntEnum
+    Coin = IntEnum("Coin", {"C1": 1, "C3": 3, "C4": 4})
+    cd = CashDrawer({Coin.C1: 2, Coin.C3: 2, Coin.C4: 1})
+    assert cd.plan_change(6) == {Coin.C3: 2}  # greedy would pay 4 + 1 + 1
+    assert cd.can_make_change(12) and not cd.can_make_change(13)
+
+def test_feasibility_bitset_and_exact_change_flag():
+    cd = CashDrawer({Denomination.C100: 2})
+    assert cd.exact_change_only
+    assert cd.can_make_change(200) and not cd.can_make_change(25)
+    cd.add(Denomination.C25, 3)
+    cd.add(Denomination.C10, 2)
+    cd.add(Denomination.C5, 1)
+    assert cd.can_make_change(25) and cd.can_make_change(45) and not cd.can_make_change(3)
+    cd.add(Denomination.C1, 4)
+    assert not cd.exact_change_only
+    cd.remove(Denomination.C1, 4)
+    assert cd.exact_change_only and not cd.can_make_change(4)
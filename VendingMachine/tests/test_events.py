@@ -0,0 +1,68 @@
+import asyncio
+import threading
+from vending_machine.cash import CashDrawer
+from vending_machine.enums import Denomination
+from vending_machine.events import Crossing, EventStream
+from vending_machine.inventory import Inventory
+from vending_machine.machine import VendingMachine
+from vending_machine.models import Product, Slot
+
+
+def build_machine():
+    inv = Inventory({"A1": Slot(Product("A1", "Coke", 75), 3), "B1": Slot(Product("B1", "Chips", 50), 1)})
+    return VendingMachine(CashDrawer({Denomination.C25: 3}), inv)
+
+
+def buy(vm, code, cash):
+    vm.insert_money(cash)
+    vm.select_product(code)
+    vm.dispense()
+    vm.dispense()
+
+
+def test_slot_thresholds_fire_on_crossings_only():
+    vm = build_machine()
+    stream = EventStream()
+    vm.inventory.watch(stream, low=1, thresholds={"A1": 2})
+    assert [(e.key, e.crossing, e.level) for e in stream.drain()] == [("B1", Crossing.LOW, 1)]
+
+    buy(vm, "A1", (Denomination.C25, 3))  # 3 -> 2: crosses A1's threshold
+    buy(vm, "A1", (Denomination.C25, 3))  # 2 -> 1: already low, no event
+    vm.admin_refill("A1", 5)
+    assert [(e.key, e.crossing, e.level) for e in stream.drain()] == [
+        ("A1", Crossing.LOW, 2), ("A1", Crossing.LOW_CLEARED, 6)]
+
+
+def test_cash_low_and_high_levels():
+    vm = build_machine()
+    events = []
+    vm.drawer.watch(events.append, low={Denomination.C25: 1}, high={Denomination.C100: 2})
+    for _ in range(2):
+        buy(vm, "A1", (Denomination.C100, 1))  # each takes one quarter in change
+    assert [(e.key, e.crossing) for e in events] == [(Denomination.C100, Crossing.HIGH),
+                                                    (Denomination.C25, Crossing.LOW)]
+    vm.drawer.remove(Denomination.C100, 2)  # cash box emptied
+    assert events[-1].crossing is Crossing.HIGH_CLEARED
+
+
+def test_stream_drops_oldest_when_full():
+    stream = EventStream(maxsize=3)
+    for i in range(5):
+        stream.publish(i)
+    assert stream.dropped == 2 and stream.drain() == [2, 3, 4]
+
+
+def test_async_consumer_receives_events_from_vending_thread():
+    vm = build_machine()
+    stream = EventStream()
+    vm.inventory.watch(stream, low=0)
+
+    async def consume():
+        sale = threading.Thread(target=buy, args=(vm, "B1", (Denomination.C25, 2)))
+        sale.start()
+        event = await asyncio.wait_for(stream.get(), timeout=5)
+        sale.join()
+        return event
+
+    event = asyncio.run(consume())
+    assert (event.key, event.crossing, event.level) == ("B1", Crossing.LOW, 0)
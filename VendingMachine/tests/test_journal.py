@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+import pytest
+from vending_machine.cash import CashDrawer
+from vending_machine.enums import Denomination
+from vending_machine.inventory import Inventory
+from vending_machine.journal import BinaryJournal, RecordKind, read_records, replay
+from vending_machine.machine import VendingMachine
+from vending_machine.models import Product, Slot
+
+
+def build_machine(journal):
+    inv = Inventory({
+        "A1": Slot(Product("A1", "Coke", 75), 3),
+        "B1": Slot(Product("B1", "Chips", 50), 2),
+    })
+    return VendingMachine(CashDrawer({Denomination.C25: 4, Denomination.C10: 5}), inv, journal)
+
+
+def test_journal_replays_sales_refunds_and_refills(tmp_path):
+    journal = BinaryJournal(str(tmp_path), batch=4)
+    vm = build_machine(journal)
+    vm.insert_money((Denomination.C100, 1))
+    vm.select_product("A1")
+    vm.dispense()
+    vm.dispense()
+    vm.insert_money((Denomination.C25, 1))
+    vm.cancel()
+    vm.admin_refill("B1", 5)
+    journal.close()
+
+    kinds = [r.kind for r in read_records(str(tmp_path))]
+    assert kinds == [RecordKind.INSERT, RecordKind.SELECT, RecordKind.CHANGE, RecordKind.DISPENSE,
+                     RecordKind.INSERT, RecordKind.REFUND, RecordKind.REFILL]
+    inventory, drawer = replay(str(tmp_path))
+    assert inventory.available_products() == vm.inventory.available_products()
+    assert +drawer.drawer == +vm.drawer.drawer
+
+
+def test_snapshot_and_torn_tail(tmp_path):
+    journal = BinaryJournal(str(tmp_path))
+    vm = build_machine(journal)
+    vm.admin_refill("A1", 1)
+    journal.snapshot(vm.inventory, vm.drawer)
+    vm.admin_refill("A1", 2)
+    journal.close()
+    with open(os.path.join(tmp_path, BinaryJournal.LOG), "ab") as f:
+        f.write(b"\x06\x00")  # crash mid-record
+
+    reopened = BinaryJournal(str(tmp_path))
+    assert reopened.records == 2
+    reopened.close()
+    inventory, _ = replay(str(tmp_path))
+    assert inventory.slots["A1"].quantity == 6
+
+
+def test_records_that_do_not_fit_are_rejected_before_state_changes(tmp_path):
+    journal = BinaryJournal(str(tmp_path))
+    inv = Inventory({"SNACK1": Slot(Product("SNACK1", "Nuts", 50), 3),
+                     "SNACK12345678901": Slot(Product("SNACK12345678901", "Gum", 50), 3),
+                     "SNACK123456789012": Slot(Product("SNACK123456789012", "Mints", 50), 3)})
+    vm = VendingMachine(CashDrawer({Denomination.C25: 4}), inv, journal)
+    vm.admin_refill("SNACK12345678901", 70_000)  # 16 bytes, u32 count: fits
+    with pytest.raises(ValueError):
+        vm.admin_refill("SNACK123456789012", 1)  # 17 bytes: never truncated
+    with pytest.raises(ValueError):
+        vm.admin_refill("SNACK1", 2 ** 32)
+    assert inv.slots["SNACK123456789012"].quantity == 3 and inv.slots["SNACK1"].quantity == 3
+    vm.insert_money((Denomination.C25, 2))
+    vm.select_product("SNACK1")
+    vm.dispense()
+    journal.close()
+    inventory, _ = replay(str(tmp_path))
+    assert inventory.available_products() == inv.available_products()
+
+
+def test_closed_session_restores_reserved_change(tmp_path):
+    journal = BinaryJournal(str(tmp_path))
+    vm = build_machine(journal)
+    vm.insert_money((Denomination.C100, 1))
+    vm.select_product("B1")  # 50 in change reserved
+    vm.close()
+    journal.close()
+    _, drawer = replay(str(tmp_path))
+    assert +drawer.drawer == +vm.drawer.drawer
+
+
+def test_snapshots_during_concurrent_sales_replay_exactly(tmp_path):
+    journal = BinaryJournal(str(tmp_path), batch=8)
+    inv = Inventory({"A1": Slot(Product("A1", "Coke", 75), 400)})
+    vm = VendingMachine(CashDrawer({Denomination.C25: 400}), inv, journal)
+
+    def shopper():
+        session = vm.open_session()
+        for _ in range(50):
+            session.insert_money((Denomination.C100, 1))
+            session.select_product("A1")
+            session.dispense()
+            session.dispense()
+
+    threads = [threading.Thread(target=shopper) for _ in range(4)]
+    for t in threads:
+        t.start()
+    while any(t.is_alive() for t in threads):
+        journal.snapshot(vm.inventory, vm.drawer)
+    for t in threads:
+        t.join()
+    journal.close()
+    inventory, drawer = replay(str(tmp_path))
+    assert inventory.slots["A1"].quantity == 200
+    assert +drawer.drawer == +vm.drawer.drawer
+
+
+def test_replay_rejects_slots_missing_from_the_snapshot(tmp_path):
+    journal = BinaryJournal(str(tmp_path))
+    vm = build_machine(journal)
+    vm.inventory.add_slot(Product("C1", "Gum", 25), 0)  # no record, no snapshot
+    vm.admin_refill("C1", 4)
+    journal.close()
+    with pytest.raises(ValueError, match="C1"):
+        replay(str(tmp_path))
+
+
+def test_idle_journal_syncs_on_interval(tmp_path):
+    journal = BinaryJournal(str(tmp_path), batch=1000, interval=0.02)
+    journal.append(RecordKind.REFILL, "A1", count=1)
+    deadline = time.time() + 2
+    while journal.records == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert [r.code for r in read_records(str(tmp_path))] == ["A1"]
+    journal.close()
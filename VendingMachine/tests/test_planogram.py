@@ -0,0 +1,108 @@
+import sys
+import threading
+import pytest
+from vending_machine.cash import CashDrawer
+from vending_machine.enums import Denomination, StockChange
+from vending_machine.errors import InvalidPlanogram
+from vending_machine.inventory import Inventory
+from vending_machine.journal import BinaryJournal, replay
+from vending_machine.machine import VendingMachine
+from vending_machine.models import Product, Slot
+from vending_machine.planogram import Planogram, SlotPlan
+
+COKE = Product("A1", "Coke", 75)
+
+
+def build_inventory():
+    return Inventory({"A1": Slot(COKE, 2), "A2": Slot(Product("A2", "Pepsi", 85), 4)})
+
+
+def build_machine(journal=None):
+    return VendingMachine(CashDrawer({Denomination.C25: 4}), build_inventory(), journal)
+
+
+def test_apply_updates_prices_products_and_quantities():
+    inv = build_inventory()
+    deltas = []
+    inv.subscribe(lambda code, delta, kind: deltas.append((code, delta, kind)))
+    Planogram([
+        SlotPlan(Product("A1", "Coke", 80), 10),    # price change + restock
+        SlotPlan(Product("A2", "Sprite", 85), 3),   # product swap, fewer units
+        SlotPlan(Product("B1", "Chips", 50), 6),    # new slot
+    ]).apply(inv)
+    assert inv.get_price("A1") == 80 and inv.slots["A1"].quantity == 10
+    assert inv.get_product("A2").name == "Sprite"
+    assert inv.available_products() == {"A1": 10, "A2": 3, "B1": 6}
+    assert deltas == [("A1", 8, StockChange.PLANOGRAM), ("A2", -1, StockChange.PLANOGRAM),
+                      ("B1", 6, StockChange.PLANOGRAM)]
+
+
+def test_invalid_plan_is_rejected_whole():
+    with pytest.raises(InvalidPlanogram, match="A1: listed twice.*B1: quantity"):
+        Planogram([SlotPlan(COKE, 1), SlotPlan(COKE, 2), SlotPlan(Product("B1", "Chips", 50), -1)])
+
+
+def test_fleet_apply_is_all_or_nothing():
+    fleet = [build_machine() for _ in range(3)]
+    fleet[2].inventory.reserve("A1")  # a customer is mid-purchase on the last machine
+    plan = Planogram([SlotPlan(Product("A1", "Coke", 90), 5), SlotPlan(Product("B1", "Chips", 50), 6)])
+    with pytest.raises(InvalidPlanogram, match="machine 2: A1"):
+        plan.apply_fleet(fleet)
+    assert all(vm.inventory.get_price("A1") == 75 and "B1" not in vm.inventory.slots for vm in fleet)
+
+    fleet[2].inventory.release("A1")
+    plan.apply_fleet(fleet)
+    assert all(vm.inventory.get_price("A1") == 90 and vm.inventory.slots["B1"].quantity == 6 for vm in fleet)
+    assert fleet[0].inventory.get_product("B1") is fleet[2].inventory.get_product("B1")
+
+
+def test_machine_planogram_survives_replay(tmp_path):
+    journal = BinaryJournal(str(tmp_path))
+    vm = build_machine(journal)
+    vm.admin_apply_planogram(Planogram([SlotPlan(Product("A1", "Coke", 100), 7)]))
+    vm.insert_money((Denomination.C100, 1))
+    vm.select_product("A1")
+    vm.dispense()
+    journal.close()
+    inventory, _ = replay(str(tmp_path))
+    assert inventory.get_price("A1") == 100 and inventory.slots["A1"].quantity == 6
+
+
+def test_fleet_planogram_survives_replay(tmp_path):
+    fleet = [build_machine(BinaryJournal(str(tmp_path / str(i)))) for i in range(3)]
+    for vm in fleet:
+        vm.admin_refill("A2", 1)  # in the log before the plan
+    Planogram([SlotPlan(Product("A1", "Coke", 100), 9), SlotPlan(Product("B1", "Chips", 50), 5)]).apply_fleet(fleet)
+    for vm in fleet:
+        vm.insert_money((Denomination.C100, 1))
+        vm.select_product("A1")
+        vm.dispense()
+        vm.dispense()
+        vm.journal.close()
+    for i, vm in enumerate(fleet):
+        inventory, drawer = replay(str(tmp_path / str(i)))
+        assert inventory.available_products() == vm.inventory.available_products() == {"A1": 8, "A2": 5, "B1": 5}
+        assert inventory.get_price("A1") == 100 and inventory.get_product("B1").name == "Chips"
+        assert +drawer.drawer == +vm.drawer.drawer
+
+
+def test_concurrent_fleet_applies_in_opposite_order_do_not_deadlock():
+    fleet = [build_machine() for _ in range(8)]
+    plans = [Planogram([SlotPlan(COKE, n), SlotPlan(Product("B1", "Chips", 50), n)]) for n in (3, 5)]
+
+    def apply(plan, machines):
+        for _ in range(200):
+            plan.apply_fleet(machines)
+
+    threads = [threading.Thread(target=apply, args=(plans[0], fleet), daemon=True),
+               threading.Thread(target=apply, args=(plans[1], fleet[::-1]), daemon=True)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads mid-acquire as often as possible
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=10)
+    finally:
+        sys.setswitchinterval(interval)
+    assert not any(t.is_alive() for t in threads)
@@ -0,0 +1,87 @@
+import sys
+import threading
+import pytest
+from vending_machine.cash import CashDrawer
+from vending_machine.enums import Denomination
+from vending_machine.errors import CannotMakeChange, OutOfStock
+from vending_machine.inventory import Inventory
+from vending_machine.machine import VendingMachine
+from vending_machine.models import Product, Slot
+from vending_machine.state import HasMoneyState, IdleState
+
+
+def build_machine(stock=1, drawer=None):
+    inv = Inventory({"A1": Slot(Product("A1", "Coke", 75), stock)})
+    return VendingMachine(CashDrawer(drawer or {Denomination.C25: 10}), inv)
+
+
+def test_selection_reserves_last_unit():
+    vm = build_machine(stock=1)
+    app = vm.open_session()
+    vm.insert_money((Denomination.C25, 3))
+    app.insert_money((Denomination.C25, 3))
+
+    vm.select_product("A1")
+    with pytest.raises(OutOfStock):
+        app.select_product("A1")
+
+    assert vm.close() == {"REFUND": 75}  # keypad walks away: unit goes back
+    assert isinstance(vm.state, IdleState)
+    app.select_product("A1")
+    assert app.dispense().name == "Coke"
+    assert vm.inventory.slots["A1"].quantity == 0
+
+
+def test_selection_reserves_change_coins():
+    vm = build_machine(stock=5, drawer={Denomination.C25: 1})
+    app = vm.open_session()
+    vm.insert_money((Denomination.C100, 1))
+    vm.select_product("A1")  # takes the only quarter
+    app.insert_money((Denomination.C100, 1))
+    with pytest.raises(CannotMakeChange):
+        app.select_product("A1")
+    assert isinstance(app.state, HasMoneyState)
+    assert vm.inventory.slots["A1"].reserved == 1
+
+    vm.dispense()
+    assert vm.dispense() == {Denomination.C25: 1}
+    assert vm.current_payment.inserted == 0
+
+
+def test_concurrent_sessions_never_oversell():
+    stock, threads, attempts = 50, 8, 20
+    vm = build_machine(stock=stock, drawer={Denomination.C25: 1000})
+    start_cash = vm.drawer.total_amount()
+    sold, refunded, lock = [], [], threading.Lock()
+
+    def shopper():
+        session = vm.open_session()
+        for _ in range(attempts):
+            session.insert_money((Denomination.C100, 1))
+            try:
+                session.select_product("A1")
+            except OutOfStock:
+                with lock:
+                    refunded.append(session.cancel()["REFUND"])
+                continue
+            product = session.dispense()
+            change = session.dispense()
+            with lock:
+                sold.append((product.price_cents, sum(d * n for d, n in change.items())))
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        workers = [threading.Thread(target=shopper) for _ in range(threads)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    slot = vm.inventory.slots["A1"]
+    assert len(sold) == stock and slot.quantity == 0 and slot.reserved == 0
+    assert all(price + change == 100 for price, change in sold)
+    # refunds are handed back by hand, so their coins stay in the drawer
+    assert vm.drawer.total_amount() == start_cash + 75 * stock + sum(refunded)
@@ -0,0 +1,28 @@
+from vending_machine.enums import Denomination
+from vending_machine.simulation import Outcome, PayStyle, Scenario, build_machine, compare, pay, simulate
+
+
+def test_pay_styles():
+    assert pay(135, PayStyle.EXACT) == ((Denomination.C25, 5), (Denomination.C10, 1))
+    assert pay(135, PayStyle.QUARTERS) == ((Denomination.C25, 6),)
+    assert pay(135, PayStyle.BILLS) == ((Denomination.C100, 2),)
+    assert pay(135, PayStyle.BILL_AND_COINS) == ((Denomination.C100, 1), (Denomination.C25, 2))
+
+
+def test_simulation_is_reproducible_and_covers_every_outcome():
+    scenario = Scenario(seed=3)
+    vm = build_machine(scenario)
+    first = simulate(3_000, scenario, vm)
+    assert first.outcomes == simulate(3_000, scenario).outcomes
+    assert sum(first.outcomes.values()) == 3_000
+    assert all(first.outcomes[o] for o in Outcome)
+    assert all(s.quantity >= 0 and s.reserved == 0 for s in vm.inventory.slots.values())
+    assert vm.current_payment.inserted == 0
+
+
+def test_compare_flags_regressions():
+    base = simulate(500).summary()
+    assert compare(base, base) == []
+    slower = dict(base, tps=base["tps"] * 0.5, p99_us=base["p99_us"] * 2)
+    problems = compare(slower, base)
+    assert any(p.startswith("tps") for p in problems) and any(p.startswith("p99_us") for p in problems)
@@ -1,10 +1,12 @@
-from vending_machine.state import IdleState, HasMoneyState, DispenseState, ChangeState
+import pytest
+from vending_machine.state import IDLE, TRANSITIONS, IdleState, HasMoneyState, DispenseState, ChangeState
 from vending_machine.cash import CashDrawer
 from vending_machine.payment import CashPayment
 from vending_machine.models import Product, Slot
 from vending_machine.inventory import Inventory
 from vending_machine.machine import VendingMachine
-from vending_machine.enums import Denomination
+from vending_machine.enums import Action, Denomination, StateType
+from vending_machine.errors import CannotMakeChange, NotInRightState
 
 
 def build_machine():
@@ -34,3 +36,26 @@ def test_state_transitions():
     change = vm.dispense()  # triggers ChangeState.dispense()
     assert isinstance(change, dict)
     assert isinstance(vm.state, IdleState)
+
+
+def test_select_refused_when_change_cannot_be_returned():
+    vm = VendingMachine(CashDrawer(), Inventory({"A1": Slot(Product("A1", "Coke", 75), 3)}))
+    vm.insert_money((Denomination.C100, 1))
+    with pytest.raises(CannotMakeChange):
+        vm.select_product("A1")
+    assert isinstance(vm.state, HasMoneyState)
+    assert vm.inventory.slots["A1"].quantity == 3
+
+
+def test_states_are_shared_and_dispatched_by_table():
+    a, b = build_machine(), build_machine()
+    assert a.state is b.state is a.idle_state is IDLE
+    assert not hasattr(a, "__dict__") and not hasattr(a.inventory.slots["A1"], "__dict__")
+    assert len(TRANSITIONS) == len(StateType) * len(Action)
+
+    a.insert_money((Denomination.C25, 4))
+    assert isinstance(a.state, HasMoneyState) and isinstance(b.state, IdleState)
+    with pytest.raises(NotInRightState):
+        b.dispense()
+    TRANSITIONS[StateType.HAS_MONEY, Action.CANCEL](a)
+    assert a.state is IDLE and a.current_payment.inserted == 0
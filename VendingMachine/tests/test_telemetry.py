@@ -0,0 +1,90 @@
+import sys
+import threading
+import pytest
+from vending_machine.cash import CashDrawer
+from vending_machine.enums import Denomination
+from vending_machine.inventory import Inventory
+from vending_machine.machine import VendingMachine
+from vending_machine.models import Product, Slot
+from vending_machine.planogram import Planogram, SlotPlan
+from vending_machine.telemetry import FleetAggregator
+
+
+def build_machine(coke: int = 3):
+    inv = Inventory({
+        "A1": Slot(Product("A1", "Coke", 75), coke),
+        "B1": Slot(Product("B1", "Chips", 50), 5),
+    })
+    return VendingMachine(CashDrawer({Denomination.C25: 10}), inv)
+
+
+def buy(vm, code, quarters):
+    vm.insert_money((Denomination.C25, quarters))
+    vm.select_product(code)
+    vm.dispense()
+    vm.dispense()
+
+
+def test_fleet_aggregates_deltas_without_polling():
+    fleet = FleetAggregator(low_stock=1)
+    machines = {"vm-0": build_machine(coke=2), "vm-1": build_machine(), "vm-2": build_machine()}
+    for mid, vm in machines.items():
+        fleet.register(mid, vm)
+    assert fleet.cash_by_denomination()[Denomination.C25] == 30
+
+    buy(machines["vm-0"], "A1", 3)
+    buy(machines["vm-1"], "A1", 4)  # one quarter back as change
+    buy(machines["vm-2"], "B1", 2)
+
+    assert fleet.cash_by_denomination()[Denomination.C25] == 30 + 3 + 3 + 2
+    assert fleet.machine_cash("vm-1") == machines["vm-1"].drawer.total_amount()
+    assert fleet.total_cash() == sum(vm.drawer.total_amount() for vm in machines.values())
+    assert fleet.top_sellers(1) == [("A1", 2)]
+    assert fleet.low_stock() == [("vm-0", "A1", 1)]
+
+    machines["vm-0"].admin_refill("A1", 5)
+    assert fleet.low_stock() == []
+    assert fleet.top_sellers() == [("A1", 2), ("B1", 1)]
+
+
+def test_planogram_cuts_are_not_sales():
+    fleet = FleetAggregator()
+    vm = build_machine(coke=10)
+    fleet.register("vm-0", vm)
+    vm.admin_apply_planogram(Planogram([SlotPlan(Product("A1", "Coke", 75), 4)]))
+    assert fleet.top_sellers() == []
+    buy(vm, "A1", 3)
+    assert fleet.top_sellers() == [("A1", 1)]
+    assert fleet.low_stock() == []
+
+
+def test_register_during_sales_loses_no_deltas():
+    vm = build_machine(coke=400)
+    vm.drawer.add(Denomination.C25, 400)
+    stop = threading.Event()
+
+    def shopper():
+        session = vm.open_session()
+        while not stop.is_set():
+            session.insert_money((Denomination.C25, 4))
+            session.select_product("A1")
+            session.dispense()
+            session.dispense()
+
+    thread = threading.Thread(target=shopper)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        thread.start()
+        fleets = [FleetAggregator(low_stock=1_000) for _ in range(50)]  # every slot listed with its quantity
+        for fleet in fleets:
+            fleet.register("vm-0", vm)
+        stop.set()
+        thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    for fleet in fleets:
+        assert fleet.machine_cash("vm-0") == vm.drawer.total_amount()
+        assert fleet.low_stock() == [("vm-0", code, qty) for code, qty in vm.inventory.available_products().items()]
+    with pytest.raises(ValueError):
+        fleets[0].register("vm-0", build_machine())
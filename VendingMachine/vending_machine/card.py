@@ -0,0 +1,205 @@
+import asyncio
+import itertools
+import json
+import random
+import uuid
+from typing import Any, Dict, List, Optional, Set, Tuple
+from .errors import PaymentDeclined, PaymentUnavailable
+
+# Wire protocol: one JSON object per line in each direction.
+#   {"op": "preauth", "request_id": "...", "card": "4111...", "amount": 125}
+#       -> {"ok": true, "auth_id": "A1"}
+#   {"op": "capture", "request_id": "...", "auth_id": "A1", "amount": 125} -> {"ok": true}
+#   {"op": "void", "request_id": "...", "auth_id": "A1"}                  -> {"ok": true}
+# A void releases the hold, or reverses the capture if there was one.
+# Failures come back as {"ok": false, "error": "...", "retry": bool}; retry
+# marks transient ones. A repeated request_id gets the first answer again, so
+# retrying after a lost reply never holds or captures twice.
+
+DECLINED_CARD = "4000000000000002"  # the fake processor declines this card every time
+
+
+class FakeProcessor:
+    """Local stand-in for a card processor, for tests and benchmarks.
+
+    Every request waits ``latency`` (+ up to ``jitter``) seconds. Then, with
+    the given probabilities, it fails transiently (``failure_rate``), never
+    answers (``stall_rate``; the client has to time out) or, for preauth,
+    is declined (``decline_rate``). With ``drop_rate`` the request is applied
+    but the reply is lost (the connection drops), so only an idempotent retry
+    avoids a second hold or capture. Holds, captures and voids are kept in
+    ``holds`` / ``captured`` / ``voided`` for assertions.
+    """
+    def __init__(self, latency: float = 0.02, jitter: float = 0.01, failure_rate: float = 0.0,
+                 stall_rate: float = 0.0, decline_rate: float = 0.0, drop_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.stall_rate = stall_rate
+        self.decline_rate = decline_rate
+        self.drop_rate = drop_rate
+        self.holds: Dict[str, int] = {}
+        self.captured: Dict[str, int] = {}
+        self.voided: Set[str] = set()
+        self.requests = 0
+        self._answers: Dict[str, Dict[str, Any]] = {}
+        self._rng = random.Random(seed)
+        self._auth_ids = itertools.count(1)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: Set[asyncio.Task] = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = await asyncio.start_server(self._handle, host, port)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self) -> None:
+        self._server.close()
+        for task in list(self._handlers):
+            task.cancel()
+        await self._server.wait_closed()
+
+    # ---------------- Request Handling ---------------- #
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            while line := await reader.readline():
+                response = await self._respond(json.loads(line))
+                if response is None:
+                    break  # applied, but the reply is lost with the connection
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._handlers.discard(task)
+            writer.close()
+
+    async def _respond(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        self.requests += 1
+        rng = self._rng
+        await asyncio.sleep(self.latency + rng.uniform(0, self.jitter))
+        if rng.random() < self.stall_rate:
+            await asyncio.Event().wait()  # never answers; the client times out and hangs up
+        if rng.random() < self.failure_rate:
+            return {"ok": False, "error": "processor unavailable", "retry": True}
+        answer = self._answers.get(request["request_id"])
+        if answer is None:
+            answer = self._answers[request["request_id"]] = self._apply(request)
+        if self.drop_rate and rng.random() < self.drop_rate:
+            return None
+        return answer
+
+    def _apply(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        op = request.get("op")
+        if op == "preauth":
+            if request["card"] == DECLINED_CARD or self._rng.random() < self.decline_rate:
+                return {"ok": False, "error": "declined", "retry": False}
+            auth_id = f"A{next(self._auth_ids)}"
+            self.holds[auth_id] = request["amount"]
+            return {"ok": True, "auth_id": auth_id}
+        if op == "capture":
+            held = self.holds.get(request["auth_id"])
+            if held is None or request["amount"] > held:
+                return {"ok": False, "error": "no matching authorization", "retry": False}
+            del self.holds[request["auth_id"]]
+            self.captured[request["auth_id"]] = request["amount"]
+            return {"ok": True}
+        if op == "void":
+            self.holds.pop(request["auth_id"], None)
+            self.captured.pop(request["auth_id"], None)  # not settled yet: the capture is reversed
+            self.voided.add(request["auth_id"])
+            return {"ok": True}
+        return {"ok": False, "error": f"Unknown op {op!r}", "retry": False}
+
+
+class ProcessorPool:
+    """Up to ``size`` pooled connections to a processor, with timeouts and jittered retries.
+
+    A request waits for a free connection slot first and keeps it through
+    its retries, so time spent queueing never counts against the processor
+    and a retry never queues again behind newer requests. Each attempt
+    (connect if needed, send, read the reply) must then finish within
+    ``timeout`` seconds; a connection that timed out or broke is discarded.
+    Transient failures are retried up to ``retries`` times after a random
+    sleep in [0, backoff * 2**n) ("full jitter"), so a burst of machines
+    retrying after a processor hiccup does not arrive in lockstep. Declines
+    raise PaymentDeclined at once; giving up raises PaymentUnavailable.
+    """
+    def __init__(self, host: str, port: int, size: int = 4, timeout: float = 0.5,
+                 retries: int = 3, backoff: float = 0.05):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.retried = 0  # attempts beyond the first, over the pool's lifetime
+        self._slots = asyncio.Semaphore(size)
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def request(self, **payload) -> Dict[str, Any]:
+        payload.setdefault("request_id", uuid.uuid4().hex)
+        async with self._slots:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    self.retried += 1
+                    await asyncio.sleep(random.uniform(0, self.backoff * 2 ** (attempt - 1)))
+                try:
+                    response = await asyncio.wait_for(self._attempt(payload), self.timeout)
+                except (asyncio.TimeoutError, ConnectionError, OSError) as e:
+                    error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+                    continue
+                if response["ok"]:
+                    return response
+                if not response.get("retry"):
+                    raise PaymentDeclined(response["error"])
+                error = response["error"]
+        raise PaymentUnavailable(f"{payload['op']} failed after {self.retries + 1} attempts ({error})")
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    async def _attempt(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """One round trip; the caller holds a slot."""
+        conn, healthy = None, False
+        try:
+            conn = self._idle.pop() if self._idle else await asyncio.open_connection(self.host, self.port)
+            reader, writer = conn
+            writer.write(json.dumps(payload).encode() + b"\n")
+            await writer.drain()
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("processor closed the connection")
+            healthy = True
+            return json.loads(line)
+        finally:
+            if conn is not None:
+                if healthy:
+                    self._idle.append(conn)
+                else:
+                    conn[1].close()  # may have a late reply in flight: never reuse it
+
+
+class AsyncCardPayment:
+    """Card payments over a ProcessorPool: pre-authorize, then capture or void."""
+    def __init__(self, pool: ProcessorPool):
+        self.pool = pool
+
+    async def preauthorize(self, card: str, amount: int) -> str:
+        """Hold ``amount`` on the card; returns the authorization id."""
+        response = await self.pool.request(op="preauth", card=card, amount=amount)
+        return response["auth_id"]
+
+    async def capture(self, auth_id: str, amount: int) -> None:
+        await self.pool.request(op="capture", auth_id=auth_id, amount=amount)
+
+    async def void(self, auth_id: str) -> None:
+        """Release the hold on ``auth_id``, reversing its capture if it went through."""
+        await self.pool.request(op="void", auth_id=auth_id)
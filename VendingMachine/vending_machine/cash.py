@@ -1,69 +1,229 @@
-from collections import Counter
-from typing import Dict
-from .enums import Denomination, CANONICAL_DESC
+import threading
+from collections import Counter, deque
+from typing import Callable, Dict, List, Optional, Tuple
+from .enums import Denomination
 from .errors import CannotMakeChange
+from .events import LevelEvent, LevelWatcher
+
+_INF = float("inf")
+
+
+class _ChangeTable:
+    """Bounded min-coin DP over amounts 0..limit for one drawer version.
+
+    ``coins[v]`` is the fewest coins paying v exactly (inf if impossible) and
+    ``take[i][v]`` how many of ``denoms[i]`` that solution uses once only the
+    first i+1 denominations are considered, which is enough to walk back.
+    """
+    __slots__ = ("version", "limit", "denoms", "coins", "take")
+
+    def __init__(self, version: int, limit: int, counts: Dict[Denomination, int]):
+        self.version = version
+        self.limit = limit
+        self.denoms: List[Denomination] = sorted(d for d, c in counts.items() if c > 0 and d <= limit)
+        best: List[float] = [0] + [_INF] * limit
+        self.take: List[List[int]] = []
+        for d in self.denoms:
+            cap = min(counts[d], limit // d)
+            new, take = best[:], [0] * (limit + 1)
+            if cap == limit // d:
+                # supply never binds below limit: plain unbounded recurrence
+                for v in range(d, limit + 1):
+                    if new[v - d] + 1 < new[v]:
+                        new[v], take[v] = new[v - d] + 1, take[v - d] + 1
+                best = new
+                self.take.append(take)
+                continue
+            # per residue class r (mod d): new[r + j*d] = min over j-cap <= i <= j of
+            # best[r + i*d] + (j - i), a sliding-window minimum of best[.] - i
+            for r in range(d):
+                window: deque = deque()
+                for j, v in enumerate(range(r, limit + 1, d)):
+                    val = best[v] - j
+                    while window and window[-1][1] >= val:
+                        window.pop()
+                    window.append((j, val))
+                    if window[0][0] < j - cap:
+                        window.popleft()
+                    i, low = window[0]
+                    if low + j < new[v]:
+                        new[v], take[v] = low + j, j - i
+            best = new
+            self.take.append(take)
+        self.coins = best
+
+    def plan(self, amount: int) -> Optional[Dict[Denomination, int]]:
+        if self.coins[amount] == _INF:
+            return None
+        change: Dict[Denomination, int] = {}
+        for i in range(len(self.denoms) - 1, -1, -1):
+            use = self.take[i][amount]
+            if use:
+                change[self.denoms[i]] = use
+                amount -= self.denoms[i] * use
+        return change
 
 
 class CashDrawer:
-    """Manages all cash-in and change operations for the vending machine."""
+    """Manages all cash-in and change operations for the vending machine.
+
+    Change is planned by an exact bounded-knapsack search: the fewest coins
+    that pay the amount with the coins actually in the drawer, for any set of
+    denominations (canonical or not). ``version`` is bumped on every
+    add/remove; one DP table per version answers all amounts up to its limit,
+    so checking and then dispensing change for a sale plans only once.
 
-    def __init__(self, initial: Dict[Denomination, int] | None = None):
+    Feasibility of amounts 0..``change_limit`` is kept as a bitset (bit v set
+    iff v is payable), updated on `add` by shift-or and rebuilt on `remove`,
+    so `can_make_change` in that range and ``exact_change_only`` are O(1).
+    ``exact_change_only`` is set while some overpayment below the largest
+    denomination the drawer has held cannot be returned.
+
+    All operations hold one re-entrant lock, so `make_change` plans and
+    removes the coins atomically: concurrent sessions can never both be
+    promised the same coins.
+    """
+    __slots__ = ("drawer", "version", "change_limit", "exact_change_only", "_table",
+                 "_listeners", "_lock", "_mask", "_payable", "_largest", "_needed")
+
+    def __init__(self, initial: Dict[Denomination, int] | None = None, change_limit: int = 500):
         # store counts of each denomination
         self.drawer: Counter = Counter(initial or {})
+        self.version = 0
+        self.change_limit = change_limit
+        self.exact_change_only = True
+        self._table: Optional[_ChangeTable] = None
+        self._listeners: Tuple[Callable[[Denomination, int], None], ...] = ()
+        self._lock = threading.RLock()
+        self._mask = (1 << (change_limit + 1)) - 1
+        self._payable = 1  # only 0 until the rebuild below
+        self._largest = self._needed = 0
+        self._rebuild_payable()
 
     # ---------------- Core Ops ---------------- #
 
     def add(self, denom: Denomination, count: int = 1) -> None:
         """Add coins/bills into drawer."""
-        self.drawer[denom] += count
+        with self._lock:
+            self.drawer[denom] += count
+            self.version += 1
+            if denom > self._largest:
+                self._set_largest(denom)
+            if self._payable != self._mask:  # once every amount is payable, more coins change nothing
+                self._payable = self._with_coins(self._payable, denom, count)
+                self._refresh_exact_change()
+            for listener in self._listeners:
+                listener(denom, count)
 
     def remove(self, denom: Denomination, count: int = 1) -> None:
         """Remove coins/bills; raises if insufficient."""
-        if self.drawer[denom] < count:
-            raise CannotMakeChange(f"Not enough {denom.name} to remove")
-        self.drawer[denom] -= count
+        with self._lock:
+            if self.drawer[denom] < count:
+                raise CannotMakeChange(f"Not enough {denom.name} to remove")
+            self.drawer[denom] -= count
+            self.version += 1
+            self._rebuild_payable()
+            for listener in self._listeners:
+                listener(denom, -count)
+
+    def subscribe(self, listener: Callable[[Denomination, int], None]) -> None:
+        """Call ``listener(denom, delta)`` after every add (+) / remove (-)."""
+        with self._lock:
+            self._listeners += (listener,)  # copy-on-write: no per-drawer list until needed
+
+    def unsubscribe(self, listener: Callable[[Denomination, int], None]) -> None:
+        with self._lock:
+            self._listeners = tuple(l for l in self._listeners if l is not listener)
+
+    def watch(self, emit: Callable[[LevelEvent], None], low: Optional[Dict[Denomination, int]] = None,
+              high: Optional[Dict[Denomination, int]] = None) -> LevelWatcher:
+        """Emit events as coin counts cross per-denomination thresholds.
+
+        ``low`` flags a starved float (LOW / LOW_CLEARED), ``high`` a cash box
+        that needs emptying (HIGH / HIGH_CLEARED). Checked inside `add` /
+        `remove` for the denomination that changed; levels already past a
+        threshold are reported now.
+        """
+        watcher = LevelWatcher("cash", self.drawer.__getitem__, emit, low_by_key=low, high_by_key=high)
+        with self._lock:
+            watcher.current(set(low or ()) | set(high or ()))
+            self.subscribe(watcher)
+        return watcher
 
     def total_amount(self) -> int:
         """Return total value in cents."""
         return sum(denom * cnt for denom, cnt in self.drawer.items())
 
     def can_make_change(self, amount: int) -> bool:
-        """Greedy check — true if we can make change with current coins."""
-        try:
-            _ = self._greedy_change(amount, dry_run=True)
-            return True
-        except CannotMakeChange:
-            return False
-        
+        """True if the current coins can pay ``amount`` exactly."""
+        if amount <= self.change_limit:
+            return bool(self._payable >> amount & 1)
+        with self._lock:
+            return self._change_table(amount).coins[amount] != _INF
+
+    def plan_change(self, amount: int) -> Dict[Denomination, int]:
+        """Minimum-coin change for ``amount`` without touching the drawer."""
+        if amount == 0:
+            return {}
+        with self._lock:
+            change = self._change_table(amount).plan(amount)
+        if change is None:
+            raise CannotMakeChange(f"Cannot make exact change for {amount}¢")
+        return change
+
     def make_change(self, amount: int) -> Dict[Denomination, int]:
         """Dispense change; updates drawer."""
-        change = self._greedy_change(amount)
-        for denom, cnt in change.items():
-            self.remove(denom, cnt)
+        with self._lock:
+            change = self.plan_change(amount)
+            for denom, cnt in change.items():
+                self.remove(denom, cnt)
         return change
 
+    def restore(self, coins: Dict[Denomination, int]) -> None:
+        """Put back coins taken by `make_change` for a sale that did not happen."""
+        with self._lock:
+            for denom, cnt in coins.items():
+                self.add(denom, cnt)
+
     # ---------------- Helpers ---------------- #
 
-    def _greedy_change(self, amount: int, dry_run: bool = False) -> Dict[Denomination, int]:
-        """Return minimal coins using greedy algorithm (assumes canonical set)."""
-        remaining = amount
-        change: Dict[Denomination, int] = {}
+    def _with_coins(self, payable: int, denom: int, count: int) -> int:
+        """Payable set after adding ``count`` coins of ``denom`` (bundles of 1, 2, 4, ...)."""
+        if count == 1:
+            return (payable | payable << denom) & self._mask
+        count = min(count, self.change_limit // denom)
+        bundle = 1
+        while count > 0:
+            take = min(bundle, count)
+            payable |= payable << (denom * take)
+            count -= take
+            bundle <<= 1
+        return payable & self._mask
 
-        for denom in CANONICAL_DESC:
-            if remaining <= 0:
-                break
-            use = min(remaining // denom, self.drawer.get(denom, 0))
-            if use > 0:
-                change[denom] = use
-                remaining -= denom * use
+    def _rebuild_payable(self) -> None:
+        payable = 1
+        for denom, count in self.drawer.items():
+            if count > 0:
+                payable = self._with_coins(payable, denom, count)
+        self._payable = payable
+        self._set_largest(max(self.drawer, default=0))  # denominations seen, even if now empty
 
-        if remaining > 0:
-            raise CannotMakeChange(f"Cannot make exact change for {amount}¢")
+    def _set_largest(self, largest: int) -> None:
+        self._largest = largest
+        self._needed = (1 << min(largest, self.change_limit + 1)) - 1  # amounts 0 .. largest-1
+        self._refresh_exact_change()
 
-        if dry_run:
-            return change
+    def _refresh_exact_change(self) -> None:
+        needed = self._needed
+        self.exact_change_only = not needed or self._payable & needed != needed
 
-        return change
+    def _change_table(self, amount: int) -> _ChangeTable:
+        """DP table for the current version covering ``amount`` (built on demand)."""
+        table = self._table
+        if table is None or table.version != self.version or table.limit < amount:
+            limit = amount if table is None or table.version != self.version else max(amount, table.limit)
+            table = self._table = _ChangeTable(self.version, limit, self.drawer)
+        return table
 
     def __repr__(self) -> str:
         return f"CashDrawer(total={self.total_amount()}¢, coins={dict(self.drawer)})"
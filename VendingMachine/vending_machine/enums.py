@@ -14,3 +14,16 @@ class StateType(str, Enum):
     HAS_MONEY = "HAS_MONEY"
     DISPENSE = "DISPENSE"
     CHANGE = "CHANGE"
+
+class StockChange(str, Enum):
+    """Why a slot's quantity changed; passed to Inventory listeners."""
+    VEND = "VEND"            # one unit sold (dispense / commit)
+    RESTOCK = "RESTOCK"      # refill or add_slot
+    PLANOGRAM = "PLANOGRAM"  # set by a planogram, up or down
+
+class Action(str, Enum):
+    """Customer actions a state handles; values are the handler method names."""
+    INSERT_MONEY = "insert_money"
+    SELECT_PRODUCT = "select_product"
+    DISPENSE = "dispense"
+    CANCEL = "cancel"
@@ -4,3 +4,6 @@ class OutOfStock(VMError): ...
 class InsufficientFunds(VMError): ...
 class CannotMakeChange(VMError): ...
 class NotInRightState(VMError): ...
+class InvalidPlanogram(VMError): ...
+class PaymentDeclined(VMError): ...
+class PaymentUnavailable(VMError): ...
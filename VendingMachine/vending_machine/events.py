@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional
+
+
+class Crossing(str, Enum):
+    LOW = "LOW"                    # level fell to or below its low threshold
+    LOW_CLEARED = "LOW_CLEARED"    # back above it
+    HIGH = "HIGH"                  # level rose to or above its high threshold
+    HIGH_CLEARED = "HIGH_CLEARED"  # back below it
+
+
+class LevelEvent(NamedTuple):
+    source: str        # "inventory" or "cash"
+    key: Hashable      # slot code or Denomination
+    crossing: Crossing
+    level: int         # quantity / coin count after the change
+    threshold: int
+    timestamp: float
+
+
+class LevelWatcher:
+    """Turns ``(key, delta)`` change notifications into threshold-crossing events.
+
+    Installed as an Inventory / CashDrawer listener (see their `watch`), so it
+    runs inside the mutation that changed the level and looks only at the key
+    that changed: the level before is ``level - delta``, and an event is
+    emitted only when a threshold lies between the two. Keys without their
+    own threshold use ``low`` / ``high``; None disables that side.
+    """
+    __slots__ = ("source", "level_of", "emit", "low", "high", "low_by_key", "high_by_key", "_sides")
+
+    def __init__(self, source: str, level_of: Callable[[Hashable], int], emit: Callable[[LevelEvent], None],
+                 low: Optional[int] = None, high: Optional[int] = None,
+                 low_by_key: Optional[Dict] = None, high_by_key: Optional[Dict] = None):
+        self.source = source
+        self.level_of = level_of
+        self.emit = emit
+        self.low = low
+        self.high = high
+        self.low_by_key = low_by_key or {}
+        self.high_by_key = high_by_key or {}
+        self._sides = (low is not None or bool(self.low_by_key), high is not None or bool(self.high_by_key))
+
+    def __call__(self, key: Hashable, delta: int, kind=None) -> None:  # kind: why stock changed (ignored)
+        level = self.level_of(key)
+        before = level - delta
+        watch_low, watch_high = self._sides
+        low = self.low_by_key.get(key, self.low) if watch_low else None
+        if low is not None:
+            if before > low >= level:
+                self._emit(key, Crossing.LOW, level, low)
+            elif before <= low < level:
+                self._emit(key, Crossing.LOW_CLEARED, level, low)
+        high = self.high_by_key.get(key, self.high) if watch_high else None
+        if high is not None:
+            if before < high <= level:
+                self._emit(key, Crossing.HIGH, level, high)
+            elif before >= high > level:
+                self._emit(key, Crossing.HIGH_CLEARED, level, high)
+
+    def current(self, keys) -> None:
+        """Emit LOW / HIGH for ``keys`` already past a threshold (once, when watching starts)."""
+        for key in keys:
+            level = self.level_of(key)
+            low = self.low_by_key.get(key, self.low)
+            if low is not None and level <= low:
+                self._emit(key, Crossing.LOW, level, low)
+            high = self.high_by_key.get(key, self.high)
+            if high is not None and level >= high:
+                self._emit(key, Crossing.HIGH, level, high)
+
+    def _emit(self, key, crossing, level, threshold) -> None:
+        self.emit(LevelEvent(self.source, key, crossing, level, threshold, time.time()))
+
+
+class EventStream:
+    """Bounded hand-off of events from vending threads to one asyncio consumer.
+
+    `publish` (also the instance's ``__call__``, so a stream can be passed
+    straight to `watch`) never blocks or waits for the consumer: when
+    ``maxsize`` events are pending the oldest is dropped and counted in
+    ``dropped``, so a slow dashboard can lose events but never stall a sale.
+    Consume with ``await stream.get()`` or ``async for event in stream``.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._events: deque = deque()
+        self._lock = threading.Lock()
+        self._waiter: Optional[asyncio.Future] = None
+
+    def publish(self, event) -> None:
+        with self._lock:
+            if len(self._events) >= self.maxsize:
+                self._events.popleft()
+                self.dropped += 1
+            self._events.append(event)
+            waiter, self._waiter = self._waiter, None
+        if waiter is not None:  # a consumer is parked in get(): wake it on its loop
+            waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+
+    __call__ = publish
+
+    async def get(self):
+        """Next event, waiting for one if none is pending."""
+        while True:
+            with self._lock:
+                if self._events:
+                    return self._events.popleft()
+                waiter = self._waiter = asyncio.get_running_loop().create_future()
+            await waiter
+
+    def drain(self) -> List:
+        """All pending events, without waiting."""
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+        return events
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.get()
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
@@ -1,29 +1,70 @@
-from typing import Dict
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .enums import StockChange
 from .models import Slot, Product
 from .errors import InvalidSelection, OutOfStock
+from .events import LevelEvent, LevelWatcher
 
 
 class Inventory:
-    """Manages product slots and stock counts."""
+    """Manages product slots and stock counts.
+
+    Every stock change takes that slot's own lock, so sessions buying
+    different products never contend. `reserve` / `commit` / `release` let a
+    session hold one unit between selection and dispense. Slot locks are
+    created on first use, so idle machines in a large fleet hold none.
+    """
+    __slots__ = ("slots", "_listeners", "_locks")
 
     def __init__(self, slots: Dict[str, Slot] | None = None):
         # Keyed by product code like "A1", "B2"
         self.slots: Dict[str, Slot] = slots or {}
+        self._listeners: Tuple[Callable[[str, int, StockChange], None], ...] = ()
+        self._locks: Dict[str, threading.Lock] = {}  # code -> lock, filled by `_lock`
 
     # ---------------- Admin Ops ---------------- #
 
     def add_slot(self, product: Product, quantity: int) -> None:
         """Add a new slot or refill an existing one."""
         code = product.code
-        if code in self.slots:
-            self.slots[code].quantity += quantity
-        else:
-            self.slots[code] = Slot(product, quantity)
+        with self._lock(code):
+            if code in self.slots:
+                self.slots[code].quantity += quantity
+            else:
+                self.slots[code] = Slot(product, quantity)
+            self._notify(code, quantity, StockChange.RESTOCK)
 
     def refill(self, code: str, quantity: int) -> None:
         if code not in self.slots:
             raise InvalidSelection(f"Slot {code} not found")
-        self.slots[code].quantity += quantity
+        with self._lock(code):
+            self.slots[code].quantity += quantity
+            self._notify(code, quantity, StockChange.RESTOCK)
+
+    def subscribe(self, listener: Callable[[str, int, StockChange], None]) -> None:
+        """Call ``listener(code, delta, kind)`` after every stock change.
+
+        ``kind`` tells sales (`StockChange.VEND`, delta -1) from restocks and
+        planogram adjustments, which may also lower a quantity.
+        """
+        self._listeners += (listener,)  # copy-on-write: no per-inventory list until needed
+
+    def unsubscribe(self, listener: Callable[[str, int, StockChange], None]) -> None:
+        self._listeners = tuple(l for l in self._listeners if l is not listener)
+
+    def watch(self, emit: Callable[[LevelEvent], None], low: Optional[int] = 2,
+              thresholds: Optional[Dict[str, int]] = None) -> LevelWatcher:
+        """Emit LOW / LOW_CLEARED events as slot quantities cross their threshold.
+
+        ``thresholds`` sets it per code, ``low`` for the rest. Checked on each
+        stock change for that slot only; slots already low are reported now.
+        Pass the returned watcher to `unsubscribe` to stop.
+        """
+        watcher = LevelWatcher("inventory", lambda code: self.slots[code].quantity, emit,
+                               low=low, low_by_key=thresholds)
+        watcher.current(list(self.slots))
+        self.subscribe(watcher)
+        return watcher
 
     # ---------------- User Ops ---------------- #
 
@@ -47,9 +88,35 @@ class Inventory:
         if code not in self.slots:
             raise InvalidSelection(f"Invalid code {code}")
         slot = self.slots[code]
-        if not slot.has_stock():
-            raise OutOfStock(f"Product {code} is out of stock")
-        slot.dispense_one()
+        with self._lock(code):
+            if not slot.has_stock():
+                raise OutOfStock(f"Product {code} is out of stock")
+            slot.dispense_one()
+            self._notify(code, -1, StockChange.VEND)
+        return slot.product
+
+    def reserve(self, code: str) -> None:
+        """Hold one unit for a pending sale; raises OutOfStock if none is free."""
+        if code not in self.slots:
+            raise InvalidSelection(f"Invalid code {code}")
+        slot = self.slots[code]
+        with self._lock(code):
+            if not slot.has_stock():
+                raise OutOfStock(f"Product {code} is out of stock")
+            slot.reserved += 1
+
+    def release(self, code: str) -> None:
+        """Give back a unit held by `reserve` (sale abandoned)."""
+        with self._lock(code):
+            self.slots[code].reserved -= 1
+
+    def commit(self, code: str) -> Product:
+        """Dispense a unit held by `reserve`."""
+        slot = self.slots[code]
+        with self._lock(code):
+            slot.reserved -= 1
+            slot.dispense_one()
+            self._notify(code, -1, StockChange.VEND)
         return slot.product
 
     # ---------------- Diagnostics ---------------- #
@@ -58,5 +125,34 @@ class Inventory:
         """Return {code: quantity} for available items."""
         return {c: s.quantity for c, s in self.slots.items()}
 
+    def _lock(self, code: str) -> threading.Lock:
+        lock = self._locks.get(code)
+        if lock is None:
+            lock = self._locks.setdefault(code, threading.Lock())  # setdefault is atomic
+        return lock
+
+    def _slot_locks(self, codes: Iterable[str]) -> List[threading.Lock]:
+        """Locks of ``codes`` in sorted code order, the order to acquire them in."""
+        return [self._lock(code) for code in sorted(codes)]
+
+    def _load(self, rows: Iterable[Tuple[Product, int]]) -> None:
+        """Set each slot's product and quantity (caller holds the locks; see `Planogram`)."""
+        slots, notify = self.slots, self._listeners and self._notify
+        for product, quantity in rows:
+            slot = slots.get(product.code)
+            if slot is None:
+                slots[product.code] = Slot(product, quantity)
+                delta = quantity
+            else:
+                slot.product = product  # shared with every machine the plan went to
+                delta = quantity - slot.quantity
+                slot.quantity = quantity
+            if delta and notify:
+                notify(product.code, delta, StockChange.PLANOGRAM)
+
+    def _notify(self, code: str, delta: int, kind: StockChange) -> None:
+        for listener in self._listeners:
+            listener(code, delta, kind)
+
     def __repr__(self) -> str:
         return f"Inventory({self.available_products()})"
@@ -0,0 +1,286 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from contextlib import nullcontext
+from enum import IntEnum
+from typing import ContextManager, Dict, Iterator, NamedTuple, Optional, Tuple
+from .cash import CashDrawer
+from .enums import Denomination
+from .inventory import Inventory
+from .models import Product, Slot
+
+# One record = 32 bytes, little endian:
+#   kind u8 | pad 3 | count u32 | code 16s (ASCII, NUL padded) | value i32 | unix time u32
+CODE_SIZE = 16  # longest slot code a record can hold; longer codes are rejected, never cut
+RECORD = struct.Struct(f"<BxxxI{CODE_SIZE}siI")
+_NO_TIME = struct.Struct(f"<BxxxI{CODE_SIZE}si4x")  # same layout, timestamp skipped (for replay)
+
+
+class RecordKind(IntEnum):
+    INSERT = 1    # value = denomination, count = how many
+    SELECT = 2    # code, value = price
+    DISPENSE = 3  # code, value = price
+    CHANGE = 4    # value = denomination, count = how many left the drawer
+    REFUND = 5    # value = cents handed back
+    REFILL = 6    # code, count = units added
+    RESTORE = 7   # value = denomination, count = reserved change put back (session closed)
+
+
+class JournalRecord(NamedTuple):
+    kind: RecordKind
+    code: str
+    value: int
+    count: int
+    timestamp: int
+
+
+class Journal(ABC):
+    """Abstract sink for the transaction records emitted by machine states.
+
+    Callers `pack` a record before changing any state, so a record that
+    cannot be encoded fails the action instead of leaving a change that was
+    never logged, then make the change and `write` the record while holding
+    ``lock``; a `snapshot` taken under the same lock sees every change
+    together with its record or neither.
+    """
+    lock: ContextManager = nullcontext()
+
+    def pack(self, kind: RecordKind, code: str = "", value: int = 0, count: int = 0) -> Optional[bytes]:
+        """Encode one record (None if this journal keeps nothing); raises ValueError if it does not fit."""
+        return None
+
+    @abstractmethod
+    def write(self, *records: Optional[bytes]) -> None:
+        pass
+
+    def append(self, kind: RecordKind, code: str = "", value: int = 0, count: int = 0) -> None:
+        self.write(self.pack(kind, code, value, count))
+
+    def snapshot(self, inventory: Inventory, drawer: CashDrawer) -> None:
+        pass
+
+    def has_snapshot(self) -> bool:
+        return True
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class NullJournal(Journal):
+    """Default journal: records nothing."""
+
+    def write(self, *records):
+        pass
+
+    def append(self, kind, code="", value=0, count=0):
+        pass
+
+
+NULL_JOURNAL = NullJournal()  # stateless, shared by every machine without a journal
+
+
+class BinaryJournal(Journal):
+    """Append-only log of fixed-size records plus a JSON snapshot, in one directory.
+
+    Records are buffered and written + fsynced in batches of ``batch`` records,
+    and a background thread syncs whatever is buffered every ``interval``
+    seconds, so a crash loses at most one batch or one interval, even on an
+    idle machine. A torn record at the tail is dropped when the journal is
+    reopened. `snapshot` stores full inventory and drawer state together with
+    the number of log records it covers; `replay` rebuilds both from the
+    snapshot plus the records after it. Safe to share between the sessions of
+    one machine.
+    """
+    LOG = "journal.bin"
+    SNAPSHOT = "snapshot.json"
+
+    def __init__(self, directory: str, batch: int = 256, interval: float = 1.0):
+        self.directory = directory
+        self.batch = batch
+        self.interval = interval
+        os.makedirs(directory, exist_ok=True)
+        self._log_path = os.path.join(directory, self.LOG)
+        self._snapshot_path = os.path.join(directory, self.SNAPSHOT)
+        if os.path.exists(self._log_path):
+            size = os.path.getsize(self._log_path)
+            if size % RECORD.size:
+                os.truncate(self._log_path, size - size % RECORD.size)  # torn tail
+        self._log = open(self._log_path, "ab")
+        self.records = self._log.tell() // RECORD.size  # records on disk
+        self._buffer = bytearray()
+        self._buffered = 0
+        self.lock = threading.RLock()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="journal-flusher", daemon=True)
+        self._flusher.start()
+
+    def pack(self, kind: RecordKind, code: str = "", value: int = 0, count: int = 0) -> bytes:
+        encoded = code.encode("ascii")
+        if len(encoded) > CODE_SIZE:
+            raise ValueError(f"Slot code {code!r} is longer than the {CODE_SIZE} bytes a journal record holds")
+        try:
+            return RECORD.pack(kind, count, encoded, value, int(time.time()))
+        except struct.error as e:
+            raise ValueError(f"{RecordKind(kind).name} record out of range (value={value}, count={count}): {e}") from None
+
+    def write(self, *records: bytes) -> None:
+        with self.lock:
+            for record in records:
+                self._buffer += record
+            self._buffered += len(records)
+            if self._buffered >= self.batch:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write and fsync everything buffered so far."""
+        with self.lock:
+            if self._buffer:
+                self._log.write(self._buffer)
+                self._log.flush()
+                os.fsync(self._log.fileno())
+                self.records += self._buffered
+                self._buffer.clear()
+                self._buffered = 0
+
+    def has_snapshot(self) -> bool:
+        return os.path.exists(self._snapshot_path)
+
+    def snapshot(self, inventory: Inventory, drawer: CashDrawer) -> None:
+        """Persist full state as of the current end of the log.
+
+        The record count and the state are read under ``lock``, which every
+        journaled change holds until its record is written, so no change can
+        land in the state and also after the counted records.
+        """
+        with self.lock:
+            self.flush()
+            state = {
+                "records": self.records,
+                "drawer": {str(int(d)): n for d, n in dict(drawer.drawer).items()},
+                "slots": {
+                    code: [slot.product.name, slot.product.price_cents, slot.quantity]
+                    for code, slot in dict(inventory.slots).items()
+                },
+            }
+        tmp = self._snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._snapshot_path)
+
+    def close(self) -> None:
+        self._closed.set()
+        self._flusher.join()
+        self.flush()
+        self._log.close()
+
+    def _flush_loop(self) -> None:
+        while not self._closed.wait(self.interval):
+            self.flush()
+
+
+# ---------------- Readback & Replay ---------------- #
+
+def _mapped(path: str):
+    """Read-only mmap of whole records in ``path`` (None if there are none)."""
+    if not os.path.exists(path):
+        return None
+    size = os.path.getsize(path)
+    size -= size % RECORD.size
+    if size == 0:
+        return None
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+
+
+def read_records(directory: str, start: int = 0) -> Iterator[JournalRecord]:
+    """Iterate the log from record ``start`` (sales history, reconciliation)."""
+    mapped = _mapped(os.path.join(directory, BinaryJournal.LOG))
+    if mapped is None:
+        return
+    view = memoryview(mapped)[start * RECORD.size:]
+    records = RECORD.iter_unpack(view)
+    try:
+        for kind, count, code, value, ts in records:
+            yield JournalRecord(RecordKind(kind), code.rstrip(b"\0").decode("ascii"), value, count, ts)
+    finally:
+        del records  # drop the buffer export before unmapping
+        view.release()
+        mapped.close()
+
+
+def _denomination(value: int):
+    try:
+        return Denomination(value)
+    except ValueError:
+        return value  # drawers may hold non-standard denominations
+
+
+def replay(directory: str) -> Tuple[Inventory, CashDrawer]:
+    """Rebuild Inventory and CashDrawer from the snapshot plus the log after it.
+
+    Identical records (ignoring their timestamps) are counted together at C
+    speed first, so replay cost is dominated by one pass of `iter_unpack`.
+    Raises ValueError if the log refers to a slot the snapshot does not have.
+    """
+    with open(os.path.join(directory, BinaryJournal.SNAPSHOT), encoding="utf-8") as f:
+        state = json.load(f)
+    cash: Counter = Counter({_denomination(int(d)): n for d, n in state["drawer"].items()})
+    stock: Dict[str, int] = {code: qty for code, (_, _, qty) in state["slots"].items()}
+
+    mapped = _mapped(os.path.join(directory, BinaryJournal.LOG))
+    if mapped is not None:
+        try:
+            view = memoryview(mapped)[state["records"] * RECORD.size:]
+            tally = Counter(_NO_TIME.iter_unpack(view))
+            view.release()
+        finally:
+            mapped.close()
+        for (kind, count, code, value), times in tally.items():
+            if kind == RecordKind.INSERT:
+                cash[_denomination(value)] += count * times
+            elif kind == RecordKind.CHANGE:
+                cash[_denomination(value)] -= count * times
+            elif kind == RecordKind.RESTORE:
+                cash[_denomination(value)] += count * times
+            elif kind == RecordKind.DISPENSE:
+                code = code.rstrip(b"\0").decode("ascii")
+                stock[code] = stock.get(code, 0) - times
+            elif kind == RecordKind.REFILL:
+                code = code.rstrip(b"\0").decode("ascii")
+                stock[code] = stock.get(code, 0) + count * times
+
+    inventory = Inventory({
+        code: Slot(Product(code, name, price), stock.pop(code))
+        for code, (name, price, _) in state["slots"].items()
+    })
+    if stock:
+        # no record creates a slot; one added without a snapshot cannot be rebuilt
+        raise ValueError(f"Log has records for slot(s) {', '.join(sorted(stock))} "
+                         f"that are not in the snapshot; take a snapshot after adding slots")
+    return inventory, CashDrawer(+cash)
+
+
+def main() -> None:
+    """python -m vending_machine.journal <directory>: print the replayed state."""
+    if len(sys.argv) != 2:
+        sys.exit("usage: python -m vending_machine.journal <journal directory>")
+    started = time.perf_counter()
+    inventory, drawer = replay(sys.argv[1])
+    print(f"replayed in {time.perf_counter() - started:.3f}s")
+    print(inventory)
+    print(drawer)
+
+
+if __name__ == "__main__":
+    main()
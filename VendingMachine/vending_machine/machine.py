@@ -1,63 +1,94 @@
+import asyncio
 from typing import Optional
-from .state import IdleState, HasMoneyState, DispenseState, ChangeState, State
-from .payment import CashPayment
+from .session import Session
+from .card import AsyncCardPayment
 from .cash import CashDrawer
+from .errors import PaymentDeclined, VMError
 from .inventory import Inventory
-from .enums import Denomination
-
-
-class VendingMachine:
-    """Main orchestrator class controlling flow via State Pattern."""
-
-    def __init__(self, drawer: CashDrawer, inventory: Inventory):
-        self.drawer = drawer
-        self.inventory = inventory
-
-        # Payment strategy (default cash)
-        self.current_payment: CashPayment = CashPayment(self.drawer)
-
-        # State instances (singletons per machine)
-        self.idle_state = IdleState(self)
-        self.has_money_state = HasMoneyState(self)
-        self.dispense_state = DispenseState(self)
-        self.change_state = ChangeState(self)
-
-        # Initialize state
-        self.state: State = self.idle_state
-
-        # For tracking transaction data
-        self.selected_code: Optional[str] = None
-        self.last_dispensed = None
-        self.last_change: Optional[dict] = None
-
-    # ---------------- Core Actions ---------------- #
-
-    def insert_money(self, amount: tuple[Denomination, int]):
-        """Delegate to current state's insert_money logic."""
-        self.state.insert_money(amount)
-
-    def select_product(self, code: str):
-        self.state.select_product(code)
-
-    def dispense(self):
-        """Trigger dispense flow depending on state."""
-        return self.state.dispense()
-
-    def cancel(self):
-        """Cancel current transaction (if applicable)."""
-        return self.state.cancel()
-
-    # ---------------- Internal Helpers ---------------- #
-
-    def transition_to(self, new_state: State):
-        """Switch current state."""
-        self.state = new_state
+from .models import Product
+from .journal import Journal, RecordKind
+from .planogram import Planogram
+
+
+class VendingMachine(Session):
+    """Main orchestrator class controlling flow via State Pattern.
+
+    The machine itself is the keypad session; `open_session` adds more
+    (e.g. app orders) that share its inventory, drawer and journal.
+    """
+    __slots__ = ()
+
+    def __init__(self, drawer: CashDrawer, inventory: Inventory, journal: Optional[Journal] = None):
+        super().__init__(drawer, inventory, journal)
+        # a fresh journal gets a base snapshot to replay from
+        if not self.journal.has_snapshot():
+            self.journal.snapshot(inventory, drawer)
+
+    def open_session(self) -> Session:
+        """New independent transaction against this machine's stock and cash."""
+        return Session(self.drawer, self.inventory, self.journal)
+
+    async def card_purchase(self, code: str, card: str, payment: AsyncCardPayment) -> Product:
+        """Sell one unit of ``code`` by card: reserve, pre-authorize, capture, vend.
+
+        The unit is reserved while the processor round-trips are awaited, so
+        it cannot be sold twice, yet the keypad session (and any other) keeps
+        taking coins and selections meanwhile. Declines, timeouts and
+        cancellation release the unit. If the capture fails in a way that
+        leaves its outcome unknown (timeout, lost reply, cancellation) the
+        authorization is voided, which also reverses a capture that did go
+        through, before the unit goes back on sale; if even the void cannot
+        be confirmed the unit stays reserved until the charge is reconciled.
+        """
+        price = self.inventory.get_price(code)
+        journal = self.journal
+        records = (journal.pack(RecordKind.SELECT, code, price), journal.pack(RecordKind.DISPENSE, code, price))
+        self.inventory.reserve(code)
+        try:
+            auth_id = await payment.preauthorize(card, price)
+        except BaseException:
+            self.inventory.release(code)  # a hold we never heard of is never captured and expires
+            raise
+        try:
+            await payment.capture(auth_id, price)
+        except PaymentDeclined:
+            await asyncio.shield(self._void_hold(code, payment, auth_id, charged=False))
+            raise
+        except BaseException:
+            # shielded: a second cancellation must not cut the void short
+            await asyncio.shield(self._void_hold(code, payment, auth_id, charged=True))
+            raise
+        with journal.lock:
+            product = self.inventory.commit(code)
+            journal.write(*records)
+        return product
+
+    async def _void_hold(self, code: str, payment: AsyncCardPayment, auth_id: str, charged: bool) -> None:
+        """Void ``auth_id`` and release the unit; ``charged`` if the capture may have gone through."""
+        try:
+            await payment.void(auth_id)
+        except VMError:
+            if charged:
+                return  # the customer may have paid: keep the unit off sale
+            # an uncaptured hold expires on its own
+        self.inventory.release(code)
 
     # ---------------- Admin Utilities ---------------- #
 
     def admin_refill(self, code: str, qty: int):
         """Refill a slot (admin)."""
-        self.inventory.refill(code, qty)
+        record = self.journal.pack(RecordKind.REFILL, code, count=qty)
+        with self.journal.lock:
+            self.inventory.refill(code, qty)
+            self.journal.write(record)
+
+    def admin_apply_planogram(self, planogram: Planogram) -> None:
+        """Restock/re-price the whole machine in one validated pass (all or nothing).
+
+        Product and price changes have no journal record, so the plan and a
+        fresh snapshot are taken together under the journal lock.
+        """
+        planogram.apply_fleet([self])
 
     def admin_status(self) -> dict:
         """Diagnostics — available stock & total cash."""
@@ -66,6 +97,3 @@ class VendingMachine:
             "inventory": self.inventory.available_products(),
             "drawer_total": self.drawer.total_amount(),
         }
-
-    def __repr__(self):
-        return f"<VendingMachine state={type(self.state).__name__} balance={self.current_payment.inserted}¢>"
@@ -1,21 +1,22 @@
 from dataclasses import dataclass
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Product:
     code: str
     name: str
     price_cents: int
 
-@dataclass
+@dataclass(slots=True)
 class Slot:
     product: Product
     quantity: int = 0
+    reserved: int = 0  # units held by sessions that selected but have not dispensed yet
 
     def has_stock(self) -> bool:
-        return self.quantity > 0
+        return self.quantity > self.reserved
 
     def dispense_one(self) -> None:
         if not self.has_stock():
             from .errors import OutOfStock
             raise OutOfStock(f"{self.product.code} is out of stock")
-        self.quantity -= 1
\ No newline at end of file
+        self.quantity -= 1
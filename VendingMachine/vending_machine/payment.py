@@ -1,5 +1,4 @@
 from abc import ABC, abstractmethod
-from typing import Optional
 from .cash import CashDrawer
 from .enums import Denomination
 from .errors import InsufficientFunds, CannotMakeChange
@@ -7,6 +6,7 @@ from .errors import InsufficientFunds, CannotMakeChange
 
 class PaymentMethod(ABC):
     """Abstract strategy for payments."""
+    __slots__ = ()
 
     @abstractmethod
     def pay(self, amount_due: int) -> bool:
@@ -25,6 +25,7 @@ class PaymentMethod(ABC):
 
 class CashPayment(PaymentMethod):
     """Implements payment via coins/bills."""
+    __slots__ = ("drawer", "inserted")
 
     def __init__(self, drawer: CashDrawer):
         self.drawer = drawer
@@ -41,23 +42,14 @@ class CashPayment(PaymentMethod):
         # Payment succeeds, any extra change handled externally
         return True
 
-    def compute_change(self, amount_due: int) -> Optional[dict]:
-        """Compute change (without updating drawer)."""
+    def reserve_change(self, amount_due: int) -> dict:
+        """Atomically take the change for ``amount_due`` out of the drawer."""
         if self.inserted < amount_due:
             raise InsufficientFunds(f"Need {amount_due - self.inserted}¢ more")
         change = self.inserted - amount_due
         if change == 0:
             return {}
-        if not self.drawer.can_make_change(change):
-            raise CannotMakeChange(f"Cannot return {change}¢ in change")
-        return self.drawer._greedy_change(change, dry_run=True)
-
-    def dispense_change(self, amount_due: int) -> dict:
-        """Actually dispense change and update drawer."""
-        change_amount = self.inserted - amount_due
-        if change_amount <= 0:
-            return {}
-        return self.drawer.make_change(change_amount)
+        return self.drawer.make_change(change)
 
     def refund(self) -> dict:
         """Refund full amount inserted."""
@@ -74,7 +66,8 @@ class CashPayment(PaymentMethod):
 # -------------------------------------------------------------------- #
 
 class CardPayment(PaymentMethod):
-    """Stub for card-based payment system."""
+    """Stub for card-based payment system (see `card.AsyncCardPayment` for the real path)."""
+    __slots__ = ("charged",)
 
     def __init__(self):
         self.charged = False
@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+from .cash import CashDrawer
+from .errors import InvalidPlanogram
+from .inventory import Inventory
+from .journal import Journal, NULL_JOURNAL
+from .models import Product
+
+
+@dataclass(frozen=True)
+class SlotPlan:
+    """Target for one slot: the product (code, name, price) and units after the visit."""
+    product: Product
+    quantity: int
+
+
+class Planogram:
+    """A route driver's restock plan: new slots, product/price changes and quantities.
+
+    Slots not listed are left as they are. The plan itself is validated once,
+    here; `apply` / `apply_fleet` then hold every affected slot lock, check
+    what depends on each machine (units reserved by open sessions) and only
+    write if nothing failed, so a machine is never left half restocked.
+    Inventory listeners see each slot's net change in quantity, as
+    `StockChange.PLANOGRAM` (never as sales, even when a quantity drops).
+    """
+
+    def __init__(self, slots: Iterable[SlotPlan]):
+        self.slots: List[SlotPlan] = sorted(slots, key=lambda s: s.product.code)
+        self.codes = [s.product.code for s in self.slots]
+        self._rows = [(s.product, s.quantity) for s in self.slots]
+        problems = []
+        for prev, code in zip([None] + self.codes, self.codes):
+            if code == prev:
+                problems.append(f"{code}: listed twice")
+        for plan in self.slots:
+            if plan.product.price_cents <= 0:
+                problems.append(f"{plan.product.code}: price must be positive")
+            if plan.quantity < 0:
+                problems.append(f"{plan.product.code}: quantity must not be negative")
+        if problems:
+            raise InvalidPlanogram("; ".join(problems))
+
+    def apply(self, inventory: Inventory) -> None:
+        """Apply to one bare (unjournaled) inventory, all or nothing; raises InvalidPlanogram."""
+        self._apply([(inventory, None, NULL_JOURNAL)])
+
+    def apply_fleet(self, machines: Sequence) -> None:
+        """Apply to every machine or to none; raises InvalidPlanogram listing all conflicts.
+
+        ``machines`` are VendingMachines (anything with ``inventory``,
+        ``drawer`` and ``journal``). Product and price changes have no
+        journal record, so each journaled machine takes a snapshot while its
+        journal lock is still held: no sale can land between the plan and
+        the snapshot, and replay starts from the planned state.
+
+        The plan is compiled (validated, sorted, products built) once for the
+        whole fleet and its Product objects are shared between machines, so
+        each extra machine costs one pass of slot writes.
+        """
+        self._apply([(m.inventory, m.drawer, m.journal) for m in machines])
+
+    def _apply(self, targets: List[Tuple[Inventory, Optional[CashDrawer], Journal]]) -> None:
+        # One global lock order (journals by id, then machines by id, then
+        # slots by code; sales take a journal lock before slot locks too), so
+        # concurrent fleet applies over overlapping fleets cannot deadlock.
+        unique = [target for _, target in sorted({id(t[0]): t for t in targets}.items())]
+        journals = sorted({id(j): j for _, _, j in unique if j is not NULL_JOURNAL}.items())
+        locks = [journal.lock for _, journal in journals]
+        locks += [lock for inventory, _, _ in unique for lock in inventory._slot_locks(self.codes)]
+        taken = 0
+        try:
+            for lock in locks:
+                lock.acquire()
+                taken += 1
+            problems = [f"machine {i}: {problem}"
+                        for i, (inventory, _, _) in enumerate(targets) for problem in self.conflicts(inventory)]
+            if problems:
+                raise InvalidPlanogram("; ".join(problems))
+            rows = self._rows
+            for inventory, _, _ in unique:
+                inventory._load(rows)
+            for inventory, drawer, journal in unique:
+                journal.snapshot(inventory, drawer)
+        finally:
+            for lock in reversed(locks[:taken]):
+                lock.release()
+
+    def conflicts(self, inventory: Inventory) -> List[str]:
+        """Why this plan cannot be applied to ``inventory`` right now (empty if it can)."""
+        problems = []
+        slots = inventory.slots
+        for plan in self.slots:
+            slot = slots.get(plan.product.code)
+            if slot is None or not slot.reserved:
+                continue
+            if slot.product != plan.product:
+                problems.append(f"{plan.product.code}: product or price changed with {slot.reserved} unit(s) reserved")
+            elif plan.quantity < slot.reserved:
+                problems.append(f"{plan.product.code}: {slot.reserved} unit(s) reserved, plan leaves {plan.quantity}")
+        return problems
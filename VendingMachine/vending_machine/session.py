@@ -0,0 +1,95 @@
+from typing import Optional
+from .state import IDLE, HAS_MONEY, DISPENSE, CHANGE, ROWS, State
+from .payment import CashPayment
+from .cash import CashDrawer
+from .inventory import Inventory
+from .enums import Action, Denomination
+from .journal import Journal, NULL_JOURNAL, RecordKind
+
+_INSERT_MONEY = ROWS[Action.INSERT_MONEY]
+_SELECT_PRODUCT = ROWS[Action.SELECT_PRODUCT]
+_DISPENSE = ROWS[Action.DISPENSE]
+_CANCEL = ROWS[Action.CANCEL]
+
+
+class Session:
+    """One customer's transaction (payment + state) against shared stock and cash.
+
+    Several sessions may run concurrently on one machine, e.g. app orders next
+    to the physical keypad. Selecting a product reserves one unit of stock and
+    takes the change out of the drawer atomically, so concurrent sessions can
+    never oversell; `dispense` then commits the reservation. A session itself
+    is driven by one thread at a time.
+
+    Sessions are slotted and share the stateless `State` singletons; actions
+    dispatch through `state.ROWS` (the `state.TRANSITIONS` table as one row
+    per action, indexed by `State.index`) rather than through methods looked
+    up on the current state.
+    """
+    __slots__ = ("drawer", "inventory", "journal", "current_payment", "state",
+                 "selected_code", "reserved_change", "last_dispensed", "last_change")
+
+    # State instances (shared by all sessions)
+    idle_state = IDLE
+    has_money_state = HAS_MONEY
+    dispense_state = DISPENSE
+    change_state = CHANGE
+
+    def __init__(self, drawer: CashDrawer, inventory: Inventory, journal: Optional[Journal] = None):
+        self.drawer = drawer
+        self.inventory = inventory
+        self.journal: Journal = journal or NULL_JOURNAL
+
+        # Payment strategy (default cash)
+        self.current_payment: CashPayment = CashPayment(self.drawer)
+
+        # Initialize state
+        self.state: State = IDLE
+
+        # For tracking transaction data
+        self.selected_code: Optional[str] = None
+        self.reserved_change: Optional[dict] = None  # coins held for the selected product
+        self.last_dispensed = None
+        self.last_change: Optional[dict] = None
+
+    # ---------------- Core Actions ---------------- #
+
+    def insert_money(self, amount: tuple[Denomination, int]):
+        """Delegate to current state's insert_money logic."""
+        _INSERT_MONEY[self.state.index](self, amount)
+
+    def select_product(self, code: str):
+        _SELECT_PRODUCT[self.state.index](self, code)
+
+    def dispense(self):
+        """Trigger dispense flow depending on state."""
+        return _DISPENSE[self.state.index](self)
+
+    def cancel(self):
+        """Cancel current transaction (if applicable)."""
+        return _CANCEL[self.state.index](self)
+
+    def close(self) -> dict:
+        """Abandon the session: release any reservation and refund what was inserted."""
+        if self.state is DISPENSE:
+            self.inventory.release(self.selected_code)
+            journal = self.journal
+            coins = self.reserved_change or {}
+            with journal.lock:
+                self.drawer.restore(coins)
+                journal.write(*[journal.pack(RecordKind.RESTORE, value=denom, count=count)
+                                for denom, count in coins.items()])
+            self.reserved_change = None
+            self.transition_to(HAS_MONEY)
+        if self.state is HAS_MONEY:
+            return self.cancel()
+        return {}
+
+    # ---------------- Internal Helpers ---------------- #
+
+    def transition_to(self, new_state: State):
+        """Switch current state."""
+        self.state = new_state
+
+    def __repr__(self):
+        return f"<{type(self).__name__} state={type(self.state).__name__} balance={self.current_payment.inserted}¢>"
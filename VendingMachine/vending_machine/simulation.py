@@ -0,0 +1,231 @@
+import gc
+import itertools
+import random
+import sys
+import time
+from array import array
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, Iterator, List, Optional, Tuple
+from .cash import CashDrawer
+from .enums import CANONICAL_DESC, Denomination
+from .errors import CannotMakeChange, OutOfStock
+from .inventory import Inventory
+from .machine import VendingMachine
+from .models import Product, Slot
+
+Coins = Tuple[Tuple[Denomination, int], ...]
+
+
+class Outcome(str, Enum):
+    SOLD = "SOLD"
+    CANCELLED = "CANCELLED"
+    OUT_OF_STOCK = "OUT_OF_STOCK"
+    NO_CHANGE = "NO_CHANGE"
+
+
+class PayStyle(str, Enum):
+    EXACT = "EXACT"          # exact coins, largest first
+    QUARTERS = "QUARTERS"    # quarters rounded up (change < 25¢)
+    BILLS = "BILLS"          # dollar bills rounded up (change < $1)
+    BILL_AND_COINS = "BILL_AND_COINS"  # one bill, quarters for the rest
+
+
+@dataclass
+class Scenario:
+    """Shape of a simulated purchase stream against one machine."""
+    seed: int = 0
+    products: int = 20
+    prices: Tuple[int, ...] = (50, 65, 75, 85, 90, 110, 125, 135, 150, 175, 195)
+    stock: int = 30                # units per slot after each service visit
+    service_every: int = 300       # transactions between service visits
+    popularity: float = 0.8        # Zipf exponent over products (0 = uniform)
+    cancel_rate: float = 0.03
+    pay_mix: Dict[str, float] = field(default_factory=lambda: {
+        PayStyle.EXACT.value: 0.3, PayStyle.QUARTERS.value: 0.3,
+        PayStyle.BILLS.value: 0.25, PayStyle.BILL_AND_COINS.value: 0.15,
+    })
+    coin_float: Dict[int, int] = field(default_factory=lambda: {25: 20, 10: 20, 5: 20, 1: 40})
+
+
+@dataclass(frozen=True)
+class Purchase:
+    code: str
+    coins: Coins
+    cancel: bool = False
+
+
+@dataclass
+class SimulationResult:
+    transactions: int
+    seconds: float                  # time spent inside the machine
+    latencies_ns: array             # per transaction, in stream order
+    outcomes: Dict[Outcome, int]
+    blocks_retained: int            # allocated blocks still alive after the run
+
+    @property
+    def tps(self) -> float:
+        return self.transactions / self.seconds if self.seconds else 0.0
+
+    def percentiles_us(self, *qs: float) -> List[float]:
+        ordered = sorted(self.latencies_ns)
+        if not ordered:
+            return [0.0] * len(qs)
+        return [ordered[min(len(ordered) - 1, int(q * len(ordered)))] / 1000 for q in qs]
+
+    def summary(self) -> dict:
+        """Flat, JSON-ready numbers (the baseline format)."""
+        p50, p90, p99, p999, top = self.percentiles_us(0.5, 0.9, 0.99, 0.999, 1.0)
+        return {
+            "transactions": self.transactions,
+            "tps": round(self.tps, 1),
+            "p50_us": round(p50, 2),
+            "p90_us": round(p90, 2),
+            "p99_us": round(p99, 2),
+            "p999_us": round(p999, 2),
+            "max_us": round(top, 2),
+            "blocks_retained": self.blocks_retained,
+            "outcomes": {o.value: n for o, n in self.outcomes.items()},
+        }
+
+
+# ---------------- Stream Generation ---------------- #
+
+def _codes(n: int) -> List[str]:
+    return [f"{chr(ord('A') + i // 8)}{i % 8 + 1}" for i in range(n)]
+
+
+def build_machine(scenario: Scenario) -> VendingMachine:
+    rng = random.Random(scenario.seed)
+    inv = Inventory({
+        code: Slot(Product(code, f"Item {code}", rng.choice(scenario.prices)), scenario.stock)
+        for code in _codes(scenario.products)
+    })
+    drawer = CashDrawer({Denomination(d): n for d, n in scenario.coin_float.items()})
+    return VendingMachine(drawer, inv)
+
+
+def pay(price: int, style: PayStyle) -> Coins:
+    """The coins a customer paying ``price`` in ``style`` inserts, one tuple per insert."""
+    if style is PayStyle.EXACT:
+        coins, left = [], price
+        for denom in CANONICAL_DESC[1:]:
+            if left >= denom:
+                coins.append((denom, left // denom))
+                left %= denom
+        return tuple(coins)
+    if style is PayStyle.QUARTERS:
+        return ((Denomination.C25, -(-price // 25)),)
+    if style is PayStyle.BILLS:
+        return ((Denomination.C100, -(-price // 100)),)
+    rest = max(price - 100, 0)
+    return ((Denomination.C100, 1), (Denomination.C25, -(-rest // 25))) if rest else ((Denomination.C100, 1),)
+
+
+def purchase_stream(scenario: Scenario, prices: Dict[str, int]) -> Iterator[Purchase]:
+    """Endless, reproducible purchases: Zipf-popular products, mixed payment styles.
+
+    Coin tuples are built once per (product, style), so the stream costs a
+    few random draws per purchase.
+    """
+    rng = random.Random(scenario.seed + 1)
+    codes = list(prices)
+    weights = list(itertools.accumulate(1 / (rank + 1) ** scenario.popularity for rank in range(len(codes))))
+    styles = [PayStyle(s) for s in scenario.pay_mix]
+    style_weights = list(itertools.accumulate(scenario.pay_mix.values()))
+    coins = {(code, style): pay(prices[code], style) for code in codes for style in styles}
+    choices, random_ = rng.choices, rng.random
+    while True:
+        code = choices(codes, cum_weights=weights)[0]
+        style = choices(styles, cum_weights=style_weights)[0]
+        yield Purchase(code, coins[code, style], random_() < scenario.cancel_rate)
+
+
+# ---------------- Driver ---------------- #
+
+def service(vm: VendingMachine, scenario: Scenario) -> None:
+    """Operator visit: refill every slot to ``stock`` and reset the coin float."""
+    for code, slot in vm.inventory.slots.items():
+        if slot.quantity < scenario.stock:
+            vm.admin_refill(code, scenario.stock - slot.quantity)
+    drawer = vm.drawer
+    for denom in list(drawer.drawer):
+        target = scenario.coin_float.get(int(denom), 0)
+        have = drawer.drawer[denom]
+        if have > target:
+            drawer.remove(denom, have - target)
+        elif have < target:
+            drawer.add(denom, target - have)
+
+
+def simulate(transactions: int, scenario: Optional[Scenario] = None,
+             vm: Optional[VendingMachine] = None) -> SimulationResult:
+    """Drive ``transactions`` purchases through a machine headlessly.
+
+    Each transaction (inserts, select, dispense + change, or cancel/refund) is
+    timed on its own; stream generation and service visits are not.
+    """
+    scenario = scenario or Scenario()
+    vm = vm or build_machine(scenario)
+    prices = {code: slot.product.price_cents for code, slot in vm.inventory.slots.items()}
+    stream = purchase_stream(scenario, prices)
+    latencies = array("q", bytes(8 * transactions))
+    outcomes = dict.fromkeys(Outcome, 0)
+    clock = time.perf_counter_ns
+
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    for i in range(transactions):
+        if i and i % scenario.service_every == 0:
+            service(vm, scenario)
+        purchase = next(stream)
+        start = clock()
+        for cash in purchase.coins:
+            vm.insert_money(cash)
+        if purchase.cancel:
+            vm.cancel()
+            outcome = Outcome.CANCELLED
+        else:
+            try:
+                vm.select_product(purchase.code)
+            except OutOfStock:
+                vm.cancel()
+                outcome = Outcome.OUT_OF_STOCK
+            except CannotMakeChange:
+                vm.cancel()
+                outcome = Outcome.NO_CHANGE
+            else:
+                vm.dispense()
+                vm.dispense()
+                outcome = Outcome.SOLD
+        latencies[i] = clock() - start
+        outcomes[outcome] += 1
+    del stream
+    gc.collect()
+    return SimulationResult(transactions, sum(latencies) / 1e9, latencies, outcomes,
+                            sys.getallocatedblocks() - blocks)
+
+
+# ---------------- Baselines ---------------- #
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.10) -> List[str]:
+    """Regressions of ``current`` against ``baseline`` summaries (empty if none).
+
+    Throughput may drop and latency percentiles may rise by ``tolerance``
+    (relative) before they count; retained blocks may not grow by more than
+    that fraction of the transaction count. Outcome counts must match
+    exactly when the run shape is the same, since the stream is seeded.
+    """
+    problems = []
+    if current["tps"] < baseline["tps"] * (1 - tolerance):
+        problems.append(f"tps {current['tps']:,.0f} < baseline {baseline['tps']:,.0f}")
+    for key in ("p50_us", "p99_us"):
+        if current[key] > baseline[key] * (1 + tolerance):
+            problems.append(f"{key} {current[key]} > baseline {baseline[key]}")
+    if current["blocks_retained"] - baseline["blocks_retained"] > tolerance * current["transactions"]:
+        problems.append(f"blocks_retained {current['blocks_retained']} > baseline {baseline['blocks_retained']}")
+    if current.get("scenario") == baseline.get("scenario") and current["transactions"] == baseline["transactions"] \
+            and current["outcomes"] != baseline["outcomes"]:
+        problems.append(f"outcomes {current['outcomes']} != baseline {baseline['outcomes']}")
+    return problems
+
@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
-from .errors import NotInRightState, InsufficientFunds, OutOfStock
+from typing import TYPE_CHECKING, Callable, Dict, Tuple
+from .enums import Action, StateType
+from .errors import NotInRightState, InsufficientFunds, OutOfStock, CannotMakeChange
+from .journal import NULL_JOURNAL, RecordKind
 
 if TYPE_CHECKING:
-    from .machine import VendingMachine
+    from .session import Session
     from .payment import CashPayment
     from .inventory import Inventory
 
@@ -13,19 +15,23 @@ if TYPE_CHECKING:
 # -------------------------------------------------------------------- #
 
 class State(ABC):
-    """Base abstract class for all states."""
+    """Base abstract class for all states.
 
-    def __init__(self, machine: "VendingMachine"):
-        self.machine = machine
+    States carry no data: each exists once (`IDLE`, `HAS_MONEY`, ...) and is
+    shared by every machine, and each handler gets the session it acts on.
+    """
+    __slots__ = ()
+    type: StateType
+    index: int  # position in `STATES`, used by the dispatch rows
 
     @abstractmethod
-    def insert_money(self, amount): ...
+    def insert_money(self, machine: "Session", amount): ...
     @abstractmethod
-    def select_product(self, code: str): ...
+    def select_product(self, machine: "Session", code: str): ...
     @abstractmethod
-    def dispense(self): ...
+    def dispense(self, machine: "Session"): ...
     @abstractmethod
-    def cancel(self): ...
+    def cancel(self, machine: "Session"): ...
 
 
 # -------------------------------------------------------------------- #
@@ -33,17 +39,21 @@ class State(ABC):
 # -------------------------------------------------------------------- #
 
 class IdleState(State):
-    def insert_money(self, amount):
-        self.machine.current_payment.insert(*amount)
-        self.machine.transition_to(self.machine.has_money_state)
+    __slots__ = ()
+    type = StateType.IDLE
+    index = 0
 
-    def select_product(self, code: str):
+    def insert_money(self, machine, amount):
+        _insert(machine, amount)
+        machine.state = HAS_MONEY
+
+    def select_product(self, machine, code: str):
         raise NotInRightState("Insert money first")
 
-    def dispense(self):
+    def dispense(self, machine):
         raise NotInRightState("No product selected")
 
-    def cancel(self):
+    def cancel(self, machine):
         raise NotInRightState("Nothing to cancel in IDLE")
 
 
@@ -52,13 +62,17 @@ class IdleState(State):
 # -------------------------------------------------------------------- #
 
 class HasMoneyState(State):
-    def insert_money(self, amount):
-        self.machine.current_payment.insert(*amount)  # (denom, count)
+    __slots__ = ()
+    type = StateType.HAS_MONEY
+    index = 1
+
+    def insert_money(self, machine, amount):
+        _insert(machine, amount)
         # Stay in HasMoneyState
 
-    def select_product(self, code: str):
-        inv = self.machine.inventory
-        pay = self.machine.current_payment
+    def select_product(self, machine, code: str):
+        inv = machine.inventory
+        pay = machine.current_payment
         price = inv.get_price(code)
         if not inv.check_stock(code):
             raise OutOfStock(f"{code} is out of stock")
@@ -66,16 +80,39 @@ class HasMoneyState(State):
         if pay.inserted < price:
             raise InsufficientFunds(f"Need {price - pay.inserted}¢ more")
 
+        change = pay.inserted - price
+        if not machine.drawer.can_make_change(change):
+            raise CannotMakeChange(f"Cannot return {change}¢ in change")
+
+        # Reserve the unit, then the change coins; other sessions cannot take either.
+        # The coins leave the drawer now, so their CHANGE records are written now.
+        journal = machine.journal
+        select = journal.pack(RecordKind.SELECT, code, price)
+        inv.reserve(code)
+        try:
+            if journal is NULL_JOURNAL:  # nothing to keep in step with
+                machine.reserved_change = pay.reserve_change(price)
+            else:
+                with journal.lock:
+                    reserved = machine.reserved_change = pay.reserve_change(price)
+                    journal.write(select, *[journal.pack(RecordKind.CHANGE, value=denom, count=count)
+                                            for denom, count in reserved.items()])
+        except CannotMakeChange:
+            inv.release(code)  # another session took the coins since the check
+            raise
+
         # Proceed to dispense
-        self.machine.selected_code = code
-        self.machine.transition_to(self.machine.dispense_state)
+        machine.selected_code = code
+        machine.state = DISPENSE
 
-    def dispense(self):
+    def dispense(self, machine):
         raise NotInRightState("Select product before dispensing")
 
-    def cancel(self):
-        refund = self.machine.current_payment.refund()
-        self.machine.transition_to(self.machine.idle_state)
+    def cancel(self, machine):
+        record = machine.journal.pack(RecordKind.REFUND, value=machine.current_payment.inserted)
+        refund = machine.current_payment.refund()
+        machine.journal.write(record)
+        machine.state = IDLE
         return refund
 
 
@@ -84,27 +121,35 @@ class HasMoneyState(State):
 # -------------------------------------------------------------------- #
 
 class DispenseState(State):
-    def insert_money(self, amount):
+    __slots__ = ()
+    type = StateType.DISPENSE
+    index = 2
+
+    def insert_money(self, machine, amount):
         raise NotInRightState("Already dispensing")
 
-    def select_product(self, code: str):
+    def select_product(self, machine, code: str):
         raise NotInRightState("Product already selected")
 
-    def dispense(self):
-        inv = self.machine.inventory
-        pay = self.machine.current_payment
-        code = self.machine.selected_code
-        product = inv.dispense(code)
-        price = product.price_cents
-
-        # Compute and transition to change state
-        change = pay.dispense_change(price)
-        self.machine.last_dispensed = product
-        self.machine.last_change = change
-        self.machine.transition_to(self.machine.change_state)
+    def dispense(self, machine):
+        code = machine.selected_code
+        journal = machine.journal
+        if journal is NULL_JOURNAL:  # nothing to keep in step with
+            product = machine.inventory.commit(code)
+        else:
+            with journal.lock:
+                product = machine.inventory.commit(code)
+                journal.append(RecordKind.DISPENSE, code, product.price_cents)
+
+        # Change was set aside (and journaled) on selection; hand it over
+        change = machine.reserved_change or {}
+        machine.reserved_change = None
+        machine.last_dispensed = product
+        machine.last_change = change
+        machine.state = CHANGE
         return product
 
-    def cancel(self):
+    def cancel(self, machine):
         raise NotInRightState("Cannot cancel during dispensing")
 
 
@@ -113,17 +158,56 @@ class DispenseState(State):
 # -------------------------------------------------------------------- #
 
 class ChangeState(State):
-    def insert_money(self, amount):
+    __slots__ = ()
+    type = StateType.CHANGE
+    index = 3
+
+    def insert_money(self, machine, amount):
         raise NotInRightState("Wait until change dispensed")
 
-    def select_product(self, code: str):
+    def select_product(self, machine, code: str):
         raise NotInRightState("Wait until change dispensed")
 
-    def dispense(self):
+    def dispense(self, machine):
         """Dispense change and return to idle."""
-        change = self.machine.last_change or {}
-        self.machine.transition_to(self.machine.idle_state)
+        change = machine.last_change or {}
+        machine.current_payment.inserted = 0  # transaction settled
+        machine.state = IDLE
         return change
 
-    def cancel(self):
+    def cancel(self, machine):
         raise NotInRightState("No active transaction to cancel")
+
+
+def _insert(machine, amount):
+    """Take the coins (denom, count) into the drawer and journal them."""
+    journal = machine.journal
+    if journal is NULL_JOURNAL:  # nothing to keep in step with
+        machine.current_payment.insert(*amount)
+        return
+    record = journal.pack(RecordKind.INSERT, value=amount[0], count=amount[1])
+    with journal.lock:
+        machine.current_payment.insert(*amount)
+        journal.write(record)
+
+
+# -------------------------------------------------------------------- #
+#                            DISPATCH TABLE                            #
+# -------------------------------------------------------------------- #
+
+IDLE = IdleState()
+HAS_MONEY = HasMoneyState()
+DISPENSE = DispenseState()
+CHANGE = ChangeState()
+STATES: Tuple[State, ...] = (IDLE, HAS_MONEY, DISPENSE, CHANGE)
+
+# (state, action) -> handler(machine, *args)
+TRANSITIONS: Dict[Tuple[StateType, Action], Callable] = {
+    (state.type, action): getattr(state, action.value) for state in STATES for action in Action
+}
+
+# The same table as one row per action indexed by `State.index`: the hot path
+# then costs a tuple index instead of hashing two Enum members.
+ROWS: Dict[Action, Tuple[Callable, ...]] = {
+    action: tuple(TRANSITIONS[state.type, action] for state in STATES) for action in Action
+}
@@ -0,0 +1,189 @@
+import heapq
+import threading
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from .enums import Denomination, StockChange
+from .machine import VendingMachine
+
+# Delta records queued by machines: (kind, machine index, key, delta).
+# _SALE is a vend; other stock changes (refills, planograms) are _STOCK.
+_CASH, _STOCK, _SALE = 0, 1, 2
+_VEND = StockChange.VEND
+
+
+class FleetAggregator:
+    """Fleet-wide cash and stock view fed by per-machine deltas.
+
+    `register` reads a machine's state once and subscribes to its drawer and
+    inventory, holding their locks so no change falls between the two; after that each add/remove/dispense/refill only appends a small
+    delta tuple to a queue (no locking on the vending path). Queries fold
+    pending deltas into columnar arrays first:
+
+    - cash: one ``array('q')`` of machines x denominations, plus fleet totals
+    - stock: one row per (machine, slot) with quantity, units sold, machine
+      and product columns, plus units sold per product code
+
+    Low-stock rows (quantity <= ``low_stock``) are tracked as they change, so
+    none of the queries poll machines or rebuild per-machine dicts.
+    """
+    def __init__(self, denominations=tuple(Denomination), low_stock: int = 2, max_pending: int = 65_536):
+        self.denominations: Tuple[Denomination, ...] = tuple(denominations)
+        self.low_stock_threshold = low_stock
+        self.max_pending = max_pending
+        self._denom_pos = {d: i for i, d in enumerate(self.denominations)}
+        self._lock = threading.Lock()
+        self._pending: deque = deque()
+
+        self.machine_ids: List[str] = []
+        self._machine_index: Dict[str, int] = {}
+        self._cash = array("q")                                 # [machine * D + denom] -> count
+        self._cash_totals = array("q", [0] * len(self.denominations))
+
+        self._rows: List[Dict[str, int]] = []                   # per machine: code -> row
+        self._row_machine = array("l")
+        self._row_product = array("l")
+        self._row_qty = array("q")
+        self._row_sold = array("q")
+        self._codes: List[str] = []
+        self._code_ids: Dict[str, int] = {}
+        self._sold_by_code = array("q")
+        self._low: set = set()
+
+    # ---------------- Registration ---------------- #
+
+    def register(self, machine_id: str, vm: VendingMachine) -> None:
+        drawer, inventory = vm.drawer, vm.inventory
+        with self._lock:
+            if machine_id in self._machine_index:
+                raise ValueError(f"Machine {machine_id!r} is already registered")
+            self._apply_pending()
+            idx = self._machine_index[machine_id] = len(self.machine_ids)
+            self.machine_ids.append(machine_id)
+            self._rows.append({})
+            self._cash.extend([0] * len(self.denominations))
+            # Copy and subscribe under the machine's own locks: every change
+            # is either in the copy or queued as a delta, never both or neither.
+            with drawer._lock:
+                for denom, count in drawer.drawer.items():
+                    self._apply_cash(idx, denom, count)
+                drawer.subscribe(lambda denom, delta: self._push((_CASH, idx, denom, delta)))
+            locks = inventory._slot_locks(list(inventory.slots))
+            for lock in locks:
+                lock.acquire()
+            try:
+                for code, slot in list(inventory.slots.items()):
+                    self._apply_stock(idx, code, slot.quantity)
+                inventory.subscribe(
+                    lambda code, delta, kind: self._push((_SALE if kind is _VEND else _STOCK, idx, code, delta)))
+            finally:
+                for lock in locks:
+                    lock.release()
+
+    # ---------------- Fleet Queries ---------------- #
+
+    def cash_by_denomination(self) -> Dict[Denomination, int]:
+        """Coin/bill counts summed over the fleet."""
+        self.flush()
+        return dict(zip(self.denominations, self._cash_totals))
+
+    def total_cash(self) -> int:
+        """Fleet cash in cents."""
+        return sum(d * n for d, n in self.cash_by_denomination().items())
+
+    def machine_cash(self, machine_id: str) -> int:
+        """Cash in one machine's drawer, in cents."""
+        self.flush()
+        base = self._machine_index[machine_id] * len(self.denominations)
+        return sum(d * self._cash[base + i] for i, d in enumerate(self.denominations))
+
+    def low_stock(self, limit: Optional[int] = None) -> List[Tuple[str, str, int]]:
+        """(machine_id, code, quantity) for slots at or below the threshold.
+
+        All of them in registration order, or only the ``limit`` emptiest.
+        """
+        self.flush()
+        if limit is None:
+            rows = sorted(self._low)
+        else:
+            rows = heapq.nsmallest(limit, self._low, key=lambda r: (self._row_qty[r], r))
+        return [
+            (self.machine_ids[self._row_machine[r]], self._codes[self._row_product[r]], self._row_qty[r])
+            for r in rows
+        ]
+
+    def top_sellers(self, n: int = 10) -> List[Tuple[str, int]]:
+        """(code, units sold since registration), best first."""
+        self.flush()
+        best = heapq.nlargest(n, range(len(self._codes)), key=self._sold_by_code.__getitem__)
+        return [(self._codes[i], self._sold_by_code[i]) for i in best if self._sold_by_code[i]]
+
+    def flush(self) -> None:
+        """Fold every queued delta into the columns."""
+        with self._lock:
+            self._apply_pending()
+
+    # ---------------- Helpers ---------------- #
+
+    def _push(self, record: Tuple) -> None:
+        self._pending.append(record)  # deque.append is atomic; no lock on the hot path
+        if len(self._pending) > self.max_pending and self._lock.acquire(blocking=False):
+            try:
+                self._apply_pending()
+            finally:
+                self._lock.release()
+
+    def _apply_pending(self) -> None:
+        pending, popleft = self._pending, self._pending.popleft
+        cash, totals, pos, width = self._cash, self._cash_totals, self._denom_pos, len(self.denominations)
+        rows, qty, sold, product = self._rows, self._row_qty, self._row_sold, self._row_product
+        by_code, low, threshold = self._sold_by_code, self._low, self.low_stock_threshold
+        while pending:
+            kind, idx, key, delta = popleft()
+            if kind == _CASH:
+                p = pos.get(key)
+                if p is not None:
+                    cash[idx * width + p] += delta
+                    totals[p] += delta
+                continue
+            row = rows[idx].get(key)
+            if row is None:
+                self._apply_stock(idx, key, delta, sale=kind == _SALE)  # first sight of this slot
+                continue
+            q = qty[row] = qty[row] + delta
+            if kind == _SALE:
+                sold[row] -= delta
+                by_code[product[row]] -= delta
+            if q <= threshold:
+                low.add(row)
+            elif row in low:
+                low.discard(row)
+
+    def _apply_cash(self, idx: int, denom: Denomination, delta: int) -> None:
+        pos = self._denom_pos.get(denom)
+        if pos is None:
+            return  # denomination outside the fleet's set
+        self._cash[idx * len(self.denominations) + pos] += delta
+        self._cash_totals[pos] += delta
+
+    def _apply_stock(self, idx: int, code: str, delta: int, sale: bool = False) -> None:
+        row = self._rows[idx].get(code)
+        if row is None:
+            row = self._rows[idx][code] = len(self._row_qty)
+            pid = self._code_ids.get(code)
+            if pid is None:
+                pid = self._code_ids[code] = len(self._codes)
+                self._codes.append(code)
+                self._sold_by_code.append(0)
+            self._row_machine.append(idx)
+            self._row_product.append(pid)
+            self._row_qty.append(0)
+            self._row_sold.append(0)
+        qty = self._row_qty[row] = self._row_qty[row] + delta
+        if sale:  # refills and planograms change stock too, but only vends are sales
+            self._row_sold[row] -= delta
+            self._sold_by_code[self._row_product[row]] -= delta
+        if qty <= self.low_stock_threshold:
+            self._low.add(row)
+        else:
+            self._low.discard(row)